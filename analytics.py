@@ -5,7 +5,16 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-from collections import defaultdict
+
+
+def player_totals(participations):
+    """Wedstrijden, overwinningen, doelpunten en klinkers per speler uit de deelnametabel."""
+    return participations.groupby('speler', sort=False).agg(
+        matches=('voor', 'size'),
+        wins=('gewonnen', 'sum'),
+        goals=('voor', 'sum'),
+        klinkers=('klinkers', 'sum'),
+    )
 
 
 def show_timeline_chart(matches_df):
@@ -27,16 +36,10 @@ def show_timeline_chart(matches_df):
         st.plotly_chart(fig_timeline, use_container_width=True)
 
 
-def show_matches_bar_chart(season_matches):
+def show_matches_bar_chart(season_participations):
     """Toon een bar chart van wedstrijden per speler in een seizoen"""
-    all_players_matches = []
-    for _, match in season_matches.iterrows():
-        all_players_matches.extend([
-            match['thuis_speler_1'], match['thuis_speler_2'],
-            match['uit_speler_1'], match['uit_speler_2']
-        ])
-    
-    matches_count = pd.Series(all_players_matches).value_counts()
+    matches_count = season_participations['speler'].value_counts()
+    matches_count = matches_count[matches_count > 0]  # categorical: alleen spelers van dit seizoen
     
     fig_matches = px.bar(
         x=matches_count.index,
@@ -49,18 +52,10 @@ def show_matches_bar_chart(season_matches):
     st.plotly_chart(fig_matches, use_container_width=True)
 
 
-def show_unique_players_bar_chart(season_matches):
+def show_unique_players_bar_chart(season_participations):
     """Toon een bar chart van unieke spelers per dag"""
-    daily_players = defaultdict(set)
-    for _, match in season_matches.iterrows():
-        day = match['datum'].date()
-        daily_players[day].update([
-            match['thuis_speler_1'], match['thuis_speler_2'],
-            match['uit_speler_1'], match['uit_speler_2']
-        ])
-    
-    daily_unique = {day: len(players) for day, players in daily_players.items()}
-    daily_df = pd.DataFrame(list(daily_unique.items()), columns=['Datum', 'Unieke spelers'])
+    daily_unique = season_participations.groupby(season_participations['datum'].dt.date)['speler'].nunique()
+    daily_df = pd.DataFrame({'Datum': daily_unique.index, 'Unieke spelers': daily_unique.values})
     
     fig_players = px.bar(
         daily_df,
@@ -97,20 +92,10 @@ def show_goals_line_chart(season_matches):
     st.plotly_chart(fig_goals, use_container_width=True)
 
 
-def show_all_time_goals_chart(all_matches):
+def show_all_time_goals_chart(all_participations):
     """Toon all-time goals chart voor alle seizoenen"""
-    all_goals = defaultdict(int)
-    
-    for _, match in all_matches.iterrows():
-        # Thuis team goals
-        all_goals[match['thuis_speler_1']] += match['thuis_score']
-        all_goals[match['thuis_speler_2']] += match['thuis_score']
-        
-        # Uit team goals
-        all_goals[match['uit_speler_1']] += match['uit_score']
-        all_goals[match['uit_speler_2']] += match['uit_score']
-    
-    goals_df = pd.DataFrame(list(all_goals.items()), columns=['Speler', 'Goals']).sort_values('Goals', ascending=False)
+    all_goals = all_participations.groupby('speler')['voor'].sum()
+    goals_df = pd.DataFrame({'Speler': all_goals.index, 'Goals': all_goals.values}).sort_values('Goals', ascending=False)
     
     if not goals_df.empty:
         fig_all_goals = px.bar(
@@ -125,36 +110,17 @@ def show_all_time_goals_chart(all_matches):
         st.plotly_chart(fig_all_goals, use_container_width=True)
 
 
-def show_activity_vs_winrate_scatter(all_matches):
+def show_activity_vs_winrate_scatter(all_participations):
     """Toon scatter plot van activiteit vs winpercentage"""
-    player_stats = defaultdict(lambda: {'matches': 0, 'wins': 0})
-    
-    for _, match in all_matches.iterrows():
-        home_players = [match['thuis_speler_1'], match['thuis_speler_2']]
-        away_players = [match['uit_speler_1'], match['uit_speler_2']]
-        
-        for player in home_players:
-            player_stats[player]['matches'] += 1
-            if match['thuis_score'] > match['uit_score']:
-                player_stats[player]['wins'] += 1
-        
-        for player in away_players:
-            player_stats[player]['matches'] += 1
-            if match['uit_score'] > match['thuis_score']:
-                player_stats[player]['wins'] += 1
-    
-    scatter_data = []
-    for player, stats in player_stats.items():
-        if stats['matches'] >= 5:  # Minimaal 5 wedstrijden voor betrouwbaarheid
-            win_rate = (stats['wins'] / stats['matches']) * 100
-            scatter_data.append({
-                'Speler': player,
-                'Wedstrijden': stats['matches'],
-                'Winpercentage': win_rate
-            })
-    
-    if scatter_data:
-        scatter_df = pd.DataFrame(scatter_data)
+    totals = player_totals(all_participations)
+    totals = totals[totals['matches'] >= 5]  # Minimaal 5 wedstrijden voor betrouwbaarheid
+    
+    if not totals.empty:
+        scatter_df = pd.DataFrame({
+            'Speler': totals.index,
+            'Wedstrijden': totals['matches'].to_numpy(),
+            'Winpercentage': (totals['wins'] / totals['matches'] * 100).to_numpy(),
+        })
         fig_scatter = px.scatter(
             scatter_df,
             x='Wedstrijden',
@@ -196,36 +162,17 @@ def show_elo_bar_chart(season_elo):
         st.plotly_chart(fig_elo, use_container_width=True)
 
 
-def show_winrate_bar_chart(season_matches, min_matches=5):
+def show_winrate_bar_chart(season_participations, min_matches=5):
     """Toon winpercentage bar chart voor een specifiek seizoen"""
-    player_stats = defaultdict(lambda: {'matches': 0, 'wins': 0})
-    
-    for _, match in season_matches.iterrows():
-        home_players = [match['thuis_speler_1'], match['thuis_speler_2']]
-        away_players = [match['uit_speler_1'], match['uit_speler_2']]
-        
-        for player in home_players:
-            player_stats[player]['matches'] += 1
-            if match['thuis_score'] > match['uit_score']:
-                player_stats[player]['wins'] += 1
-        
-        for player in away_players:
-            player_stats[player]['matches'] += 1
-            if match['uit_score'] > match['thuis_score']:
-                player_stats[player]['wins'] += 1
-    
-    winrate_data = []
-    for player, stats in player_stats.items():
-        if stats['matches'] >= min_matches:
-            win_rate = (stats['wins'] / stats['matches']) * 100
-            winrate_data.append({
-                'Speler': player,
-                'Winpercentage': win_rate,
-                'Wedstrijden': stats['matches']
-            })
-    
-    if winrate_data:
-        winrate_df = pd.DataFrame(winrate_data).sort_values('Winpercentage', ascending=False)
+    totals = player_totals(season_participations)
+    totals = totals[totals['matches'] >= min_matches]
+    
+    if not totals.empty:
+        winrate_df = pd.DataFrame({
+            'Speler': totals.index,
+            'Winpercentage': (totals['wins'] / totals['matches'] * 100).to_numpy(),
+            'Wedstrijden': totals['matches'].to_numpy(),
+        }).sort_values('Winpercentage', ascending=False)
         fig_winrate = px.bar(
             winrate_df.head(10),
             x='Speler',
@@ -238,22 +185,11 @@ def show_winrate_bar_chart(season_matches, min_matches=5):
         st.plotly_chart(fig_winrate, use_container_width=True)
 
 
-def show_goals_bar_chart_season(season_matches):
+def show_goals_bar_chart_season(season_participations):
     """Toon goals bar chart voor een specifiek seizoen"""
-    goals_stats = defaultdict(int)
-    
-    for _, match in season_matches.iterrows():
-        # Thuis team goals
-        goals_stats[match['thuis_speler_1']] += match['thuis_score']
-        goals_stats[match['thuis_speler_2']] += match['thuis_score']
-        
-        # Uit team goals  
-        goals_stats[match['uit_speler_1']] += match['uit_score']
-        goals_stats[match['uit_speler_2']] += match['uit_score']
-    
-    goals_data = [{'Speler': player, 'Goals': goals} for player, goals in goals_stats.items()]
-    if goals_data:
-        goals_df = pd.DataFrame(goals_data).sort_values('Goals', ascending=False)
+    goals_stats = season_participations.groupby('speler')['voor'].sum()
+    if not goals_stats.empty:
+        goals_df = pd.DataFrame({'Speler': goals_stats.index, 'Goals': goals_stats.values}).sort_values('Goals', ascending=False)
         fig_goals = px.bar(
             goals_df.head(10),
             x='Speler',
@@ -266,46 +202,15 @@ def show_goals_bar_chart_season(season_matches):
         st.plotly_chart(fig_goals, use_container_width=True)
 
 
-def create_all_time_leaderboards(all_matches):
-    """Maak alle all-time leaderboards"""
-    
-    # Statistieken verzamelen
-    player_stats = defaultdict(lambda: {
-        'matches': 0,
-        'wins': 0, 
-        'goals': 0,
-        'max_elo': 1000  # Start ELO
-    })
-    
-    for _, match in all_matches.iterrows():
-        home_players = [match['thuis_speler_1'], match['thuis_speler_2']]
-        away_players = [match['uit_speler_1'], match['uit_speler_2']]
-        
-        # Home team stats
-        for player in home_players:
-            player_stats[player]['matches'] += 1
-            player_stats[player]['goals'] += match['thuis_score']
-            if match['thuis_score'] > match['uit_score']:
-                player_stats[player]['wins'] += 1
-            
-            # ELO tracking (zou uit ELO historie moeten komen, maar we schatten)
-            if 'klinkers_thuis_1' in match and match['klinkers_thuis_1'] and player == match['thuis_speler_1']:
-                estimated_elo = 1000 + (player_stats[player]['wins'] * 20)
-                player_stats[player]['max_elo'] = max(player_stats[player]['max_elo'], estimated_elo)
-        
-        # Away team stats
-        for player in away_players:
-            player_stats[player]['matches'] += 1
-            player_stats[player]['goals'] += match['uit_score']
-            if match['uit_score'] > match['thuis_score']:
-                player_stats[player]['wins'] += 1
-            
-            # ELO tracking
-            if 'klinkers_uit_1' in match and match['klinkers_uit_1'] and player == match['uit_speler_1']:
-                estimated_elo = 1000 + (player_stats[player]['wins'] * 20)
-                player_stats[player]['max_elo'] = max(player_stats[player]['max_elo'], estimated_elo)
-    
-    return player_stats
+def create_all_time_leaderboards(all_participations):
+    """
+    Maak alle all-time leaderboards: per speler {matches, wins, goals, max_elo}.
+    `max_elo` is de hoogste rating na een wedstrijd uit de ELO log (1000 zonder geschiedenis).
+    """
+    totals = player_totals(all_participations)[['matches', 'wins', 'goals']].astype(int)
+    max_elo = all_participations.groupby('speler', sort=False)['elo_na'].max()
+    totals['max_elo'] = max_elo.reindex(totals.index).fillna(1000).clip(lower=1000).round().astype(int)
+    return totals.to_dict('index')
 
 
 def show_all_time_leaderboards(player_stats):
@@ -346,29 +251,6 @@ def show_cross_season_charts(all_matches, seasons_df):
         
     st.subheader("📊 Cross-Seizoen Analyses")
     
-    # ELO ontwikkeling over seizoenen (geschatte versie)
-    player_season_elo = defaultdict(lambda: defaultdict(int))
-    player_season_matches = defaultdict(lambda: defaultdict(int))
-    
-    for _, match in all_matches.iterrows():
-        match_date = pd.to_datetime(match['datum']).tz_localize(None)
-        
-        # Vind seizoen voor deze wedstrijd
-        current_season = "Onbekend"
-        for _, season in seasons_df.iterrows():
-            season_start = pd.to_datetime(season['start_datum']).tz_localize(None)
-            season_end = pd.to_datetime(season['eind_datum']).tz_localize(None)
-            if season_start <= match_date <= season_end:
-                current_season = season['seizoen_naam']
-                break
-        
-        # Track matches per seizoen
-        home_players = [match['thuis_speler_1'], match['thuis_speler_2']]
-        away_players = [match['uit_speler_1'], match['uit_speler_2']]
-        
-        for player in home_players + away_players:
-            player_season_matches[player][current_season] += 1
-    
     # Seizoen vergelijking chart
     if len(seasons_df) > 1:
         season_comparison = []
@@ -407,7 +289,7 @@ def show_cross_season_charts(all_matches, seasons_df):
                     st.plotly_chart(fig_season_goals, use_container_width=True)
 
 
-def show_individual_season_analysis(season_info, season_matches, season_elo=None):
+def show_individual_season_analysis(season_info, season_matches, season_participations, season_elo=None):
     """Toon uitgebreide analyse voor een individueel seizoen"""
     import streamlit as st
     
@@ -441,13 +323,7 @@ def show_individual_season_analysis(season_info, season_matches, season_elo=None
     
     with col4:
         # Unieke spelers
-        unique_players = set()
-        for _, match in season_matches.iterrows():
-            unique_players.update([
-                match['thuis_speler_1'], match['thuis_speler_2'],
-                match['uit_speler_1'], match['uit_speler_2']
-            ])
-        st.metric("Actieve Spelers", len(unique_players))
+        st.metric("Actieve Spelers", season_participations['speler'].nunique())
     
     # Visualisaties in columns
     st.subheader("📊 Seizoen Visualisaties")
@@ -455,12 +331,12 @@ def show_individual_season_analysis(season_info, season_matches, season_elo=None
     col1, col2 = st.columns(2)
     
     with col1:
-        show_matches_bar_chart(season_matches)
-        show_goals_bar_chart_season(season_matches)
+        show_matches_bar_chart(season_participations)
+        show_goals_bar_chart_season(season_participations)
     
     with col2:
-        show_unique_players_bar_chart(season_matches)
-        show_winrate_bar_chart(season_matches)
+        show_unique_players_bar_chart(season_participations)
+        show_winrate_bar_chart(season_participations)
     
     # ELO ratings als beschikbaar
     if season_elo is not None and not season_elo.empty:
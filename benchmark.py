@@ -0,0 +1,297 @@
+# benchmark.py
+"""
+Herhaalbare benchmarks van de zware paden van de app.
+
+Gebruik:
+    python benchmark.py --matches 100000 --players 24 --seed 42 --latency 0.1
+    python benchmark.py --suite engine --sizes 10000 100000 1000000
+    python benchmark.py --suite stats --matches 50000 --players 50
+    python benchmark.py --suite memory --matches 50000 --players 50
+
+`service` (standaard) draait tegen de in-memory Firestore fake en meet import, volledige
+ELO reset, herberekening vanaf de middelste wedstrijd en vanaf gisteren (vanaf een
+ELO-checkpoint) en de incrementele wedstrijd-sync, met per stap de duur plus het aantal
+Firestore reads/writes dat het zou kosten.
+`engine` vergelijkt de ELO replay engine met de oude per-wedstrijd loop.
+`stats` meet het opbouwen van de deelnametabel (participations.py, één keer per dataversie) en
+de spelerstatistieken van de home tab (tab_home.calculate_stats) tegen de oude loop.
+`memory` vergelijkt het geheugengebruik van de wedstrijd- en ELO tabellen zoals de loaders ze
+vroeger bouwden met de compacte dtypes uit frame_schema.py.
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+import streamlit.config
+import streamlit.logger
+
+# Buiten `streamlit run` waarschuwt elke cache-aanroep over de ontbrekende runtime. Config eerst
+# laden (anders zet het lezen van st.secrets het niveau later terug) en dan het niveau verhogen.
+streamlit.config.get_config_options()
+streamlit.logger.set_log_level('error')
+
+import pandas as pd
+
+import firestore_service as db
+from elo_engine import EloReplay
+from fake_firestore import FakeFirestoreClient
+from firestore_backend import FirestoreBackend
+from frame_schema import compact_elo_logs, memory_report
+from participations import build_participations
+from tab_home import calculate_stats
+from utils import elo_calculation
+
+
+def generate_matches(n_matches, players, seed=42, start=datetime(2020, 9, 1, 12, 0)):
+    """Genereert deterministisch willekeurige 2-tegen-2 wedstrijden, oudste eerst."""
+    rng = random.Random(seed)
+    matches = []
+    for i in range(n_matches):
+        thuis_1, thuis_2, uit_1, uit_2 = rng.sample(players, 4)
+        loser_score = rng.randint(0, 9)
+        home_wins = rng.random() < 0.5
+        matches.append({
+            'thuis_1': thuis_1, 'thuis_2': thuis_2,
+            'uit_1': uit_1, 'uit_2': uit_2,
+            'thuis_score': 10 if home_wins else loser_score,
+            'uit_score': loser_score if home_wins else 10,
+            'klinkers_thuis_1': rng.randint(0, 2), 'klinkers_thuis_2': rng.randint(0, 2),
+            'klinkers_uit_1': rng.randint(0, 2), 'klinkers_uit_2': rng.randint(0, 2),
+            'timestamp': start + timedelta(minutes=15 * i),
+        })
+    return matches
+
+
+def timed(label, client, func, *args):
+    """Voert `func` uit en print duur en Firestore gebruik."""
+    with client.track() as usage:
+        start = time.perf_counter()
+        result = func(*args)
+        duration = time.perf_counter() - start
+    print(f"{label:<38} {duration:8.2f}s  reads={usage['reads']:>8}  writes={usage['writes']:>8}  "
+          f"deletes={usage['deletes']:>8}  commits={usage['commits']:>6}")
+    return result
+
+
+def run(n_matches, n_players, seed, latency=0.0):
+    # De historie is "een uur geleden" geschreven, zodat de sync-marge alleen nieuwe writes raakt
+    client = FakeFirestoreClient(
+        seed=seed, clock=lambda: datetime.now(timezone.utc) - timedelta(hours=1), latency=latency
+    )
+    db.use_backend(FirestoreBackend(client))
+    players = [f"Speler{i:02d}" for i in range(n_players)]
+    matches = generate_matches(n_matches, players, seed=seed)
+
+    print(f"Benchmark: {n_matches} wedstrijden, {n_players} spelers, seed {seed}, "
+          f"{latency * 1000:.0f} ms per commit\n")
+    for name in players:
+        db.add_player(name, 1000)
+
+    added, duplicates = timed("import_matches", client, db.import_matches, matches)
+    print(f"  -> {added} toegevoegd, {duplicates} duplicaten overgeslagen")
+    timed("reset_all_elos", client, db.reset_all_elos)
+
+    all_matches = db.get_backend().list_matches(descending=False, fields=['timestamp'])
+    middle_timestamp = all_matches[len(all_matches) // 2]['timestamp']
+    timed("recalculate_elo_from_match (50%)", client, db.recalculate_elo_from_match, middle_timestamp)
+    yesterday_timestamp = all_matches[-1]['timestamp'] - timedelta(days=1)
+    timed("recalculate_elo_from_match (gisteren)", client, db.recalculate_elo_from_match, yesterday_timestamp)
+    timed("get_players", client, db.get_players)
+    timed("get_matches", client, db.get_matches)
+
+    client.clock = lambda: datetime.now(timezone.utc)
+    last_match = dict(matches[-1], timestamp=datetime.now(timezone.utc))
+    db.add_match_and_update_elo(last_match, [])
+    timed("get_matches (na 1 nieuwe)", client, db.get_matches)
+    db.use_backend(None)
+
+
+def legacy_replay(matches, players):
+    """De per-wedstrijd loop zoals reset_all_elos die had vóór elo_engine (ter vergelijking)."""
+    player_elos = {player: 1000 for player in players}
+    elo_entries = []
+    for match in matches:
+        home_team = [match.get('thuis_1'), match.get('thuis_2')]
+        away_team = [match.get('uit_1'), match.get('uit_2')]
+        home_score = int(match.get('thuis_score', 0))
+        away_score = int(match.get('uit_score', 0))
+        home_elos = [player_elos.get(player, 1000) for player in home_team if player]
+        away_elos = [player_elos.get(player, 1000) for player in away_team if player]
+        if len(home_elos) == 2 and len(away_elos) == 2:
+            avg_home_elo = sum(home_elos) / 2
+            avg_away_elo = sum(away_elos) / 2
+            for player in home_team:
+                if player:
+                    new_elo = elo_calculation(player_elos.get(player, 1000), avg_away_elo, home_score, away_score)
+                    player_elos[player] = new_elo
+                    elo_entries.append({'speler_naam': player, 'rating': new_elo, 'timestamp': match.get('timestamp')})
+            for player in away_team:
+                if player:
+                    new_elo = elo_calculation(player_elos.get(player, 1000), avg_home_elo, away_score, home_score)
+                    player_elos[player] = new_elo
+                    elo_entries.append({'speler_naam': player, 'rating': new_elo, 'timestamp': match.get('timestamp')})
+    return player_elos, elo_entries
+
+
+def legacy_calculate_stats(players, matches):
+    """calculate_stats uit tab_home zoals die was vóór de groupby-versie (ter vergelijking)."""
+    stats_list = []
+    for index, player in players.iterrows():
+        player_name = str(player['speler_naam']) if player['speler_naam'] is not None else ""
+        
+        # Veilige filtering om KeyError te voorkomen
+        conditions = []
+        for col in ['thuis_1', 'thuis_2', 'uit_1', 'uit_2']:
+            if col in matches.columns:
+                conditions.append(matches[col] == player_name)
+        
+        if not conditions:
+            player_matches = pd.DataFrame()
+        else:
+            player_matches = matches[pd.concat(conditions, axis=1).any(axis=1)]
+
+        if player_matches.empty:
+            stats = {'Gespeeld': 0, 'Voor': 0, 'Tegen': 0, 'Doelsaldo': 0, 'Klinkers': 0, 'Speler': ""}
+        else:
+            goals_for = 0
+            goals_against = 0
+            klinkers = 0
+            for _, match in player_matches.iterrows():
+                thuis_spelers = [match.get('thuis_1'), match.get('thuis_2')]
+                uit_spelers = [match.get('uit_1'), match.get('uit_2')]
+                
+                if player_name in thuis_spelers:
+                    goals_for += int(match.get('thuis_score', 0) or 0)
+                    goals_against += int(match.get('uit_score', 0) or 0)
+                    if player_name == match.get('thuis_1'):
+                        klinkers += int(match.get('klinkers_thuis_1', 0) or 0)
+                    else:
+                        klinkers += int(match.get('klinkers_thuis_2', 0) or 0)
+                elif player_name in uit_spelers:
+                    goals_for += int(match.get('uit_score', 0) or 0)
+                    goals_against += int(match.get('thuis_score', 0) or 0)
+                    if player_name == match.get('uit_1'):
+                        klinkers += int(match.get('klinkers_uit_1', 0) or 0)
+                    else:
+                        klinkers += int(match.get('klinkers_uit_2', 0) or 0)
+            
+            stats = {
+                'Gespeeld': len(player_matches),
+                'Voor': int(goals_for),
+                'Tegen': int(goals_against),
+                'Doelsaldo': int(goals_for - goals_against),
+                'Klinkers': int(klinkers),
+                'Speler': ""  # Placeholder voor string type
+            }
+        
+        stats['Speler'] = player_name
+        # Veilige conversie van rating met fallback naar 1000 als default
+        rating_value = player.get('rating', 1000)
+        if rating_value is None or pd.isna(rating_value):
+            rating_value = 1000
+        stats['ELO'] = int(rating_value)
+        stats_list.append(stats)
+        
+    return pd.DataFrame(stats_list)
+
+
+def run_stats(n_matches, n_players, seed, legacy=True):
+    players = [f"Speler{i:02d}" for i in range(n_players)]
+    players_df = pd.DataFrame({'speler_naam': players, 'rating': 1000.0})
+    matches_df = db._matches_frame(generate_matches(n_matches, players, seed=seed))
+    print(f"Home tab statistieken: {n_players} spelers x {n_matches} wedstrijden, seed {seed}\n")
+
+    build_runs, stats_runs = [], []
+    for _ in range(5):
+        start = time.perf_counter()
+        participations = build_participations(matches_df)
+        build_runs.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        stats = calculate_stats(players_df, participations)
+        stats_runs.append(time.perf_counter() - start)
+    print(f"{'build_participations':<24} {min(build_runs) * 1000:8.1f} ms (beste van 5, {len(participations)} rijen)")
+    print(f"{'calculate_stats':<24} {min(stats_runs) * 1000:8.1f} ms (beste van 5)")
+
+    if legacy:
+        start = time.perf_counter()
+        legacy_stats = legacy_calculate_stats(players_df, matches_df)
+        legacy_duration = time.perf_counter() - start
+        assert stats.equals(legacy_stats)
+        print(f"{'oude loop':<24} {legacy_duration * 1000:8.1f} ms")
+
+
+def run_engine(sizes, n_players, seed):
+    players = [f"Speler{i:02d}" for i in range(n_players)]
+    print(f"ELO replay: oude loop vs elo_engine, {n_players} spelers, seed {seed}\n")
+    print(f"{'wedstrijden':>12} {'oude loop':>10} {'engine':>10} {'engine kern':>12} {'versnelling':>12}")
+    for n_matches in sizes:
+        matches = generate_matches(n_matches, players, seed=seed)
+
+        start = time.perf_counter()
+        legacy_ratings, legacy_entries = legacy_replay(matches, players)
+        legacy_duration = time.perf_counter() - start
+
+        start = time.perf_counter()
+        replay = EloReplay(matches, players=players)
+        core_duration = time.perf_counter() - start
+        entries = replay.elo_entries()
+        engine_duration = time.perf_counter() - start
+
+        assert replay.final_ratings() == legacy_ratings and len(entries) == len(legacy_entries)
+        print(f"{n_matches:>12} {legacy_duration:>9.2f}s {engine_duration:>9.2f}s {core_duration:>11.2f}s "
+              f"{legacy_duration / engine_duration:>11.1f}x")
+
+
+def run_memory(n_matches, n_players, seed):
+    players = [f"Speler{i:02d}" for i in range(n_players)]
+    matches = generate_matches(n_matches, players, seed=seed)
+    for i, match in enumerate(matches):
+        match['match_id'] = f"m{i:07d}"
+    elo_logs = EloReplay(matches, players=players).elo_entries()
+    print(f"Geheugen van de tabellen: {n_players} spelers x {n_matches} wedstrijden, seed {seed}\n")
+
+    # Zoals get_matches en get_elo_logs ze vroeger bouwden: DataFrame uit dicts plus to_datetime
+    raw_matches = pd.DataFrame(matches)
+    raw_matches['timestamp'] = pd.to_datetime(raw_matches['timestamp'], errors='coerce')
+    raw_matches['datum'] = raw_matches['timestamp']
+    raw_matches = raw_matches[[col for col in db.MATCH_COLUMNS if col in raw_matches.columns]]
+    raw_elo = pd.DataFrame(elo_logs)
+    compact = db._matches_frame(matches).drop(columns='season_id')
+
+    print(memory_report({
+        'uitslag': (raw_matches, compact),
+        'elo': (raw_elo, compact_elo_logs(raw_elo)),
+    }).to_string(index=False))
+
+    # Dezelfde telling per speler op strings en op categorical codes
+    for label, frame in (('strings', raw_matches), ('categorical', compact)):
+        start = time.perf_counter()
+        for _ in range(5):
+            frame['thuis_1'].value_counts()
+        print(f"{'value_counts ' + label:<26} {(time.perf_counter() - start) / 5 * 1000:8.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de zware paden van de app.")
+    parser.add_argument('--suite', choices=['service', 'engine', 'stats', 'memory'], default='service')
+    parser.add_argument('--matches', type=int, default=100_000)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000],
+                        help="aantallen wedstrijden voor --suite engine")
+    parser.add_argument('--players', type=int, default=24)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help="gesimuleerde netwerktijd per batch commit in seconden (--suite service)")
+    args = parser.parse_args()
+    if args.suite == 'engine':
+        run_engine(args.sizes, args.players, args.seed)
+    elif args.suite == 'stats':
+        run_stats(args.matches, args.players, args.seed)
+    elif args.suite == 'memory':
+        run_memory(args.matches, args.players, args.seed)
+    else:
+        run(args.matches, args.players, args.seed, args.latency)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+# bulk_writer.py
+"""
+Bulk-writes naar Firestore: in blokken onder de batchlimiet, een paar blokken tegelijk,
+met retry en backoff bij tijdelijke fouten en een voortgangs-callback.
+
+Gebruik:
+    writer = BulkWriter(client, progress=lambda done, total: ...)
+    writer.set(ref, data)
+    writer.delete(ref)
+    writer.commit()
+
+Blokken zijn elk atomair, het geheel niet: na een fout kunnen eerdere blokken al geschreven
+zijn. Alleen idempotente writes (set/update zonder Increment, delete) horen hier thuis, zodat
+een retry van een blok dat toch al gecommit was niets verandert.
+"""
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from google.api_core import exceptions as google_exceptions
+
+CHUNK_SIZE = 400  # Firestore staat maximaal 500 writes per batch toe
+MAX_WORKERS = 8  # aantal blokken dat tegelijk gecommit wordt
+MAX_ATTEMPTS = 5
+BASE_DELAY = 0.5  # seconden; verdubbelt per poging
+MAX_DELAY = 16
+
+# Fouten waarbij Firestore aanraadt het opnieuw te proberen
+RETRYABLE_ERRORS = (
+    google_exceptions.Aborted,
+    google_exceptions.DeadlineExceeded,
+    google_exceptions.InternalServerError,
+    google_exceptions.ResourceExhausted,
+    google_exceptions.ServiceUnavailable,
+)
+
+
+class BulkWriter:
+    """Verzamelt writes en commit ze in blokken van `chunk_size`, `max_workers` tegelijk."""
+
+    def __init__(self, client, chunk_size=CHUNK_SIZE, max_workers=MAX_WORKERS, max_attempts=MAX_ATTEMPTS,
+                 progress=None, sleep=time.sleep):
+        self.client = client
+        self.chunk_size = chunk_size
+        self.max_workers = max_workers
+        self.max_attempts = max_attempts
+        self.progress = progress
+        self._sleep = sleep
+        # Eén write per document: blokken lopen parallel, dus de volgorde tussen blokken ligt niet
+        # vast. Een latere write op hetzelfde document vervangt de eerdere (merge-sets worden samengevoegd).
+        self._writes = {}
+
+    def __len__(self):
+        return len(self._writes)
+
+    def _add(self, kind, ref, data=None, merge=False):
+        previous = self._writes.get(ref.path)
+        if previous and kind == 'set' and merge and previous[0] == 'set':
+            data = {**previous[2], **data}
+            merge = previous[3]
+        self._writes[ref.path] = (kind, ref, data, merge)
+
+    def set(self, ref, data, merge=False):
+        self._add('set', ref, data, merge)
+
+    def update(self, ref, data):
+        self._add('update', ref, data)
+
+    def delete(self, ref):
+        self._add('delete', ref)
+
+    def _commit_chunk(self, writes):
+        for attempt in range(self.max_attempts):
+            batch = self.client.batch()
+            for kind, ref, data, merge in writes:
+                if kind == 'set':
+                    batch.set(ref, data, merge=merge)
+                elif kind == 'update':
+                    batch.update(ref, data)
+                else:
+                    batch.delete(ref)
+            try:
+                batch.commit()
+                return len(writes)
+            except RETRYABLE_ERRORS as e:
+                if attempt == self.max_attempts - 1:
+                    raise
+                delay = min(MAX_DELAY, BASE_DELAY * 2 ** attempt) * random.uniform(0.5, 1.0)
+                print(f"Bulk write blok mislukt ({e}), nieuwe poging over {delay:.1f}s...")
+                self._sleep(delay)
+
+    def commit(self):
+        """Commit alle verzamelde writes. Geeft het aantal writes terug; gooit de eerste fout door."""
+        writes = list(self._writes.values())
+        self._writes = {}
+        total = len(writes)
+        chunks = [writes[i:i + self.chunk_size] for i in range(0, total, self.chunk_size)]
+        done = 0
+        errors = []
+        # De callback draait in de aanroepende thread (Streamlit elementen mogen niet uit een worker)
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(chunks)))) as pool:
+            futures = [pool.submit(self._commit_chunk, chunk) for chunk in chunks]
+            for future in as_completed(futures):
+                try:
+                    done += future.result()
+                except Exception as e:
+                    errors.append(e)
+                    continue
+                if self.progress is not None:
+                    self.progress(done, total)
+        if errors:
+            raise errors[0]
+        return total
@@ -0,0 +1,24 @@
+# conftest.py
+"""Gedeelde fixtures: één generator voor willekeurige wedstrijden (dezelfde als benchmark.py)."""
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from benchmark import generate_matches
+
+
+@pytest.fixture
+def random_matches():
+    """
+    `random_matches(n, players, seed=7)`: n deterministisch willekeurige wedstrijden (oudste eerst,
+    één per kwartier vanaf 1 januari 2025, zie benchmark.generate_matches) als lijst dicts, met
+    `match_id` en `datum` in UTC zoals get_matches ze levert.
+    """
+    def make(n, players, seed=7):
+        matches = generate_matches(n, list(players), seed=seed, start=datetime(2025, 1, 1, 12, 0))
+        for i, match in enumerate(matches):
+            match['match_id'] = f"m{i}"
+            match['datum'] = pd.Timestamp(match['timestamp'], tz='UTC')
+        return matches
+    return make
@@ -0,0 +1,153 @@
+# elo_index.py
+"""
+As-of index op de ELO log: "wat was de rating van speler P op tijdstip T?".
+
+Dezelfde index dient als trajectopslag voor de grafieken: de log wordt één keer geladen en
+per speler als kolommen bewaard, zodat overlays van meerdere spelers en de ranking door de
+tijd geen extra queries kosten.
+
+De log (of de uitvoer van een replay, zie elo_engine.EloReplay.elo_entries) wordt één keer
+gesorteerd op (speler, tijdstip); per speler staan de tijdstippen en ratings dan als
+aaneengesloten stuk in twee arrays. Eén vraag is een bisect in dat stuk; veel vragen tegelijk
+(alle spelers op een seizoensgrens, of per speler een eigen tijdstip) zijn één
+`np.searchsorted` over een samengestelde sleutel (speler, tijdstip-rang).
+"""
+import numpy as np
+import pandas as pd
+
+DEFAULT_RATING = 1000
+
+
+def _series_ns(timestamps):
+    """Tijdstippen als int64 nanoseconden UTC; tz-naive telt als UTC, net als elders in de app."""
+    timestamps = pd.to_datetime(pd.Series(timestamps), errors='coerce', utc=True)
+    return timestamps.dt.tz_convert(None).astype('datetime64[ns]').to_numpy().view(np.int64)
+
+
+def _as_ns(when):
+    """Eén tijdstip of een reeks tijdstippen als int64 nanoseconden UTC."""
+    if isinstance(when, (list, tuple, np.ndarray, pd.Series, pd.Index)):
+        return _series_ns(when)
+    return int(_series_ns([when])[0])
+
+
+class RatingIndex:
+    """Gesorteerde (tijdstip, rating) reeksen per speler met as-of opzoeken."""
+
+    def __init__(self, names, offsets, timestamps, ratings):
+        self.names = list(names)
+        self.codes = {name: code for code, name in enumerate(self.names)}
+        self.offsets = offsets  # reeks van speler i staat in [offsets[i], offsets[i + 1])
+        self.timestamps = timestamps  # int64 ns UTC
+        self.ratings = ratings
+        # Samengestelde sleutel voor vectorized opzoeken: speler * (aantal tijdstippen + 1) + rang + 1
+        self._times = np.unique(timestamps)
+        self._stride = len(self._times) + 1
+        player_codes = np.repeat(np.arange(len(self.names)), np.diff(offsets))
+        self._keys = player_codes * self._stride + np.searchsorted(self._times, timestamps) + 1
+
+    @classmethod
+    def from_entries(cls, entries):
+        """Bouwt de index uit ELO regels (DataFrame of lijst van dicts met speler_naam, timestamp, rating)."""
+        frame = entries if isinstance(entries, pd.DataFrame) else pd.DataFrame(list(entries))
+        if frame.empty:
+            return cls([], np.zeros(1, dtype=np.int64), np.array([], dtype=np.int64), np.array([], dtype=np.float64))
+
+        frame = frame[frame['speler_naam'].notna()]
+        times = _series_ns(frame['timestamp'])
+        valid = times != np.iinfo(np.int64).min  # NaT
+        codes, names = pd.factorize(frame['speler_naam'].to_numpy()[valid])
+        times = times[valid]
+        ratings = pd.to_numeric(frame['rating'], errors='coerce').to_numpy(dtype=np.float64)[valid]
+
+        # Eén stabiele sortering op (speler, tijdstip): bij gelijke tijdstippen telt de laatste regel
+        order = np.lexsort((times, codes))
+        offsets = np.concatenate([[0], np.cumsum(np.bincount(codes, minlength=len(names)))])
+        return cls(names, offsets, times[order], ratings[order])
+
+    def _slice(self, speler_naam):
+        code = self.codes.get(speler_naam)
+        if code is None:
+            return 0, 0
+        return self.offsets[code], self.offsets[code + 1]
+
+    def __len__(self):
+        return len(self.ratings)
+
+    def __contains__(self, speler_naam):
+        return speler_naam in self.codes
+
+    def history(self, speler_naam):
+        """Alle (timestamp, rating) regels van één speler, oudste eerst."""
+        start, end = self._slice(speler_naam)
+        return pd.DataFrame({
+            'timestamp': pd.to_datetime(self.timestamps[start:end], utc=True),
+            'rating': self.ratings[start:end],
+        })
+
+    def trajectories(self, players):
+        """
+        ELO verloop van meerdere spelers in lange vorm (speler, match_num, timestamp, rating) voor
+        overlay grafieken; `match_num` telt per speler vanaf 1.
+        """
+        players = list(players)
+        bounds = [self._slice(name) for name in players]
+        rows = np.concatenate([np.arange(start, end) for start, end in bounds] + [np.array([], dtype=np.int64)])
+        lengths = [end - start for start, end in bounds]
+        return pd.DataFrame({
+            'speler': np.repeat(np.array(players, dtype=object), lengths),
+            'match_num': np.concatenate([np.arange(1, n + 1) for n in lengths] + [np.array([], dtype=np.int64)]),
+            'timestamp': pd.to_datetime(self.timestamps[rows], utc=True),
+            'rating': self.ratings[rows],
+        })
+
+    def rank_history(self, players=None):
+        """
+        Rangpositie (1 = hoogste rating) van elke speler na elk moment in de log, als breed
+        DataFrame met de tijdstippen als index en een kolom per speler. Een speler telt mee
+        vanaf zijn eerste regel; daarvóór is de rang leeg.
+        """
+        if not len(self):
+            return pd.DataFrame(columns=list(players or []), dtype=float)
+        # Laatste regel per (speler, tijdstip): de sleutels staan gesorteerd, dus kijk naar de volgende
+        last = np.append(self._keys[1:] != self._keys[:-1], True)
+        player_codes = self._keys[last] // self._stride
+        time_ranks = self._keys[last] % self._stride - 1
+
+        grid = np.full((len(self._times), len(self.names)), np.nan)
+        grid[time_ranks, player_codes] = self.ratings[last]
+        ratings = pd.DataFrame(grid, index=pd.to_datetime(self._times, utc=True), columns=self.names).ffill()
+        ranks = ratings.rank(axis=1, ascending=False, method='min')
+        if players is not None:
+            ranks = ranks.reindex(columns=list(players))
+        ranks.index.name = 'timestamp'
+        return ranks
+
+    def rating_at(self, speler_naam, when, default=None):
+        """Rating van de speler op `when` (laatste regel op of vóór dat tijdstip), anders `default`."""
+        start, end = self._slice(speler_naam)
+        position = start + np.searchsorted(self.timestamps[start:end], _as_ns(when), side='right')
+        return float(self.ratings[position - 1]) if position > start else default
+
+    def ratings_at(self, players, when, default=DEFAULT_RATING):
+        """
+        Ratings van `players` op `when` in één vectorized opzoekslag. `when` is één tijdstip voor
+        alle spelers of een tijdstip per speler; zonder regel vóór dat moment geldt `default`.
+        """
+        players = list(players)
+        result = np.full(len(players), default, dtype=np.float64)
+        if not players or not len(self):
+            return result
+        codes = np.array([self.codes.get(name, -1) for name in players], dtype=np.int64)
+        times = _as_ns(when)
+        times = np.broadcast_to(np.asarray(times, dtype=np.int64), codes.shape)
+
+        known = codes >= 0
+        # Aantal verschillende tijdstippen op of vóór het moment = hoogste rang die nog meetelt
+        ranks = np.searchsorted(self._times, times[known], side='right')
+        positions = np.searchsorted(self._keys, codes[known] * self._stride + ranks, side='right') - 1
+        found = positions >= self.offsets[codes[known]]
+        values = result[known]
+        values[found] = self.ratings[positions[found]]
+        result[known] = values
+        return result
@@ -0,0 +1,202 @@
+# exports.py
+"""
+Streaming exports van de wedstrijden (`uitslag`) en de ELO log (`elo`) naar CSV, gzip JSONL of Parquet.
+
+De documenten komen per pagina uit de database (firestore_service.iter_match_pages /
+iter_elo_pages, met cursors en filters in de query) en gaan pagina voor pagina naar de writer.
+Het geheugengebruik hangt dus af van de paginagrootte, niet van de grootte van de collectie.
+Optioneel gefilterd op speler, seizoen en/of periode.
+
+Dat geldt voor de export zelf en voor de CLI. De download in de Ruwe Data tab blijft gebufferd:
+de export gaat naar een tijdelijk bestand, maar st.download_button leest dat voor zijn media
+manager in één keer in het geheugen. Voor grote exports is de CLI de route.
+
+Vanaf de commandline (backend via dezelfde config als de app, zie storage.py):
+
+    python exports.py elo --format parquet --seizoen 2025 -o elo_2025.parquet
+    python exports.py uitslag --format jsonl.gz --van 2025-01-01 --tot 2025-06-30
+
+Parquet heeft pyarrow nodig, dat geen vaste dependency van de app is; zonder pyarrow bieden
+de Ruwe Data tab en de CLI alleen CSV en gzip JSONL aan.
+"""
+import argparse
+import gzip
+import importlib.util
+import tempfile
+
+import pandas as pd
+
+if __name__ == "__main__":
+    import streamlit.config
+    import streamlit.logger
+
+    # Als CLI: zonder `streamlit run` waarschuwt elke cache loader bij het importeren over de
+    # ontbrekende runtime (zie benchmark.py), dus het niveau omhoog vóór firestore_service
+    streamlit.config.get_config_options()
+    streamlit.logger.set_log_level('error')
+
+import firestore_service as db
+import season_utils
+from frame_schema import COUNT_COLUMNS, NUMBER_COLUMNS, SEAT_COLUMNS, TIME_COLUMNS
+
+# Vaste kolommen per dataset, zodat elke pagina (ook een zonder bv. spelernummers) dezelfde vorm heeft
+DATASETS = {
+    'uitslag': (db.iter_match_pages, db.MATCH_COLUMNS + ['season_id']),
+    'elo': (db.iter_elo_pages, db.ELO_LOG_FIELDS),
+}
+
+# Parquet schrijft de pagina's in row groups van ongeveer dit aantal rijen
+PARQUET_ROW_GROUP_ROWS = 50_000
+
+
+def _has_pyarrow():
+    return importlib.util.find_spec('pyarrow') is not None
+
+
+def period_filter(season=None, start=None, end=None):
+    """
+    (since, before) in UTC voor seizoen `season` (zie season_utils.season_window) en/of de
+    datums `start` t/m `end` (de einddatum telt de hele dag mee); beide samen geven de overlap.
+    """
+    since = before = None
+    if season is not None:
+        since, before = season_utils.season_window(season)
+    if start is not None:
+        start = pd.Timestamp(start, tz='UTC')
+        since = start if since is None else max(since, start)
+    if end is not None:
+        end = pd.Timestamp(end, tz='UTC') + pd.Timedelta(days=1)
+        before = end if before is None else min(before, end)
+    return since, before
+
+
+def export_pages(dataset, speler_naam=None, since=None, before=None, page_size=db.EXPORT_PAGE_SIZE):
+    """De pagina's van een dataset als DataFrames met de vaste kolommen uit DATASETS."""
+    iter_pages, columns = DATASETS[dataset]
+    for page in iter_pages(speler_naam=speler_naam, since=since, before=before, page_size=page_size):
+        yield page.reindex(columns=columns)
+
+
+def write_csv(pages, out):
+    """Schrijft de pagina's als één CSV (UTF-8) naar het binaire bestand `out`."""
+    rows = 0
+    for i, page in enumerate(pages):
+        out.write(page.to_csv(index=False, header=i == 0).encode('utf-8'))
+        rows += len(page)
+    return rows
+
+
+def write_jsonl_gz(pages, out):
+    """Schrijft de pagina's als gzip JSON Lines (één object per regel, ISO tijdstippen) naar `out`."""
+    rows = 0
+    with gzip.GzipFile(fileobj=out, mode='wb') as gz:
+        for page in pages:
+            if page.empty:
+                continue
+            lines = page.to_json(orient='records', lines=True, date_format='iso', date_unit='us')
+            gz.write(lines.encode('utf-8') if lines.endswith('\n') else (lines + '\n').encode('utf-8'))
+            rows += len(page)
+    return rows
+
+
+def _arrow_schema(columns):
+    """Vast Arrow schema, zodat categorical namen en kleine integers per pagina niet van type wisselen."""
+    import pyarrow as pa
+    fields = []
+    for column in columns:
+        if column in SEAT_COLUMNS or column in ('speler_naam', 'match_id'):
+            fields.append(pa.field(column, pa.string()))
+        elif column in COUNT_COLUMNS:
+            fields.append(pa.field(column, pa.int16()))
+        elif column in TIME_COLUMNS:
+            fields.append(pa.field(column, pa.timestamp('us', tz='UTC')))
+        elif column in NUMBER_COLUMNS or column == 'season_id':
+            fields.append(pa.field(column, pa.int32()))
+        else:
+            fields.append(pa.field(column, pa.float64()))
+    return pa.schema(fields)
+
+
+def write_parquet(pages, out):
+    """Schrijft de pagina's als Parquet naar `out`, met een vast schema en row groups van ~PARQUET_ROW_GROUP_ROWS."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    writer = None
+    buffered, buffered_rows, rows = [], 0, 0
+    try:
+        for page in pages:
+            if writer is None:
+                schema = _arrow_schema(page.columns)
+                writer = pq.ParquetWriter(out, schema)
+            # Categorical namen als gewone strings; Parquet codeert ze zelf weer als dictionary
+            plain = page.astype({col: object for col in page.columns if isinstance(page[col].dtype, pd.CategoricalDtype)})
+            buffered.append(pa.Table.from_pandas(plain, schema=schema, preserve_index=False))
+            buffered_rows += len(page)
+            rows += len(page)
+            if buffered_rows >= PARQUET_ROW_GROUP_ROWS:
+                writer.write_table(pa.concat_tables(buffered))
+                buffered, buffered_rows = [], 0
+        if buffered:
+            writer.write_table(pa.concat_tables(buffered))
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+
+# formaat -> (writer, extensie, MIME type)
+FORMATS = {
+    'csv': (write_csv, 'csv', 'text/csv'),
+    'jsonl.gz': (write_jsonl_gz, 'jsonl.gz', 'application/gzip'),
+    'parquet': (write_parquet, 'parquet', 'application/vnd.apache.parquet'),
+}
+
+
+def available_formats():
+    """De formaten die in deze omgeving kunnen; Parquet alleen als pyarrow geïnstalleerd is."""
+    return [fmt for fmt in FORMATS if fmt != 'parquet' or _has_pyarrow()]
+
+
+def export(dataset, fmt, out, speler_naam=None, since=None, before=None, page_size=db.EXPORT_PAGE_SIZE):
+    """Exporteert een dataset in formaat `fmt` naar het binaire bestand `out`; geeft het aantal rijen terug."""
+    if fmt not in available_formats():
+        raise ValueError(f"Exportformaat '{fmt}' is niet beschikbaar (kies uit {', '.join(available_formats())}).")
+    write = FORMATS[fmt][0]
+    return write(export_pages(dataset, speler_naam, since, before, page_size), out)
+
+
+def export_file(dataset, fmt, speler_naam=None, since=None, before=None):
+    """
+    De export in een tijdelijk bestand, teruggespoeld naar het begin, voor st.download_button
+    (pas aangeroepen als er op de knop geklikt wordt). Streamlit leest het bestand daarna zelf
+    in het geheugen; het bestand verdwijnt zodra het gesloten of opgeruimd wordt.
+    """
+    out = tempfile.TemporaryFile()
+    export(dataset, fmt, out, speler_naam=speler_naam, since=since, before=before)
+    out.seek(0)
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exporteer wedstrijden of de ELO log.")
+    parser.add_argument('dataset', choices=list(DATASETS))
+    parser.add_argument('--format', choices=list(FORMATS), default='csv')
+    parser.add_argument('--speler', help="alleen deze speler")
+    parser.add_argument('--seizoen', type=int, help="seizoensjaar, bv. 2025 voor Seizoen 2024/2025")
+    parser.add_argument('--van', type=pd.Timestamp, help="vanaf deze datum (JJJJ-MM-DD)")
+    parser.add_argument('--tot', type=pd.Timestamp, help="tot en met deze datum (JJJJ-MM-DD)")
+    parser.add_argument('--page-size', type=int, default=db.EXPORT_PAGE_SIZE)
+    parser.add_argument('-o', '--output', help="doelbestand (standaard <dataset>.<extensie>)")
+    args = parser.parse_args()
+    if args.format not in available_formats():
+        parser.error(f"formaat '{args.format}' heeft pyarrow nodig (pip install pyarrow)")
+
+    since, before = period_filter(args.seizoen, args.van, args.tot)
+    output = args.output or f"{args.dataset}.{FORMATS[args.format][1]}"
+    with open(output, 'wb') as out:
+        rows = export(args.dataset, args.format, out, args.speler, since, before, args.page_size)
+    print(f"{rows} rijen geëxporteerd naar {output}")
+
+
+if __name__ == "__main__":
+    main()
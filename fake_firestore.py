@@ -0,0 +1,485 @@
+# fake_firestore.py
+"""
+In-memory stand-in voor het deel van de `google.cloud.firestore` API dat de app gebruikt.
+
+Gebruik: `FirestoreBackend(FakeFirestoreClient())` of `TAFELVOETBAL_BACKEND=memory`.
+Alles draait in het proces, is direct consistent (geen `time.sleep` nodig) en telt
+reads/writes/deletes zoals Firestore ze zou factureren, zodat benchmarks herhaalbaar zijn.
+
+Ondersteund: collection, document, add, where (FieldFilter, Or/And of field/op/value), order_by
+(ook op `__name__`), limit, start_after, select, stream/get, count/sum/avg aggregaties, batch (set/update/delete, max 500 writes), SERVER_TIMESTAMP, Increment en
+on_snapshot op collecties. Listeners worden synchroon aangeroepen na elke commit.
+"""
+import math
+import random
+import string
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta, timezone
+
+from google.cloud.firestore_v1 import SERVER_TIMESTAMP, Increment
+from google.cloud.firestore_v1.watch import ChangeType, DocumentChange
+
+MAX_BATCH_WRITES = 500
+DOCUMENT_ID = '__name__'
+ASCENDING = 'ASCENDING'
+DESCENDING = 'DESCENDING'
+
+_ID_ALPHABET = string.ascii_letters + string.digits
+
+
+class NotFound(Exception):
+    """Zelfde betekenis als google.api_core.exceptions.NotFound."""
+
+
+def _normalize_value(value, server_time, current=None):
+    """Zet waarden om zoals Firestore ze zou opslaan (`current` is de huidige veldwaarde)."""
+    if value is SERVER_TIMESTAMP:
+        return server_time
+    if isinstance(value, Increment):
+        return (current or 0) + value.value
+    if isinstance(value, dict):
+        return {k: _normalize_value(v, server_time) for k, v in value.items()}
+    if hasattr(value, 'to_pydatetime'):
+        value = value.to_pydatetime()
+    if isinstance(value, datetime):
+        # Firestore slaat alles in UTC op en geeft timezone-aware datetimes terug
+        if value.tzinfo is None:
+            return value.replace(tzinfo=timezone.utc)
+        return value.astimezone(timezone.utc)
+    if isinstance(value, date):
+        raise TypeError("Firestore ondersteunt geen date zonder tijd; gebruik datetime.")
+    return value
+
+
+def _matches(doc_value, op, value):
+    if op == '==':
+        return doc_value == value
+    if op == '!=':
+        return doc_value is not None and doc_value != value
+    if op == 'in':
+        return doc_value in value
+    if op == 'not-in':
+        return doc_value is not None and doc_value not in value
+    if op == 'array_contains':
+        return isinstance(doc_value, list) and value in doc_value
+    if op == 'array_contains_any':
+        return isinstance(doc_value, list) and any(v in doc_value for v in value)
+    if doc_value is None:
+        return False
+    if op == '<':
+        return doc_value < value
+    if op == '<=':
+        return doc_value <= value
+    if op == '>':
+        return doc_value > value
+    if op == '>=':
+        return doc_value >= value
+    raise ValueError(f"Operator '{op}' wordt niet ondersteund door de fake client")
+
+
+def _filter_matches(data, doc_id, flt):
+    """Eén filter uit Query._filters: (veld, operator, waarde), of ('or'/'and', None, [filters])."""
+    field, op, value = flt
+    if op is None:
+        results = (_filter_matches(data, doc_id, sub) for sub in value)
+        return any(results) if field == 'or' else all(results)
+    return _matches(_field_value(data, doc_id, field), op, value)
+
+
+def _field_value(data, doc_id, field):
+    """Waarde van een veld; `__name__` (FieldPath.document_id()) is het document-ID."""
+    return doc_id if field == DOCUMENT_ID else data.get(field)
+
+
+def _filter_tuple(flt):
+    """FieldFilter of Or/And (google.cloud.firestore_v1.base_query) als tuple voor Query._filters."""
+    if hasattr(flt, 'filters'):
+        kind = 'or' if type(flt).__name__ == 'Or' else 'and'
+        return (kind, None, [_filter_tuple(sub) for sub in flt.filters])
+    return (flt.field_path, flt.op_string, flt.value)
+
+
+class DocumentSnapshot:
+    def __init__(self, reference, data):
+        self.reference = reference
+        self.id = reference.id
+        self._data = data
+
+    @property
+    def exists(self):
+        return self._data is not None
+
+    def to_dict(self):
+        return dict(self._data) if self._data is not None else None
+
+    def get(self, field):
+        return (self._data or {}).get(field)
+
+
+class DocumentReference:
+    def __init__(self, collection, doc_id):
+        self._collection = collection
+        self._client = collection._client
+        self.id = doc_id
+
+    @property
+    def path(self):
+        return f"{self._collection.id}/{self.id}"
+
+    def get(self):
+        self._client._count('reads')
+        return DocumentSnapshot(self, self._collection._docs.get(self.id))
+
+    def set(self, data, merge=False):
+        self._client._apply([('set', self, data, merge)])
+
+    def update(self, data):
+        self._client._apply([('update', self, data, False)])
+
+    def delete(self):
+        self._client._apply([('delete', self, None, False)])
+
+
+class Query:
+    def __init__(self, collection, filters=(), orders=(), limit=None, projection=None, cursor=None):
+        self._collection = collection
+        self._filters = tuple(filters)
+        self._orders = tuple(orders)
+        self._limit = limit
+        self._projection = projection
+        self._cursor = cursor
+
+    def _copy(self, **changes):
+        params = dict(
+            filters=self._filters, orders=self._orders, limit=self._limit,
+            projection=self._projection, cursor=self._cursor,
+        )
+        params.update(changes)
+        return Query(self._collection, **params)
+
+    def where(self, field_path=None, op_string=None, value=None, *, filter=None):
+        if filter is not None:
+            return self._copy(filters=self._filters + (_filter_tuple(filter),))
+        return self._copy(filters=self._filters + ((field_path, op_string, value),))
+
+    def order_by(self, field_path, direction=ASCENDING):
+        return self._copy(orders=self._orders + ((field_path, direction),))
+
+    def limit(self, count):
+        return self._copy(limit=count)
+
+    def start_after(self, document_fields):
+        """Cursor na een document: een snapshot, een dict met de sorteervelden of een lijst waarden."""
+        if isinstance(document_fields, DocumentSnapshot):
+            document_fields = {**document_fields.to_dict(), DOCUMENT_ID: document_fields.id}
+        if isinstance(document_fields, dict):
+            document_fields = [document_fields[field] for field, _ in self._orders[:len(document_fields)]]
+        return self._copy(cursor=[_normalize_value(value, None) for value in document_fields])
+
+    def select(self, field_paths):
+        """Net als Firestore: alleen deze velden komen mee (filteren en sorteren kijkt naar het hele document)."""
+        return self._copy(projection=tuple(field_paths))
+
+    def count(self, alias=None):
+        return AggregationQuery(self).count(alias)
+
+    def sum(self, field_ref, alias=None):
+        return AggregationQuery(self).sum(field_ref, alias)
+
+    def avg(self, field_ref, alias=None):
+        return AggregationQuery(self).avg(field_ref, alias)
+
+    def _select(self):
+        """De documenten die de query oplevert, zonder reads te tellen."""
+        with self._collection._client._lock:
+            docs = list(self._collection._docs.items())
+        for flt in self._filters:
+            docs = [(doc_id, data) for doc_id, data in docs if _filter_matches(data, doc_id, flt)]
+
+        # Net als Firestore: documenten zonder het sorteerveld vallen buiten de query
+        for field, _ in self._orders:
+            docs = [(doc_id, data) for doc_id, data in docs if _field_value(data, doc_id, field) is not None]
+
+        # Stabiel sorteren: eerst op document-ID (in de richting van het laatste sorteerveld,
+        # zoals Firestore), dan per sorteerveld van achter naar voor
+        docs.sort(key=lambda item: item[0], reverse=bool(self._orders) and self._orders[-1][1] == DESCENDING)
+        for field, direction in reversed(self._orders):
+            docs.sort(key=lambda item: _field_value(item[1], item[0], field), reverse=(direction == DESCENDING))
+
+        if self._cursor is not None:
+            docs = [(doc_id, data) for doc_id, data in docs if self._after_cursor(doc_id, data)]
+
+        if self._limit is not None:
+            docs = docs[:self._limit]
+        return docs
+
+    def _after_cursor(self, doc_id, data):
+        """True als het document in de sorteervolgorde strikt na de cursor komt."""
+        for (field, direction), value in zip(self._orders, self._cursor):
+            doc_value = _field_value(data, doc_id, field)
+            if doc_value != value:
+                return doc_value > value if direction == ASCENDING else doc_value < value
+        return False
+
+    def _run(self):
+        docs = self._select()
+        self._collection._client._count('reads', max(len(docs), 1))
+        if self._projection is not None:
+            docs = [(doc_id, {f: data[f] for f in self._projection if f in data}) for doc_id, data in docs]
+        return [DocumentSnapshot(DocumentReference(self._collection, doc_id), data) for doc_id, data in docs]
+
+    def stream(self):
+        return iter(self._run())
+
+    def get(self):
+        return self._run()
+
+
+class AggregationResult:
+    def __init__(self, alias, value):
+        self.alias = alias
+        self.value = value
+
+
+class AggregationQuery:
+    """
+    count/sum/avg over een query zoals Firestore ze berekent: sum en avg tellen alleen numerieke
+    waarden, een som over niets is 0 en een gemiddelde over niets None. Kost één read per
+    1000 getelde documenten (minimaal één), niet één per document.
+    """
+
+    def __init__(self, query):
+        self._query = query
+        self._aggregations = []
+
+    def _add(self, kind, field_ref, alias):
+        self._aggregations.append((kind, field_ref, alias or f"field_{len(self._aggregations) + 1}"))
+        return self
+
+    def count(self, alias=None):
+        return self._add('count', None, alias)
+
+    def sum(self, field_ref, alias=None):
+        return self._add('sum', field_ref, alias)
+
+    def avg(self, field_ref, alias=None):
+        return self._add('avg', field_ref, alias)
+
+    def get(self):
+        docs = self._query._select()
+        self._query._collection._client._count('reads', max(math.ceil(len(docs) / 1000), 1))
+        results = []
+        for kind, field, alias in self._aggregations:
+            if kind == 'count':
+                value = len(docs)
+            else:
+                values = [
+                    data[field] for _, data in docs
+                    if isinstance(data.get(field), (int, float)) and not isinstance(data.get(field), bool)
+                ]
+                if kind == 'sum':
+                    value = sum(values)
+                else:
+                    value = sum(values) / len(values) if values else None
+            results.append(AggregationResult(alias, value))
+        return [results]
+
+
+class CollectionReference(Query):
+    def __init__(self, client, name):
+        self._client = client
+        self.id = name
+        self._docs = client._store.setdefault(name, {})
+        super().__init__(self)
+
+    def document(self, document_id=None):
+        # Zoals de echte client: een '/' maakt er een (ongeldig) subpad van
+        if document_id and '/' in document_id:
+            raise ValueError("A document must have an even number of path elements")
+        return DocumentReference(self, document_id or self._client._new_id())
+
+    def add(self, data):
+        ref = self.document()
+        ref.set(data)
+        return None, ref
+
+    def on_snapshot(self, callback):
+        """Start een listener: eerst alle bestaande documenten als ADDED, daarna elke wijziging."""
+        watch = Watch(self, callback)
+        with self._client._lock:
+            self._client._watches.setdefault(self.id, []).append(watch)
+            initial = [
+                DocumentChange(ChangeType.ADDED, DocumentSnapshot(DocumentReference(self, doc_id), data), -1, i)
+                for i, (doc_id, data) in enumerate(self._docs.items())
+            ]
+            # Net als Firestore: de eerste snapshot kost één read per document
+            self._client.stats['reads'] += max(len(initial), 1)
+        watch._notify(initial)
+        return watch
+
+
+class Watch:
+    """Actieve snapshot listener; zelfde interface als google.cloud.firestore_v1.watch.Watch."""
+
+    def __init__(self, collection, callback):
+        self._collection = collection
+        self._callback = callback
+
+    def unsubscribe(self):
+        watches = self._collection._client._watches.get(self._collection.id, [])
+        if self in watches:
+            watches.remove(self)
+
+    def _notify(self, changes):
+        # Snapshot onder de lock: andere threads kunnen intussen committen
+        with self._collection._client._lock:
+            docs = [DocumentSnapshot(DocumentReference(self._collection, doc_id), data)
+                    for doc_id, data in self._collection._docs.items()]
+        self._callback(docs, changes, datetime.now(timezone.utc))
+
+
+class WriteBatch:
+    def __init__(self, client):
+        self._client = client
+        self._ops = []
+
+    def set(self, reference, data, merge=False):
+        self._ops.append(('set', reference, data, merge))
+
+    def update(self, reference, data):
+        self._ops.append(('update', reference, data, False))
+
+    def delete(self, reference):
+        self._ops.append(('delete', reference, None, False))
+
+    def commit(self):
+        if len(self._ops) > MAX_BATCH_WRITES:
+            raise ValueError(f"maximum {MAX_BATCH_WRITES} writes allowed per request")
+        if self._client.latency:
+            time.sleep(self._client.latency)
+        self._client._apply(self._ops)
+        self._ops = []
+
+
+class FakeFirestoreClient:
+    """Process-lokale Firestore vervanger met read/write tellers."""
+
+    def __init__(self, seed=0, clock=None, latency=0.0):
+        self._store = {}
+        # Servertijd is instelbaar voor tests (callable die een aware datetime teruggeeft)
+        self.clock = clock or (lambda: datetime.now(timezone.utc))
+        # Gesimuleerde netwerktijd per batch commit (seconden), voor benchmarks van parallelle writes
+        self.latency = latency
+        self._rng = random.Random(seed)
+        self._lock = threading.RLock()
+        self._last_server_time = None
+        self._watches = {}
+        self.stats = {'reads': 0, 'writes': 0, 'deletes': 0, 'commits': 0}
+
+    def collection(self, name):
+        return CollectionReference(self, name)
+
+    def batch(self):
+        return WriteBatch(self)
+
+    # ---------- Tellers ----------
+    def reset_stats(self):
+        for key in self.stats:
+            self.stats[key] = 0
+
+    @contextmanager
+    def track(self):
+        """Meet reads/writes binnen een blok: `with client.track() as usage: ...`."""
+        before = dict(self.stats)
+        usage = {}
+        try:
+            yield usage
+        finally:
+            usage.update({key: self.stats[key] - before[key] for key in self.stats})
+
+    def _count(self, key, amount=1):
+        with self._lock:
+            self.stats[key] += amount
+
+    # ---------- Intern ----------
+    def _new_id(self):
+        with self._lock:
+            return ''.join(self._rng.choice(_ID_ALPHABET) for _ in range(20))
+
+    def _server_time(self):
+        # Strikt oplopend, zodat sorteren op SERVER_TIMESTAMP deterministisch is
+        now = self.clock()
+        if self._last_server_time is not None and now <= self._last_server_time:
+            now = self._last_server_time + timedelta(microseconds=1)
+        self._last_server_time = now
+        return now
+
+    def _apply(self, ops):
+        """Voert writes atomair uit (alles of niets), zoals een Firestore batch."""
+        with self._lock:
+            server_time = self._server_time()
+            staged = []
+            pending = {}  # stand binnen deze batch, zodat opeenvolgende writes op elkaar voortbouwen
+            for kind, ref, data, merge in ops:
+                key = (ref._collection.id, ref.id)
+                if kind == 'delete':
+                    staged.append((ref, None))
+                    pending[key] = None
+                    continue
+                current = pending[key] if key in pending else ref._collection._docs.get(ref.id)
+                # Bij een set zonder merge start het document leeg, ook voor Increment
+                base = current if (kind == 'update' or merge) and current is not None else {}
+                new_data = {k: _normalize_value(v, server_time, base.get(k)) for k, v in data.items()}
+                if kind == 'update':
+                    if current is None:
+                        raise NotFound(f"No document to update: {ref.path}")
+                    new_data = {**current, **new_data}
+                elif merge and current is not None:
+                    new_data = {**current, **new_data}
+                staged.append((ref, new_data))
+                pending[key] = new_data
+
+            existed = {}
+            for ref, new_data in staged:
+                docs = ref._collection._docs
+                existed.setdefault((ref._collection.id, ref.id), (ref, ref.id in docs))
+                if new_data is None:
+                    docs.pop(ref.id, None)
+                    self.stats['deletes'] += 1
+                else:
+                    docs[ref.id] = new_data
+                    self.stats['writes'] += 1
+            self.stats['commits'] += 1
+            notifications = self._collect_changes(existed)
+
+        # Listeners buiten de lock aanroepen, zodat ze zelf weer mogen lezen
+        for watch, changes in notifications:
+            watch._notify(changes)
+
+    def _collect_changes(self, existed):
+        """Bepaalt per collectie met listeners de documentwijzigingen van één commit."""
+        changes_per_collection = {}
+        for (collection_id, doc_id), (ref, was_present) in existed.items():
+            if not self._watches.get(collection_id):
+                continue
+            data = ref._collection._docs.get(doc_id)
+            if data is None and not was_present:
+                continue
+            if data is None:
+                change_type = ChangeType.REMOVED
+            elif was_present:
+                change_type = ChangeType.MODIFIED
+            else:
+                change_type = ChangeType.ADDED
+            snapshot = DocumentSnapshot(ref, data)
+            changes_per_collection.setdefault(collection_id, []).append(DocumentChange(change_type, snapshot, -1, -1))
+
+        notifications = []
+        for collection_id, changes in changes_per_collection.items():
+            for watch in list(self._watches[collection_id]):
+                # Elke listener betaalt één read per gewijzigd document
+                self.stats['reads'] += len(changes)
+                notifications.append((watch, changes))
+        return notifications
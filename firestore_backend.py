@@ -0,0 +1,444 @@
+# firestore_backend.py
+"""Firestore implementatie van de opslag-interface (zie storage.py)."""
+import json
+import streamlit as st
+import google.cloud.firestore
+from google.oauth2 import service_account
+from google.cloud.firestore_v1.base_query import FieldFilter, Or
+from google.cloud.firestore_v1.field_path import FieldPath
+from google.cloud.firestore_v1 import SERVER_TIMESTAMP, Increment
+
+from bulk_writer import BulkWriter
+from storage import (
+    ELO_CHECKPOINTS, MATCH_TOMBSTONES, SEAT_NR_FIELDS, StorageBackend, elo_entry_id, seat_numbers,
+    seat_numbers_missing,
+)
+
+IN_QUERY_LIMIT = 30  # maximaal aantal waarden in een 'in' filter
+# Projectie op alleen het document-ID (een lege select() geeft in Firestore juist alle velden)
+KEYS_ONLY = [FieldPath.document_id()]
+
+
+def _projected(query, fields):
+    """De query met `select(fields)` als er een projectie gevraagd is (zie StorageBackend)."""
+    if fields is None:
+        return query
+    return query.select(list(fields) or KEYS_ONLY)
+
+
+# FIRESTORE INITIALISATIE
+def is_running_in_streamlit():
+    """Controleert of de code wordt uitgevoerd binnen een Streamlit-sessie."""
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+        return get_script_run_ctx() is not None
+    except ImportError:
+        return False
+
+@st.cache_resource
+def initialize_firestore():
+    """
+    Maakt verbinding met Firestore.
+    Gebruikt Streamlit secrets in de cloud, anders lokaal serviceaccountbestand.
+    """
+    project_id = None
+
+    # Probeer eerst Streamlit secrets (voor cloud deployment)
+    try:
+        if hasattr(st, 'secrets') and 'firestore_credentials' in st.secrets:
+            # Streamlit Cloud: gebruik secrets
+            key_dict = dict(st.secrets["firestore_credentials"])
+            project_id = key_dict.get("project_id")
+            creds = service_account.Credentials.from_service_account_info(key_dict)
+            print("Firestore credentials geladen vanuit Streamlit secrets")
+        else:
+            raise KeyError("Geen firestore_credentials gevonden in secrets")
+    except (KeyError, AttributeError, ValueError) as e:
+        print(f"Streamlit secrets niet beschikbaar ({e}), probeer lokaal bestand...")
+
+        # Fallback naar lokaal bestand (voor lokale ontwikkeling)
+        try:
+            with open("firestore-key.json") as f:
+                key_dict = json.load(f)
+                project_id = key_dict.get("project_id")
+            creds = service_account.Credentials.from_service_account_file("firestore-key.json")
+            print("Firestore credentials geladen vanuit lokaal bestand")
+        except FileNotFoundError:
+            print("Fout: Noch Streamlit secrets noch 'firestore-key.json' beschikbaar.")
+            print("Voor lokale ontwikkeling: voeg firestore-key.json toe aan de root.")
+            print("Voor Streamlit Cloud: configureer firestore_credentials in secrets.")
+            raise
+        except Exception as e:
+            print(f"Fout bij laden van lokale credentials: {e}")
+            raise
+
+    if not project_id:
+        raise ValueError("Project ID kon niet worden gevonden in de credentials.")
+
+    db = google.cloud.firestore.Client(credentials=creds, project=project_id)
+    print(f"Firestore client succesvol geïnitialiseerd voor project: {project_id}")
+    return db
+
+
+class FirestoreBackend(StorageBackend):
+    """Slaat alles op in de Firestore collecties spelers, uitslag, elo en requests."""
+
+    name = "firestore"
+
+    def __init__(self, client):
+        self.client = client
+        # Maak referenties naar de collecties
+        self.players_ref = client.collection('spelers')
+        self.matches_ref = client.collection('uitslag')
+        self.elo_ref = client.collection('elo')
+        self.requests_ref = client.collection('requests')
+        self.tombstones_ref = client.collection(MATCH_TOMBSTONES)
+        self.checkpoints_ref = client.collection(ELO_CHECKPOINTS)
+
+    def _collection(self, collection_name):
+        return self.client.collection(collection_name)
+
+    def _bulk(self, progress=None):
+        """BulkWriter voor grote reeksen writes (blokken, parallel, met retry)."""
+        return BulkWriter(self.client, progress=progress)
+
+    def _player_refs(self, values, field='speler_naam'):
+        """Zoekt de documenten van spelers op naam of `speler_nr`: {waarde: DocumentReference}."""
+        values = list(dict.fromkeys(v for v in values if v is not None and v != ''))
+        refs = {}
+        for i in range(0, len(values), IN_QUERY_LIMIT):
+            query = self.players_ref.where(filter=FieldFilter(field, 'in', values[i:i + IN_QUERY_LIMIT]))
+            query = query.select([field])
+            for doc in query.stream():
+                refs[doc.get(field)] = doc.reference
+        return refs
+
+    def _player_refs_by_number(self, players):
+        """
+        Documenten van spelers gegeven [(speler_naam, speler_nr)]: op nummer waar dat bekend is,
+        anders op naam. Geeft {speler_naam: DocumentReference} voor de gevonden spelers.
+        """
+        by_nr = self._player_refs([nr for _, nr in players if nr is not None], field='speler_nr')
+        by_name = self._player_refs([name for name, nr in players if nr is None])
+        refs = {name: by_nr.get(nr) if nr is not None else by_name.get(name) for name, nr in players}
+        return {name: ref for name, ref in refs.items() if ref is not None}
+
+    # ---------- Lezen ----------
+    def list_players(self, fields=None):
+        players_list = []
+        for doc in _projected(self.players_ref, fields).stream():
+            player_data = doc.to_dict()
+            player_data['speler_id'] = doc.id
+            players_list.append(player_data)
+        return players_list
+
+    def player_exists(self, name):
+        existing_player_query = self.players_ref.where(filter=FieldFilter('speler_naam', '==', name)).select(KEYS_ONLY).limit(1)
+        return len(list(existing_player_query.stream())) > 0
+
+    def list_matches(self, descending=True, limit=None, fields=None):
+        direction = google.cloud.firestore.Query.DESCENDING if descending else google.cloud.firestore.Query.ASCENDING
+        query = _projected(self.matches_ref, fields).order_by("timestamp", direction=direction)
+        if limit is not None:
+            query = query.limit(limit)
+        matches = []
+        for doc in query.stream():
+            match_data = doc.to_dict()
+            match_data['match_id'] = doc.id
+            matches.append(match_data)
+        return matches
+
+    def list_match_changes(self, since, fields=None):
+        changed_query = _projected(self.matches_ref.where(filter=FieldFilter('updated_at', '>=', since)), fields)
+        matches = []
+        for doc in changed_query.stream():
+            match_data = doc.to_dict()
+            match_data['match_id'] = doc.id
+            matches.append(match_data)
+
+        deleted_query = self.tombstones_ref.where(filter=FieldFilter('deleted_at', '>=', since)).select(['deleted_at'])
+        deleted = [{'match_id': doc.id, 'deleted_at': doc.get('deleted_at')} for doc in deleted_query.stream()]
+        return matches, deleted
+
+    def list_matches_after(self, timestamp, fields=None):
+        query = self.matches_ref.where(filter=FieldFilter('timestamp', '>', timestamp)).order_by("timestamp")
+        query = _projected(query, fields)
+        matches = []
+        for doc in query.stream():
+            match_data = doc.to_dict()
+            match_data['match_id'] = doc.id
+            matches.append(match_data)
+        return matches
+
+    def get_match(self, match_id):
+        match_doc = self.matches_ref.document(match_id).get()
+        if not match_doc.exists:
+            return None
+        return match_doc.to_dict()
+
+    def list_elo_logs(self, speler_naam=None, descending=True, since=None, fields=None):
+        direction = google.cloud.firestore.Query.DESCENDING if descending else google.cloud.firestore.Query.ASCENDING
+        query = _projected(self.elo_ref, fields)
+        if speler_naam is not None:
+            query = query.where(filter=FieldFilter('speler_naam', '==', speler_naam))
+        if since is not None:
+            query = query.where(filter=FieldFilter('timestamp', '>=', since))
+        query = query.order_by("timestamp", direction=direction)
+        return [doc.to_dict() for doc in query.stream()]
+
+    def _page(self, query, speler_filters, since, before, limit, start_after):
+        """Filtert, sorteert (timestamp, document-ID; nieuwste eerst) en pagineert met een cursor."""
+        if speler_filters:
+            query = query.where(filter=Or(speler_filters) if len(speler_filters) > 1 else speler_filters[0])
+        if since is not None:
+            query = query.where(filter=FieldFilter('timestamp', '>=', since))
+        if before is not None:
+            query = query.where(filter=FieldFilter('timestamp', '<', before))
+        direction = google.cloud.firestore.Query.DESCENDING
+        query = query.order_by('timestamp', direction=direction).order_by(FieldPath.document_id(), direction=direction)
+        if start_after is not None:
+            timestamp, doc_id = start_after
+            query = query.start_after({'timestamp': timestamp, FieldPath.document_id(): doc_id})
+        # Eén document extra om te weten of er een volgende pagina is
+        docs = list(query.limit(limit + 1).stream())
+        cursor = (docs[limit - 1].get('timestamp'), docs[limit - 1].id) if len(docs) > limit else None
+        return docs[:limit], cursor
+
+    def page_matches(self, speler_nr=None, since=None, before=None, limit=50, start_after=None):
+        speler_filters = [] if speler_nr is None else [
+            FieldFilter(field, '==', speler_nr) for field in SEAT_NR_FIELDS.values()
+        ]
+        docs, cursor = self._page(self.matches_ref, speler_filters, since, before, limit, start_after)
+        return [{**doc.to_dict(), 'match_id': doc.id} for doc in docs], cursor
+
+    def page_elo_logs(self, speler_nr=None, since=None, before=None, limit=50, start_after=None):
+        speler_filters = [] if speler_nr is None else [FieldFilter('speler_nr', '==', speler_nr)]
+        docs, cursor = self._page(self.elo_ref, speler_filters, since, before, limit, start_after)
+        return [doc.to_dict() for doc in docs], cursor
+
+    def list_requests(self):
+        docs = self.requests_ref.order_by("Timestamp", direction=google.cloud.firestore.Query.DESCENDING).stream()
+        return [doc.to_dict() for doc in docs]
+
+    def get_elo_checkpoint_before(self, timestamp):
+        query = (
+            self.checkpoints_ref.where(filter=FieldFilter('cursor', '<', timestamp))
+            .order_by('cursor', direction=google.cloud.firestore.Query.DESCENDING)
+            .limit(1)
+        )
+        for doc in query.stream():
+            return doc.to_dict()
+        return None
+
+    def aggregate(self, collection_name, sums=(), avgs=(), since=None, before=None):
+        query = self._collection(collection_name)
+        if since is not None:
+            query = query.where(filter=FieldFilter('timestamp', '>=', since))
+        if before is not None:
+            query = query.where(filter=FieldFilter('timestamp', '<', before))
+        # Eén aggregatie-query (max 5 aggregaties); Firestore rekent één read per 1000 getelde documenten
+        aggregation = query.count(alias='count')
+        for field in sums:
+            aggregation = aggregation.sum(field, alias=f'sum_{field}')
+        for field in avgs:
+            aggregation = aggregation.avg(field, alias=f'avg_{field}')
+        return {result.alias: result.value for results in aggregation.get() for result in results}
+
+    def sample_collection(self, collection_name, limit):
+        return [doc.to_dict() or {} for doc in self._collection(collection_name).limit(limit).stream()]
+
+    # ---------- Schrijven ----------
+    def _next_player_nr(self):
+        """Eén hoger dan het hoogste `speler_nr` (spelers zonder nummer vallen buiten de query)."""
+        query = self.players_ref.order_by('speler_nr', direction=google.cloud.firestore.Query.DESCENDING).limit(1)
+        query = query.select(['speler_nr'])
+        for doc in query.stream():
+            return int(doc.get('speler_nr')) + 1
+        return 1
+
+    def add_player(self, name, start_elo):
+        batch = self.client.batch()
+        speler_nr = self._next_player_nr()
+        # 1. Voeg de speler toe aan de 'spelers' collectie
+        new_player_ref = self.players_ref.document()
+        batch.set(new_player_ref, {
+            'speler_naam': name,
+            'speler_nr': speler_nr,
+            'rating': start_elo,
+            'gespeeld': 0,
+            'bijgewerkt': SERVER_TIMESTAMP
+        })
+
+        # 2. Voeg de initiële ELO-rating toe aan de 'elo' collectie
+        new_elo_ref = self.elo_ref.document()
+        batch.set(new_elo_ref, {
+            'speler_naam': name,
+            'speler_nr': speler_nr,
+            'rating': start_elo,
+            'timestamp': SERVER_TIMESTAMP
+        })
+        batch.commit()
+        return new_player_ref.id
+
+    def add_request(self, request_text):
+        self.requests_ref.add({'Verzoek': request_text, 'Timestamp': SERVER_TIMESTAMP})
+
+    def add_match_with_elo(self, match_data, elo_updates):
+        batch = self.client.batch()
+        new_match_ref = self.matches_ref.document()
+        batch.set(new_match_ref, {
+            **match_data,
+            'timestamp': match_data.get('timestamp') or SERVER_TIMESTAMP,
+            'updated_at': SERVER_TIMESTAMP
+        })
+
+        # Log ELO updates (altijd met SERVER_TIMESTAMP voor log volgorde)
+        numbers = seat_numbers(match_data)
+        player_refs = self._player_refs_by_number([(speler_naam, numbers.get(speler_naam)) for speler_naam, _ in elo_updates])
+        for speler_naam, new_elo in elo_updates:
+            entry = {
+                'speler_naam': speler_naam,
+                'rating': new_elo,
+                'timestamp': SERVER_TIMESTAMP,
+                'match_id': new_match_ref.id
+            }
+            if speler_naam in numbers:
+                entry['speler_nr'] = numbers[speler_naam]
+            batch.set(self.elo_ref.document(elo_entry_id(new_match_ref.id, speler_naam)), entry)
+            # Huidige rating ook op het spelerdocument, zodat de ranglijst de log niet hoeft te lezen
+            if speler_naam in player_refs:
+                batch.update(player_refs[speler_naam], {
+                    'rating': new_elo,
+                    'gespeeld': Increment(1),
+                    'bijgewerkt': SERVER_TIMESTAMP
+                })
+        batch.commit()
+        return new_match_ref.id
+
+    def add_matches(self, matches, progress=None):
+        writer = self._bulk(progress)
+        for match in matches:
+            writer.set(self.matches_ref.document(), {
+                **match,
+                'timestamp': match.get('timestamp') or SERVER_TIMESTAMP,
+                'updated_at': SERVER_TIMESTAMP
+            })
+        writer.commit()
+
+    def update_match(self, match_id, updated_match_data):
+        self.matches_ref.document(match_id).update({**updated_match_data, 'updated_at': SERVER_TIMESTAMP})
+
+    def delete_match(self, match_id, delete_elo=True):
+        batch = self.client.batch()
+        batch.delete(self.matches_ref.document(match_id))
+        if delete_elo:
+            for doc in self.elo_ref.where(filter=FieldFilter('match_id', '==', match_id)).select(KEYS_ONLY).stream():
+                batch.delete(doc.reference)
+        batch.set(self.tombstones_ref.document(match_id), {'deleted_at': SERVER_TIMESTAMP})
+        batch.commit()
+
+    def delete_player(self, player_id):
+        player_doc = self.players_ref.document(player_id).get()
+        if not player_doc.exists:
+            return
+        player_data = player_doc.to_dict()
+        player_name = player_data.get('speler_naam') if player_data else None
+        player_nr = player_data.get('speler_nr') if player_data else None
+
+        # Een actieve speler kan meer dan 500 ELO-regels hebben, dus niet in één batch
+        writer = self._bulk()
+        writer.delete(self.players_ref.document(player_id))
+        # Op nummer, zodat regels onder een oude naam meegaan; regels zonder nummer op naam
+        if player_nr is not None:
+            for doc in self.elo_ref.where(filter=FieldFilter('speler_nr', '==', player_nr)).select(KEYS_ONLY).stream():
+                writer.delete(doc.reference)
+        if player_name:
+            elo_docs_query = self.elo_ref.where(filter=FieldFilter('speler_naam', '==', player_name)).select(['speler_nr'])
+            for doc in elo_docs_query.stream():
+                if (doc.to_dict() or {}).get('speler_nr') is None:
+                    writer.delete(doc.reference)
+        writer.commit()
+
+    def _elo_write(self, entry):
+        """Document en data voor één ELO-regel; regels van een wedstrijd hebben een vaste sleutel."""
+        data = {
+            'speler_naam': entry['speler_naam'],
+            'rating': entry['rating'],
+            'timestamp': entry.get('timestamp') or SERVER_TIMESTAMP
+        }
+        if entry.get('speler_nr') is not None:
+            data['speler_nr'] = entry['speler_nr']
+        if entry.get('match_id'):
+            data['match_id'] = entry['match_id']
+            return self.elo_ref.document(elo_entry_id(entry['match_id'], entry['speler_naam'])), data
+        return self.elo_ref.document(), data
+
+    def add_elo_entries(self, entries, player_stats=None, progress=None):
+        writer = self._bulk(progress)
+        for entry in entries:
+            ref, data = self._elo_write(entry)
+            writer.set(ref, data, merge=True)
+        if player_stats:
+            player_refs = self._player_refs_by_number(
+                [(speler_naam, stats.get('speler_nr')) for speler_naam, stats in player_stats.items()]
+            )
+            for speler_naam, stats in player_stats.items():
+                if speler_naam in player_refs:
+                    writer.set(player_refs[speler_naam], {
+                        'rating': stats['rating'],
+                        'gespeeld': stats['gespeeld'],
+                        'bijgewerkt': stats.get('bijgewerkt')
+                    }, merge=True)
+        writer.commit()
+
+    def backfill_player_numbers(self, numbers, progress=None):
+        writer = self._bulk(progress)
+        updated = 0
+        for doc in self.players_ref.select(['speler_naam', 'speler_nr']).stream():
+            name = doc.get('speler_naam')
+            if doc.get('speler_nr') is None and name in numbers:
+                writer.set(doc.reference, {'speler_nr': numbers[name]}, merge=True)
+                updated += 1
+        for doc in self.matches_ref.select([*SEAT_NR_FIELDS, *SEAT_NR_FIELDS.values()]).stream():
+            missing = seat_numbers_missing(doc.to_dict(), numbers)
+            if missing:
+                # updated_at laat de incrementele sync in draaiende apps de wijziging oppikken
+                writer.set(doc.reference, {**missing, 'updated_at': SERVER_TIMESTAMP}, merge=True)
+                updated += 1
+        for doc in self.elo_ref.select(['speler_naam', 'speler_nr']).stream():
+            name = doc.get('speler_naam')
+            if doc.get('speler_nr') is None and name in numbers:
+                writer.set(doc.reference, {'speler_nr': numbers[name]}, merge=True)
+                updated += 1
+        writer.commit()
+        return updated
+
+    def delete_elo_entries(self, keys):
+        writer = self._bulk()
+        for match_id, speler_naam in keys:
+            writer.delete(self.elo_ref.document(elo_entry_id(match_id, speler_naam)))
+        writer.commit()
+
+    def add_elo_checkpoints(self, checkpoints):
+        writer = self._bulk()
+        for checkpoint in checkpoints:
+            writer.set(self.checkpoints_ref.document(), checkpoint)
+        writer.commit()
+
+    def delete_elo_checkpoints(self, since=None):
+        query = self.checkpoints_ref
+        if since is not None:
+            query = query.where(filter=FieldFilter('cursor', '>=', since))
+        writer = self._bulk()
+        for doc in query.select(KEYS_ONLY).stream():
+            writer.delete(doc.reference)
+        writer.commit()
+
+    def delete_all_elo(self, progress=None):
+        self.clear_collection('elo', progress)
+
+    def clear_collection(self, collection_name, progress=None):
+        writer = self._bulk(progress)
+        for doc in self._collection(collection_name).select(KEYS_ONLY).stream():
+            writer.delete(doc.reference)
+        writer.commit()
@@ -1,163 +1,423 @@
 # firestore_service.py
+"""
+Service-laag van de app: alle tabs en pagina's lezen en schrijven via deze module.
+
+De daadwerkelijke opslag zit achter een backend (zie storage.py): standaard Firestore,
+of een lokale SQLite database via config. Optioneel lezen de loaders uit een gedeelde
+listener-cache (zie live_cache.py) in plaats van uit de backend.
+"""
+import threading
 import streamlit as st
-import google.cloud.firestore
-from google.oauth2 import service_account
-import json
 import pandas as pd
-from google.cloud.firestore_v1.base_query import FieldFilter
-from google.cloud.firestore_v1 import SERVER_TIMESTAMP
-
-# FIRESTORE INITIALISATIE
-def is_running_in_streamlit():
-    """Controleert of de code wordt uitgevoerd binnen een Streamlit-sessie."""
-    try:
-        from streamlit.runtime.scriptrunner import get_script_run_ctx
-        return get_script_run_ctx() is not None
-    except ImportError:
-        return False
+from datetime import datetime, date, timedelta, timezone
+from frame_schema import compact_elo_logs, compact_matches
+from player_ids import (
+    player_lookup, resolve_elo_names, resolve_match_names, with_entry_numbers, with_player_numbers,
+)
+from season_utils import generate_prinsjesdag_seasons, season_ids
+from storage import COLLECTIONS, SEAT_NR_FIELDS, create_backend, load_storage_config
+
+# Paginagrootte van de Ruwe Data tab en van exports (die lopen in grotere pagina's door de data)
+RAW_PAGE_SIZE = 50
+EXPORT_PAGE_SIZE = 1000
+
+# Marge bij incrementele sync: vangt klokverschil en writes die net na de vorige sync committen
+SYNC_OVERLAP = timedelta(seconds=5)
+
+MATCH_COLUMNS = [
+    'thuis_1', 'thuis_2', 'uit_1', 'uit_2',
+    'thuis_score', 'uit_score',
+    'klinkers_thuis_1', 'klinkers_thuis_2', 'klinkers_uit_1', 'klinkers_uit_2',
+    'datum', 'timestamp', 'match_id',
+    'thuis_1_nr', 'thuis_2_nr', 'uit_1_nr', 'uit_2_nr',
+]
+
+# Projecties per gebruik (zie `fields` in storage.StorageBackend): alleen deze velden worden gelezen
+MATCH_FIELDS = [col for col in MATCH_COLUMNS if col not in ('datum', 'match_id')]
+MATCH_SYNC_FIELDS = MATCH_FIELDS + ['updated_at']
+MATCH_RESULT_FIELDS = ['thuis_1', 'thuis_2', 'uit_1', 'uit_2', 'thuis_score', 'uit_score']
+# De replay herkent spelers aan hun nummer, zodat een nieuwe naam de historie niet splitst
+REPLAY_FIELDS = MATCH_RESULT_FIELDS + list(SEAT_NR_FIELDS.values()) + ['timestamp']
+PLAYER_FIELDS = ['speler_naam', 'speler_nr', 'rating', 'gespeeld', 'bijgewerkt']
+PLAYER_NUMBER_FIELDS = ['speler_naam', 'speler_nr']
+ELO_RATING_FIELDS = ['speler_naam', 'rating', 'timestamp']
+ELO_LOG_FIELDS = ELO_RATING_FIELDS + ['match_id', 'speler_nr']
+
+# BACKEND SELECTIE
+_backend = None
+_live_cache = None  # None = nog niet bepaald, False = uit of niet beschikbaar
+_live_cache_lock = threading.Lock()
+
+def get_backend():
+    """Geeft de actieve opslag-backend terug; wordt bij eerste gebruik aangemaakt vanuit config."""
+    global _backend
+    if _backend is None:
+        _backend = create_backend()
+    return _backend
+
+def use_backend(backend):
+    """Vervangt de actieve backend (bv. SQLite in tests of benchmarks) en leegt de caches."""
+    global _backend
+    close_live_cache()
+    _backend = backend
+    reset_match_sync()
+    st.cache_data.clear()
 
-@st.cache_resource
-def initialize_firestore():
+def get_live_cache():
     """
-    Maakt verbinding met Firestore.
-    Gebruikt Streamlit secrets in de cloud, anders lokaal serviceaccountbestand.
+    Geeft de listener-cache terug als die in de config aanstaat, anders None.
+    De cache wordt één keer per proces gestart en door alle sessies gedeeld.
     """
-    project_id = None
-    
-    # Probeer eerst Streamlit secrets (voor cloud deployment)
-    try:
-        if hasattr(st, 'secrets') and 'firestore_credentials' in st.secrets:
-            # Streamlit Cloud: gebruik secrets
-            key_dict = dict(st.secrets["firestore_credentials"])
-            project_id = key_dict.get("project_id")
-            creds = service_account.Credentials.from_service_account_info(key_dict)
-            print("Firestore credentials geladen vanuit Streamlit secrets")
-        else:
-            raise KeyError("Geen firestore_credentials gevonden in secrets")
-    except (KeyError, AttributeError, ValueError) as e:
-        print(f"Streamlit secrets niet beschikbaar ({e}), probeer lokaal bestand...")
-        
-        # Fallback naar lokaal bestand (voor lokale ontwikkeling)
-        try:
-            with open("firestore-key.json") as f:
-                key_dict = json.load(f)
-                project_id = key_dict.get("project_id")
-            creds = service_account.Credentials.from_service_account_file("firestore-key.json")
-            print("Firestore credentials geladen vanuit lokaal bestand")
-        except FileNotFoundError:
-            print("Fout: Noch Streamlit secrets noch 'firestore-key.json' beschikbaar.")
-            print("Voor lokale ontwikkeling: voeg firestore-key.json toe aan de root.")
-            print("Voor Streamlit Cloud: configureer firestore_credentials in secrets.")
-            raise
-        except Exception as e:
-            print(f"Fout bij laden van lokale credentials: {e}")
-            raise
-            
-    if not project_id:
-        raise ValueError("Project ID kon niet worden gevonden in de credentials.")
-
-    db = google.cloud.firestore.Client(credentials=creds, project=project_id)
-    print(f"Firestore client succesvol geïnitialiseerd voor project: {project_id}")
-    return db
-
-db = initialize_firestore()
-
-# Maak referenties naar de collecties
-players_ref = db.collection('spelers')
-matches_ref = db.collection('uitslag')
-elo_ref = db.collection('elo')
-requests_ref = db.collection('requests')
-# seasons_ref = db.collection('seizoenen')  # Niet meer nodig - seizoenen worden automatisch bepaald
+    global _live_cache
+    with _live_cache_lock:
+        if _live_cache is None:
+            _live_cache = _start_live_cache() or False
+        return _live_cache or None
+
+def _start_live_cache():
+    if not load_storage_config().get('live_cache'):
+        return None
+    client = getattr(get_backend(), 'client', None)
+    if client is None:
+        print("Live cache vereist de Firestore backend; loaders lezen direct uit de backend.")
+        return None
+
+    from live_cache import LiveCache
+    cache = LiveCache(client, on_change=_on_live_change)
+    if not cache.wait_until_ready():
+        print("Live cache kreeg geen eerste snapshot binnen de tijd; loaders lezen direct uit de backend.")
+        cache.close()
+        return None
+    return cache
+
+def close_live_cache():
+    """Stopt de listeners; de volgende get_live_cache() bepaalt opnieuw of de cache aan moet."""
+    global _live_cache
+    with _live_cache_lock:
+        if _live_cache:
+            _live_cache.close()
+        _live_cache = None
+
+def _on_live_change(collection_name):
+    """Een listener zag een wijziging: gecachte DataFrames van die collectie opnieuw opbouwen uit het geheugen."""
+    invalidate(collection_name)
+
+def _reader():
+    """Leesbron voor de loaders: de live cache als die actief is, anders de backend."""
+    return get_live_cache() or get_backend()
+
+def __getattr__(name):
+    """Houdt `firestore_service.db` beschikbaar voor scripts die de Firestore client direct gebruiken."""
+    if name == 'db':
+        client = getattr(get_backend(), 'client', None)
+        if client is None:
+            raise AttributeError("'db' is alleen beschikbaar met de Firestore backend.")
+        return client
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def _as_utc(value):
+    """Maak een timestamp vergelijkbaar: naive datetimes/dates worden als UTC behandeld."""
+    if value is None:
+        return None
+    if hasattr(value, 'to_pydatetime'):
+        value = value.to_pydatetime()
+    if isinstance(value, date) and not isinstance(value, datetime):
+        value = datetime.combine(value, datetime.min.time())
+    if isinstance(value, datetime) and value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value
+
+
+# CACHE AFHANKELIJKHEDEN
+_loaders_by_collection = {}
+
+def depends_on(*collections):
+    """Registreert een gecachte loader bij de collecties waaruit hij leest (zie invalidate)."""
+    def register(loader):
+        for collection_name in collections:
+            _loaders_by_collection.setdefault(collection_name, []).append(loader)
+        return loader
+    return register
+
+def invalidate(*collections):
+    """Leegt alleen de cache van loaders die van deze collecties afhangen."""
+    loaders = {loader for name in collections for loader in _loaders_by_collection.get(name, [])}
+    for loader in loaders:
+        loader.clear()
 
 
 # DATA LEESFUNCTIES
+@depends_on('spelers', 'elo')
 @st.cache_data
 def get_players():
-    """Haalt alle spelers op en hun meest recente ELO-rating."""
-    spelers_docs = players_ref.stream()
-    players_list = []
-    for doc in spelers_docs:
-        player_data = doc.to_dict()
-        player_data['speler_id'] = doc.id
-        players_list.append(player_data)
-    
+    """Haalt alle spelers op met hun huidige ELO-rating, aantal wedstrijden en laatste wijziging."""
+    players_list = _reader().list_players(fields=PLAYER_FIELDS)
+
     if not players_list:
         return pd.DataFrame()
 
     players_df = pd.DataFrame(players_list)
+    for column in ('rating', 'gespeeld', 'bijgewerkt'):
+        if column not in players_df.columns:
+            players_df[column] = None
+
+    # De rating staat gematerialiseerd op het spelerdocument; alleen oudere documenten
+    # zonder die velden vallen terug op de laatste regel uit de ELO log
+    missing = players_df['rating'].isna()
+    if not missing.any():
+        return players_df
 
-    elo_docs = elo_ref.order_by("timestamp", direction=google.cloud.firestore.Query.DESCENDING).stream()
-    elo_list = [doc.to_dict() for doc in elo_docs]
+    elo_list = _reader().list_elo_logs(descending=True, fields=ELO_RATING_FIELDS)
 
     if not elo_list:
-        players_df['rating'] = 1000
+        players_df['rating'] = players_df['rating'].fillna(1000)
         return players_df
 
     elo_df = pd.DataFrame(elo_list)
     
     # Get the latest ELO for each player
     latest_elo_df = elo_df.loc[elo_df.groupby('speler_naam')['timestamp'].idxmax()]
+    latest_rating = latest_elo_df.set_index('speler_naam')['rating']
 
-    # Merge with players_df
-    players_with_elo_df = pd.merge(players_df, latest_elo_df[['speler_naam', 'rating']], on='speler_naam', how='left')
-    players_with_elo_df['rating'] = players_with_elo_df['rating'].fillna(1000)
+    players_df.loc[missing, 'rating'] = players_df.loc[missing, 'speler_naam'].map(latest_rating)
+    players_df['rating'] = players_df['rating'].fillna(1000)
     
-    return players_with_elo_df
+    return players_df
 
-@st.cache_data
-def get_matches():
-    """Haalt alle wedstrijden op en normaliseert timestamps."""
-    matches_docs = matches_ref.order_by("timestamp", direction=google.cloud.firestore.Query.DESCENDING).stream()
-    matches = []
-    for doc in matches_docs:
-        match_data = doc.to_dict()
-        match_data['match_id'] = doc.id
-        matches.append(match_data)
+def _matches_frame(matches):
+    """Zet ruwe wedstrijd-dicts om naar het DataFrame formaat van get_matches."""
     df = pd.DataFrame(matches)
 
     if not df.empty:
-        # Normaliseer timestamp naar pandas datetime
         if 'timestamp' in df.columns:
-            df['timestamp'] = pd.to_datetime(df['timestamp'], errors='coerce')
             df['datum'] = df['timestamp']
 
-        # Herorder kolommen in logische volgorde
-        desired_columns = [
-            'thuis_1', 'thuis_2', 'uit_1', 'uit_2',
-            'thuis_score', 'uit_score',
-            'klinkers_thuis_1', 'klinkers_thuis_2', 'klinkers_uit_1', 'klinkers_uit_2',
-            'datum', 'timestamp', 'match_id'
-        ]
-        available_columns = [col for col in desired_columns if col in df.columns]
-        df = df[available_columns]
+        # Herorder kolommen in logische volgorde en zet ze om naar compacte dtypes (zie frame_schema.py)
+        available_columns = [col for col in MATCH_COLUMNS if col in df.columns]
+        df = compact_matches(df[available_columns])
+        # Seizoen één keer per wedstrijd vastleggen, zodat seizoensfilters een kolomvergelijking zijn
+        if 'datum' in df.columns:
+            df['season_id'] = season_ids(df['datum']).to_numpy()
 
     return df
 
+@st.cache_resource
+def _match_sync_state():
+    """Procesbrede kopie van `uitslag` plus de watermark tot waar wijzigingen verwerkt zijn."""
+    return {'lock': threading.Lock(), 'matches': None, 'watermark': None}
+
+def reset_match_sync():
+    """Vergeet de gesynchroniseerde wedstrijden; de volgende sync leest alles opnieuw."""
+    _match_sync_state.clear()
+
+def sync_matches():
+    """
+    Houdt de wedstrijden incrementeel bij.
+    De eerste keer wordt alles gelezen; daarna alleen wedstrijden met `updated_at` na de
+    watermark en tombstones van verwijderde wedstrijden (zie storage.list_match_changes).
+    """
+    state = _match_sync_state()
+    with state['lock']:
+        if state['matches'] is None:
+            started = datetime.now(timezone.utc)
+            matches = get_backend().list_matches(descending=True, fields=MATCH_SYNC_FIELDS)
+            state['matches'] = _matches_frame(matches)
+            state['watermark'] = started
+            return state['matches'].copy()
+
+        changed, deleted = get_backend().list_match_changes(
+            state['watermark'] - SYNC_OVERLAP, fields=MATCH_SYNC_FIELDS
+        )
+        if not changed and not deleted:
+            return state['matches'].copy()
+
+        df = state['matches']
+        changed_ids = {m['match_id'] for m in changed}
+        deleted_ids = {d['match_id'] for d in deleted}
+        if not df.empty:
+            df = df[~df['match_id'].isin(changed_ids | deleted_ids)]
+        if changed:
+            # Na concat zijn de categorieën van oud en nieuw niet meer gedeeld; opnieuw compacteren
+            df = compact_matches(pd.concat([df, _matches_frame(changed)], ignore_index=True)) if not df.empty else _matches_frame(changed)
+        if not df.empty:
+            df = df.sort_values(['timestamp', 'match_id'], ascending=False, kind='stable').reset_index(drop=True)
+        state['matches'] = df
+
+        seen = [_as_utc(m.get('updated_at')) for m in changed] + [_as_utc(d.get('deleted_at')) for d in deleted]
+        seen = [ts for ts in seen if ts is not None]
+        if seen:
+            state['watermark'] = max(state['watermark'], max(seen))
+        return df.copy()
+
+@depends_on('spelers')
+@st.cache_data
+def get_player_lookup():
+    """Spelernaam per vast `speler_nr` (zie player_ids.py)."""
+    return player_lookup(_reader().list_players(fields=PLAYER_NUMBER_FIELDS))
+
+def _player_numbers():
+    """{speler_naam: speler_nr} voor het stempelen van nieuwe wedstrijden en ELO regels."""
+    lookup = get_player_lookup()
+    return dict(zip(lookup.to_numpy(), lookup.index.tolist()))
+
+@depends_on('uitslag', 'spelers')
+@st.cache_data
+def get_matches():
+    """Haalt alle wedstrijden op en normaliseert timestamps (incrementeel, zie sync_matches).
+    Stoelnamen komen via de spelernummers uit de opzoektabel."""
+    live_cache = get_live_cache()
+    if live_cache is not None:
+        matches = _matches_frame(live_cache.list_matches(descending=True, fields=MATCH_FIELDS))
+    else:
+        matches = sync_matches()
+    return resolve_match_names(matches, get_player_lookup())
+
+@depends_on('elo', 'spelers')
 @st.cache_data
 def get_elo_logs():
     """Haalt de volledige ELO geschiedenis op."""
-    elo_docs = elo_ref.order_by("timestamp", direction=google.cloud.firestore.Query.DESCENDING).stream()
-    elos = [doc.to_dict() for doc in elo_docs]
-    return pd.DataFrame(elos)
+    elos = _reader().list_elo_logs(descending=True, fields=ELO_LOG_FIELDS)
+    return resolve_elo_names(compact_elo_logs(pd.DataFrame(elos)), get_player_lookup())
+
+@depends_on('elo', 'spelers')
+@st.cache_data
+def get_rating_index():
+    """As-of rating index en trajectopslag over de volledige ELO log (zie elo_index.py)."""
+    from elo_index import RatingIndex
+    # get_elo_logs staat nieuwste eerst; omgedraaid telt bij gelijke tijdstippen de laatst gelogde regel
+    return RatingIndex.from_entries(get_elo_logs().iloc[::-1])
 
+@depends_on('uitslag', 'spelers')
 @st.cache_data
+def get_match_index():
+    """Zoekindex op datum, speler en score over get_matches, voor de wedstrijdkeuze in Beheer (zie match_index.py)."""
+    from match_index import MatchIndex
+    return MatchIndex.from_matches(get_matches())
+
+@depends_on('uitslag', 'elo', 'spelers')
+@st.cache_data
+def get_participations():
+    """Wedstrijden in lange vorm, één rij per (wedstrijd, speler); zie participations.py."""
+    from participations import build_participations
+    return build_participations(get_matches(), get_elo_logs())
+
 def get_elo_history(_ttl, speler_naam):
-    """Haalt de ELO geschiedenis voor een specifieke speler op."""
-    elo_query = elo_ref.where(filter=FieldFilter('speler_naam', '==', speler_naam)).order_by("timestamp", direction=google.cloud.firestore.Query.ASCENDING)
-    history_docs = elo_query.stream()
-    history = [doc.to_dict() for doc in history_docs]
-    return pd.DataFrame(history)
+    """ELO geschiedenis van één speler, uit de gecachte trajectopslag in plaats van een eigen query."""
+    return get_rating_index().history(speler_naam)
 
 @st.cache_data
 def get_seasons():
     """Seizoenen worden nu automatisch bepaald door Prinsjesdag - geen aparte tabel meer nodig."""
     return pd.DataFrame()  # Lege DataFrame
 
+def _aggregate(collection_name, sums=(), avgs=(), since=None, before=None):
+    """Server-side count/sum/avg (zie StorageBackend.aggregate); de live cache rekent in het geheugen."""
+    live_cache = get_live_cache()
+    reader = live_cache if live_cache is not None and collection_name in live_cache.collections else get_backend()
+    return reader.aggregate(collection_name, sums=sums, avgs=avgs, since=_as_utc(since), before=_as_utc(before))
+
+@depends_on('uitslag')
+@st.cache_data
+def get_match_totals(since=None, before=None):
+    """
+    Aantal wedstrijden, doelpunten en gemiddelde doelpunten per wedstrijd (optioneel met
+    timestamp in [since, before)) via één aggregatie-query, zonder de wedstrijden op te halen.
+    """
+    totals = _aggregate('uitslag', sums=('thuis_score', 'uit_score'), since=since, before=before)
+    goals = totals['sum_thuis_score'] + totals['sum_uit_score']
+    return {
+        'wedstrijden': totals['count'],
+        'doelpunten': goals,
+        'gemiddelde': goals / totals['count'] if totals['count'] else 0.0,
+    }
+
+@depends_on(*COLLECTIONS)
+@st.cache_data
+def get_collection_counts():
+    """Aantal documenten per collectie via count-aggregaties."""
+    return {name: _aggregate(name)['count'] for name in COLLECTIONS}
+
+def _player_filter(speler_naam):
+    """(filteren?, speler_nr) voor de paginering: een speler zonder nummer heeft geen wedstrijden te tonen."""
+    if speler_naam is None:
+        return True, None
+    speler_nr = _player_numbers().get(speler_naam)
+    return speler_nr is not None, speler_nr
+
+def _matches_page(speler_naam, since, before, start_after, limit):
+    ok, speler_nr = _player_filter(speler_naam)
+    if not ok:
+        return pd.DataFrame(), None
+    matches, cursor = _reader().page_matches(
+        speler_nr=speler_nr, since=_as_utc(since), before=_as_utc(before), limit=limit, start_after=start_after
+    )
+    return resolve_match_names(_matches_frame(matches), get_player_lookup()), cursor
+
+def _elo_page(speler_naam, since, before, start_after, limit):
+    ok, speler_nr = _player_filter(speler_naam)
+    if not ok:
+        return pd.DataFrame(), None
+    entries, cursor = _reader().page_elo_logs(
+        speler_nr=speler_nr, since=_as_utc(since), before=_as_utc(before), limit=limit, start_after=start_after
+    )
+    return resolve_elo_names(compact_elo_logs(pd.DataFrame(entries)), get_player_lookup()), cursor
+
+@depends_on('uitslag', 'spelers')
+@st.cache_data
+def get_matches_page(speler_naam=None, since=None, before=None, start_after=None, limit=RAW_PAGE_SIZE):
+    """
+    Eén pagina wedstrijden (nieuwste eerst) voor de Ruwe Data tab; speler- en periodefilter en
+    paginering gebeuren in de database (zie StorageBackend.page_matches). Geeft (DataFrame in
+    het formaat van get_matches, cursor voor de volgende pagina of None) terug.
+    """
+    return _matches_page(speler_naam, since, before, start_after, limit)
+
+@depends_on('elo', 'spelers')
+@st.cache_data
+def get_elo_page(speler_naam=None, since=None, before=None, start_after=None, limit=RAW_PAGE_SIZE):
+    """Eén pagina van de ELO log, zoals get_matches_page."""
+    return _elo_page(speler_naam, since, before, start_after, limit)
+
+def iter_match_pages(speler_naam=None, since=None, before=None, page_size=EXPORT_PAGE_SIZE):
+    """Alle wedstrijden van een filter als DataFrames per pagina, voor exports (niet gecached)."""
+    cursor = None
+    while True:
+        page, cursor = _matches_page(speler_naam, since, before, cursor, page_size)
+        yield page
+        if cursor is None:
+            return
+
+def iter_elo_pages(speler_naam=None, since=None, before=None, page_size=EXPORT_PAGE_SIZE):
+    """Alle ELO regels van een filter als DataFrames per pagina, voor exports (niet gecached)."""
+    cursor = None
+    while True:
+        page, cursor = _elo_page(speler_naam, since, before, cursor, page_size)
+        yield page
+        if cursor is None:
+            return
+
+@depends_on('uitslag')
+@st.cache_data
+def get_season_years():
+    """Seizoensjaren (zie season_utils.season_window) van de eerste t/m de laatste wedstrijd, met twee reads."""
+    first = _reader().list_matches(descending=False, limit=1, fields=['timestamp'])
+    last = _reader().list_matches(descending=True, limit=1, fields=['timestamp'])
+    if not first:
+        return []
+    first_year, last_year = season_ids([first[0]['timestamp'], last[0]['timestamp']]).tolist()
+    return list(range(first_year, last_year + 1))
+
+@depends_on('uitslag')
+@st.cache_data
+def get_prinsjesdag_seasons():
+    """Prinsjesdag seizoenen met wedstrijden (plus het lopende seizoen) en hun statistieken."""
+    return generate_prinsjesdag_seasons(get_matches(), include_current=True)
+
+@depends_on('requests')
 @st.cache_data
 def get_requests():
     """Haalt alle verzoeken op, gesorteerd op tijdstip."""
-    docs = requests_ref.order_by("Timestamp", direction=google.cloud.firestore.Query.DESCENDING).stream()
-    requests = [doc.to_dict() for doc in docs]
+    requests = get_backend().list_requests()
     return pd.DataFrame(requests)
 
 # ---------------- Schema & Inspectie helpers ----------------
@@ -170,12 +430,12 @@ def expected_schema():
     return {
         'spelers': {
             'required': {'speler_naam'},
-            'optional': set(),
+            'optional': {'rating', 'gespeeld', 'bijgewerkt', 'speler_nr'},
             'derived_only_in_app': {'speler_id'}
         },
         'elo': {
             'required': {'speler_naam', 'rating', 'timestamp'},
-            'optional': set(),
+            'optional': {'match_id', 'speler_nr'},
             'derived_only_in_app': set()
         },
         'uitslag': {
@@ -184,7 +444,8 @@ def expected_schema():
                 'thuis_score', 'uit_score', 'timestamp'
             },
             'optional': {
-                'klinkers_thuis_1', 'klinkers_thuis_2', 'klinkers_uit_1', 'klinkers_uit_2'
+                'klinkers_thuis_1', 'klinkers_thuis_2', 'klinkers_uit_1', 'klinkers_uit_2',
+                'updated_at', 'thuis_1_nr', 'thuis_2_nr', 'uit_1_nr', 'uit_2_nr'
             },
             'derived_only_in_app': {'match_id', 'datum'}
         },
@@ -195,32 +456,31 @@ def expected_schema():
         }
     }
 
-def inspect_collections(max_docs: int = 200):
-    """Inspecteer Firestore en retourneer een overzicht per collectie met voorbeeldvelden.
+def inspect_collections(max_docs: int = 50):
+    """Inspecteer de database en retourneer een overzicht per collectie met voorbeeldvelden.
 
-    Om performance/redenen beperken we ons tot maximaal `max_docs` voorbeeld-documenten per collectie.
+    Het aantal documenten komt uit een count-aggregatie; alleen voor de velden worden maximaal
+    `max_docs` voorbeeld-documenten per collectie gelezen.
     """
     summaries = {}
-    collections = {
-        'spelers': players_ref,
-        'uitslag': matches_ref,
-        'elo': elo_ref,
-        'requests': requests_ref,
-    }
+    try:
+        totals = get_collection_counts()
+    except Exception as e:
+        print(f"Aantallen per collectie niet beschikbaar: {e}")
+        totals = {}
 
-    for name, ref in collections.items():
-        sample_docs_iter = ref.limit(max_docs).stream()
+    for name in COLLECTIONS:
         sample_docs = []
         field_union = set()
         try:
-            for doc in sample_docs_iter:
-                d = doc.to_dict() or {}
+            for d in get_backend().sample_collection(name, max_docs):
                 sample_docs.append({k: d.get(k) for k in d.keys()})
                 field_union.update(d.keys())
         except Exception as e:
             print(f"Inspectie fout voor collectie {name}: {e}")
 
         summaries[name] = {
+            'total': totals.get(name),
             'sample_size': len(sample_docs),
             'fields': sorted(list(field_union)),
             'examples': sample_docs[:5],  # toon maximaal 5 voorbeelden
@@ -229,6 +489,14 @@ def inspect_collections(max_docs: int = 200):
     return summaries
 
 # DATA SCHRIJFFUNCTIES
+def _progress_step(progress, text, start=0.0, end=1.0):
+    """Zet de (gedaan, totaal) voortgang van de backend om naar progress(fractie, tekst) binnen [start, end]."""
+    if progress is None:
+        return None
+    def report(done, total):
+        progress(start + (end - start) * (done / total if total else 1.0), text)
+    return report
+
 def add_season(startdatum, einddatum):
     """Seizoenen worden nu automatisch bepaald door Prinsjesdag - handmatige toevoeging niet meer nodig."""
     return "Success"  # Dummy return voor compatibiliteit
@@ -237,26 +505,13 @@ def add_season(startdatum, einddatum):
 def add_player(name, start_elo):
     """Voegt een nieuwe speler en zijn initiële ELO-rating toe in een batch."""
     # Controleer eerst of de speler al bestaat
-    existing_player_query = players_ref.where(filter=FieldFilter('speler_naam', '==', name)).limit(1)
-    if len(list(existing_player_query.stream())) > 0:
+    if get_backend().player_exists(name):
         return f"Error: Speler '{name}' bestaat al."
 
-    batch = db.batch()
     try:
-        # 1. Voeg de speler toe aan de 'spelers' collectie
-        new_player_ref = players_ref.document()
-        batch.set(new_player_ref, {'speler_naam': name})
-
-        # 2. Voeg de initiële ELO-rating toe aan de 'elo' collectie
-        new_elo_ref = elo_ref.document()
-        batch.set(new_elo_ref, {
-            'speler_naam': name,
-            'rating': start_elo,
-            'timestamp': SERVER_TIMESTAMP
-        })
-
-        batch.commit()
-        st.cache_data.clear()
+        # Speler en initiële ELO-rating worden atomair door de backend toegevoegd
+        get_backend().add_player(name, start_elo)
+        invalidate('spelers', 'elo')
         return "Success"
     except Exception as e:
         print(f"ERROR: Failed to add player '{name}'. Exception: {e}")
@@ -265,8 +520,8 @@ def add_player(name, start_elo):
 def add_request(request_text):
     """Voegt een nieuw verzoek toe aan de 'requests' collectie."""
     try:
-        requests_ref.add({'Verzoek': request_text, 'Timestamp': SERVER_TIMESTAMP})
-        st.cache_data.clear()
+        get_backend().add_request(request_text)
+        invalidate('requests')
         return "Success"
     except Exception as e:
         return f"Error: {e}"
@@ -277,11 +532,8 @@ def add_match_and_update_elo(match_data, elo_updates):
     Ondersteunt nu custom historische timestamp in match_data['timestamp'].
     Als historische wedstrijd toegevoegd wordt (datum < vandaag), herbereken ELO's vanaf begin.
     """
-    batch = db.batch()
-    from datetime import datetime, date
-
     try:
-        # 1. Timestamp bepalen: gebruik aangeleverde timestamp indien aanwezig, anders server
+        # 1. Timestamp bepalen: gebruik aangeleverde timestamp indien aanwezig, anders server (None)
         provided_ts = match_data.get('timestamp')
         if provided_ts is not None:
             # Zorg dat het een native datetime is
@@ -289,30 +541,18 @@ def add_match_and_update_elo(match_data, elo_updates):
                 provided_ts = provided_ts.to_pydatetime()
             if isinstance(provided_ts, date) and not isinstance(provided_ts, datetime):
                 provided_ts = datetime.combine(provided_ts, datetime.min.time())
-        match_timestamp = provided_ts if provided_ts else SERVER_TIMESTAMP
-
-        # 2. Voeg de nieuwe wedstrijd toe
-        new_match_ref = matches_ref.document()
-        match_data_with_timestamp = {**match_data, 'timestamp': match_timestamp}
-        batch.set(new_match_ref, match_data_with_timestamp)
-
-        # 3. Log ELO updates (altijd met SERVER_TIMESTAMP voor log volgorde nu)
-        for speler_naam, new_elo in elo_updates:
-            new_elo_ref = elo_ref.document()
-            batch.set(new_elo_ref, {
-                'speler_naam': speler_naam,
-                'rating': new_elo,
-                'timestamp': SERVER_TIMESTAMP
-            })
+        match_timestamp = provided_ts if provided_ts else None
 
-        batch.commit()
+        # 2. Voeg de nieuwe wedstrijd (met spelernummers) toe en log de ELO updates
+        match_data = with_player_numbers(match_data, _player_numbers())
+        get_backend().add_match_with_elo({**match_data, 'timestamp': match_timestamp}, elo_updates)
 
-        # 4. Indien historische wedstrijd (timestamp < vandaag) => volledige ELO herberekening
+        # 3. Indien historische wedstrijd (timestamp < vandaag) => volledige ELO herberekening
         need_recalc = False
         try:
             if isinstance(match_timestamp, datetime):
                 today_midnight = datetime.combine(date.today(), datetime.min.time())
-                if match_timestamp < today_midnight:
+                if match_timestamp.replace(tzinfo=None) < today_midnight:
                     need_recalc = True
         except Exception:
             pass
@@ -321,8 +561,10 @@ def add_match_and_update_elo(match_data, elo_updates):
             # Volledige reset kan duur zijn; alternatief is recalc vanaf match_timestamp.
             # Kies recalc vanaf die timestamp voor efficiency.
             recalculate_elo_from_match(match_timestamp)
+        else:
+            _invalidate_elo_checkpoints(match_timestamp)
 
-        st.cache_data.clear()
+        invalidate('uitslag', 'elo', 'spelers')
         return True
     except Exception as e:
         print(f"Error during batch commit: {e}")
@@ -330,28 +572,10 @@ def add_match_and_update_elo(match_data, elo_updates):
 
 def delete_player_by_id(player_id):
     """Verwijdert een speler en al zijn ELO-geschiedenis."""
-    batch = db.batch()
     try:
-        # 1. Haal de speler op om de naam te krijgen
-        player_doc = players_ref.document(player_id).get()
-        if not player_doc.exists:
-            return True # Beschouw als succes als de speler al weg is
-            
-        player_data = player_doc.to_dict()
-        player_name = player_data.get('speler_naam') if player_data else None
-
-        # 2. Verwijder de speler uit de 'spelers' collectie
-        batch.delete(players_ref.document(player_id))
-
-        # 3. Zoek en verwijder alle ELO-entries voor die speler
-        if player_name:
-            elo_docs_query = elo_ref.where(filter=FieldFilter('speler_naam', '==', player_name))
-            elo_docs = list(elo_docs_query.stream())
-            for doc in elo_docs:
-                batch.delete(doc.reference)
-        
-        batch.commit()
-        st.cache_data.clear()
+        # Een speler die al weg is geldt ook als succes
+        get_backend().delete_player(player_id)
+        invalidate('spelers', 'elo')
         return True
     except Exception as e:
         print(f"Fout bij verwijderen van speler {player_id}: {e}")
@@ -361,11 +585,26 @@ def delete_season_by_id(season_id):
     """Seizoenen worden nu automatisch bepaald door Prinsjesdag - handmatige verwijdering niet meer nodig."""
     return True  # Dummy return voor compatibiliteit
 
+def _earliest(*timestamps):
+    """Vroegste van de gegeven timestamps (None telt niet mee), als UTC."""
+    timestamps = [_as_utc(ts) for ts in timestamps if ts is not None]
+    return min(timestamps) if timestamps else None
+
+def _invalidate_elo_checkpoints(timestamp):
+    """Een wedstrijdwijziging op `timestamp` maakt checkpoints vanaf dat moment ongeldig."""
+    if timestamp is not None:
+        get_backend().delete_elo_checkpoints(since=_as_utc(timestamp))
+
 def delete_match_by_id(match_id):
-    """Verwijdert een wedstrijd op basis van zijn ID."""
+    """Verwijdert een wedstrijd op basis van zijn ID, zonder ELO herberekening.
+    De ELO regels van de wedstrijd blijven staan, zodat de log en de ratings op de spelerdocumenten
+    bij elkaar blijven passen tot een herberekening of reset."""
     try:
-        matches_ref.document(match_id).delete()
-        st.cache_data.clear()
+        match_data = get_backend().get_match(match_id)
+        get_backend().delete_match(match_id, delete_elo=False)
+        if match_data:
+            _invalidate_elo_checkpoints(match_data.get('timestamp'))
+        invalidate('uitslag', 'elo', 'spelers')
         return True
     except Exception as e:
         print(f"Fout bij verwijderen van wedstrijd {match_id}: {e}")
@@ -374,39 +613,61 @@ def delete_match_by_id(match_id):
 def update_match(match_id, updated_match_data):
     """Werkt een wedstrijd bij op basis van zijn ID."""
     try:
-        matches_ref.document(match_id).update(updated_match_data)
-        st.cache_data.clear()
+        original_data = get_backend().get_match(match_id) or {}
+        updated_match_data = with_player_numbers(updated_match_data, _player_numbers())
+        get_backend().update_match(match_id, updated_match_data)
+        _invalidate_elo_checkpoints(_earliest(original_data.get('timestamp'), updated_match_data.get('timestamp')))
+        invalidate('uitslag')
         return True
     except Exception as e:
         print(f"Fout bij bijwerken van wedstrijd {match_id}: {e}")
         return False
 
+def _diff_elo_entries(new_entries, stored_entries, replayed_ids):
+    """
+    Vergelijkt nieuw berekende ELO-regels met de opgeslagen regels, op (match_id, speler_naam).
+    Geeft (regels die nieuw of gewijzigd zijn, sleutels van opgeslagen regels van herspeelde
+    wedstrijden die niet meer voorkomen) terug.
+    """
+    stored = {
+        (entry['match_id'], entry['speler_naam']): (entry['rating'], _as_utc(entry.get('timestamp')))
+        for entry in stored_entries if entry.get('match_id')
+    }
+    changed = [
+        entry for entry in new_entries
+        if stored.get((entry['match_id'], entry['speler_naam'])) != (entry['rating'], _as_utc(entry['timestamp']))
+    ]
+    new_keys = {(entry['match_id'], entry['speler_naam']) for entry in new_entries}
+    obsolete = [key for key in stored if key[0] in replayed_ids and key not in new_keys]
+    return changed, obsolete
+
 def recalculate_elo_from_match(match_timestamp):
     """
     Herberekent alle ELO scores vanaf een bepaalde wedstrijd timestamp.
     Gebruikt voor het corrigeren van ELO's na het bewerken/verwijderen van wedstrijden.
+    Start vanaf de laatste ELO-checkpoint vóór die timestamp en leest alleen de wedstrijden daarna.
     """
     try:
-        from utils import elo_calculation
+        from elo_engine import EloReplay
         
-        # Haal alle wedstrijden op, gesorteerd op timestamp
-        all_matches_docs = matches_ref.order_by("timestamp", direction=google.cloud.firestore.Query.ASCENDING).stream()
-        all_matches = []
-        for doc in all_matches_docs:
-            match_data = doc.to_dict()
-            match_data['match_id'] = doc.id
-            all_matches.append(match_data)
+        backend = get_backend()
+        match_timestamp = _as_utc(match_timestamp)
         
-        if not all_matches:
-            return True
-            
-        # Converteer naar DataFrame voor makkelijker werken
-        matches_df = pd.DataFrame(all_matches)
+        # Laatste checkpoint vóór het herpunt; checkpoints vanaf het herpunt kloppen niet meer
+        checkpoint = backend.get_elo_checkpoint_before(match_timestamp) if match_timestamp is not None else None
+        backend.delete_elo_checkpoints(since=match_timestamp)
+        
+        # Haal de wedstrijden na de checkpoint op (zonder checkpoint: alles), gesorteerd op timestamp
+        if checkpoint:
+            all_matches = backend.list_matches_after(checkpoint['cursor'], fields=REPLAY_FIELDS)
+        else:
+            # Ook zonder wedstrijden doorgaan: de spelervelden moeten dan terug naar de start
+            all_matches = backend.list_matches(descending=False, fields=REPLAY_FIELDS)
         
         # Vind de index van de wedstrijd vanaf waar we moeten herberekenen
-        target_index = 0
+        target_index = len(all_matches)
         for i, match in enumerate(all_matches):
-            if match.get('timestamp') >= match_timestamp:
+            if match_timestamp is None or _as_utc(match.get('timestamp')) >= match_timestamp:
                 target_index = i
                 break
         
@@ -414,237 +675,83 @@ def recalculate_elo_from_match(match_timestamp):
         players_df = get_players()
         if players_df.empty:
             return True
-            
-        # Maak een dictionary van de ELO's zoals ze waren VOOR de te herberekenen wedstrijd
-        if target_index > 0:
-            # Er zijn eerdere wedstrijden - bereken ELO's tot aan het herpunt
-            previous_matches = all_matches[:target_index]
-            player_elos = {}
-            
-            # Start alle spelers met 1000 ELO
-            for _, player in players_df.iterrows():
-                player_elos[player['speler_naam']] = 1000
-            
-            # Bereken ELO's door alle wedstrijden vóór het herpunt
-            for match in previous_matches:
-                # ELO berekening voor deze wedstrijd
-                home_team = [match.get('thuis_1'), match.get('thuis_2')]
-                away_team = [match.get('uit_1'), match.get('uit_2')]
-                home_score = int(match.get('thuis_score', 0))
-                away_score = int(match.get('uit_score', 0))
-                
-                # Bereken gemiddelde ELO's
-                home_elos = [player_elos.get(player, 1000) for player in home_team if player]
-                away_elos = [player_elos.get(player, 1000) for player in away_team if player]
-                
-                if len(home_elos) == 2 and len(away_elos) == 2:
-                    avg_home_elo = sum(home_elos) / 2
-                    avg_away_elo = sum(away_elos) / 2
-                    
-                    # Update ELO's voor thuisspelers
-                    for player in home_team:
-                        if player:
-                            player_elos[player] = elo_calculation(
-                                player_elos.get(player, 1000), avg_away_elo, home_score, away_score
-                            )
-                    
-                    # Update ELO's voor uitspelers
-                    for player in away_team:
-                        if player:
-                            player_elos[player] = elo_calculation(
-                                player_elos.get(player, 1000), avg_home_elo, away_score, home_score
-                            )
-        else:
-            # Geen eerdere wedstrijden - start met 1000 voor iedereen
-            player_elos = {}
-            for _, player in players_df.iterrows():
-                player_elos[player['speler_naam']] = 1000
-        
-        # Nu herberekenen vanaf target_index
-        matches_to_recalculate = all_matches[target_index:]
         
-        # Batch voor ELO updates
-        batch = db.batch()
-        batch_counter = 0
-        
-        for match in matches_to_recalculate:
-            home_team = [match.get('thuis_1'), match.get('thuis_2')]
-            away_team = [match.get('uit_1'), match.get('uit_2')]
-            home_score = int(match.get('thuis_score', 0))
-            away_score = int(match.get('uit_score', 0))
-            
-            # Bereken gemiddelde ELO's
-            home_elos = [player_elos.get(player, 1000) for player in home_team if player]
-            away_elos = [player_elos.get(player, 1000) for player in away_team if player]
-            
-            if len(home_elos) == 2 and len(away_elos) == 2:
-                avg_home_elo = sum(home_elos) / 2
-                avg_away_elo = sum(away_elos) / 2
-                
-                # Update ELO's voor thuisspelers
-                for player in home_team:
-                    if player:
-                        new_elo = elo_calculation(
-                            player_elos.get(player, 1000), avg_away_elo, home_score, away_score
-                        )
-                        player_elos[player] = new_elo
-                        
-                        # Voeg nieuwe ELO toe aan batch
-                        new_elo_ref = elo_ref.document()
-                        batch.set(new_elo_ref, {
-                            'speler_naam': player,
-                            'rating': new_elo,
-                            'timestamp': match.get('timestamp', SERVER_TIMESTAMP)
-                        })
-                        batch_counter += 1
-                
-                # Update ELO's voor uitspelers
-                for player in away_team:
-                    if player:
-                        new_elo = elo_calculation(
-                            player_elos.get(player, 1000), avg_home_elo, away_score, home_score
-                        )
-                        player_elos[player] = new_elo
-                        
-                        # Voeg nieuwe ELO toe aan batch
-                        new_elo_ref = elo_ref.document()
-                        batch.set(new_elo_ref, {
-                            'speler_naam': player,
-                            'rating': new_elo,
-                            'timestamp': match.get('timestamp', SERVER_TIMESTAMP)
-                        })
-                        batch_counter += 1
-                
-                # Commit batch als deze te groot wordt
-                if batch_counter >= 400:
-                    batch.commit()
-                    batch = db.batch()
-                    batch_counter = 0
-        
-        # Commit resterende updates
-        if batch_counter > 0:
-            batch.commit()
-        
-        st.cache_data.clear()
+        # Alle spelers starten op 1000 (of op de stand van de checkpoint); de replay loopt tot het
+        # herpunt zodat de ratings daar kloppen, maar alleen regels vanaf het herpunt worden geschreven
+        replay = EloReplay(
+            all_matches, players=players_df['speler_naam'].tolist(), checkpoint=checkpoint,
+            names=get_player_lookup().to_dict(),
+        )
+        elo_entries = replay.elo_entries(start=target_index)
+        
+        # Vergelijk met de opgeslagen regels van de herspeelde wedstrijden: alleen gewijzigde
+        # regels worden (onder hun vaste sleutel) overschreven
+        obsolete = []
+        replayed_ids = {match['match_id'] for match in all_matches[target_index:]}
+        if replayed_ids:
+            stored = backend.list_elo_logs(
+                descending=False, since=match_timestamp, fields=ELO_RATING_FIELDS + ['match_id']
+            )
+            elo_entries, obsolete = _diff_elo_entries(elo_entries, stored, replayed_ids)
+        
+        # Schrijf de gewijzigde ELO regels en de spelervelden (de backend commit in blokken)
+        backend.add_elo_entries(with_entry_numbers(elo_entries, _player_numbers()), player_stats=replay.player_stats())
+        if obsolete:
+            backend.delete_elo_entries(obsolete)
+        backend.add_elo_checkpoints(replay.checkpoints())
+        
+        invalidate('elo', 'spelers')
         return True
         
     except Exception as e:
         print(f"Fout bij herberekenen van ELO's: {e}")
         return False
 
-def reset_all_elos():
+def reset_all_elos(progress=None):
     """
     Reset alle ELO scores en herberekent ze opnieuw vanaf het begin.
-    Gebruikt voor complete ELO reset.
+    Gebruikt voor complete ELO reset. Zet daarmee ook een oudere ELO log (zonder `match_id`)
+    om naar regels met een vaste sleutel per wedstrijd en speler.
+    `progress(fractie, tekst)` krijgt de voortgang, bijvoorbeeld `st.progress(0.0).progress`.
     """
     try:
-        from utils import elo_calculation
+        from elo_engine import EloReplay
         
-        # Verwijder alle bestaande ELO entries
-        existing_elo_docs = elo_ref.stream()
-        batch = db.batch()
-        for doc in existing_elo_docs:
-            batch.delete(doc.reference)
-        batch.commit()
+        # Verwijder alle bestaande ELO entries en checkpoints
+        get_backend().delete_all_elo(progress=_progress_step(progress, "ELO log wordt geleegd...", 0.0, 0.3))
+        get_backend().delete_elo_checkpoints()
         
         # Haal alle wedstrijden op, gesorteerd op timestamp
-        all_matches_docs = matches_ref.order_by("timestamp", direction=google.cloud.firestore.Query.ASCENDING).stream()
-        all_matches = []
-        for doc in all_matches_docs:
-            match_data = doc.to_dict()
-            match_data['match_id'] = doc.id
-            all_matches.append(match_data)
+        all_matches = get_backend().list_matches(descending=False, fields=REPLAY_FIELDS)
         
         # Haal alle spelers op
         players_df = get_players()
         if players_df.empty:
             return True
+        player_names = players_df['speler_naam'].tolist()
             
-        # Start alle spelers met 1000 ELO
-        player_elos = {}
-        batch = db.batch()
-        batch_counter = 0
-        
-        for _, player in players_df.iterrows():
-            player_name = player['speler_naam']
-            player_elos[player_name] = 1000
-            
-            # Voeg initiële ELO toe
-            new_elo_ref = elo_ref.document()
-            batch.set(new_elo_ref, {
-                'speler_naam': player_name,
-                'rating': 1000,
-                'timestamp': pd.Timestamp.now()  # Vroege timestamp voor initiële waarden
-            })
-            batch_counter += 1
-        
-        # Commit initiële ELO's
-        if batch_counter > 0:
-            batch.commit()
+        # Start alle spelers met 1000 ELO, vlak vóór de eerste wedstrijd zodat de
+        # herberekende regels altijd de meest recente zijn
+        initial_timestamp = pd.Timestamp.now()
+        if all_matches and all_matches[0].get('timestamp') is not None:
+            initial_timestamp = pd.Timestamp(all_matches[0]['timestamp']) - pd.Timedelta(seconds=1)
+        initial_entries = [
+            {'speler_naam': player_name, 'rating': 1000, 'timestamp': initial_timestamp}
+            for player_name in player_names
+        ]
             
         # Nu alle wedstrijden doorlopen en ELO's berekenen
-        batch = db.batch()
-        batch_counter = 0
+        replay = EloReplay(all_matches, players=player_names, names=get_player_lookup().to_dict())
         
-        for match in all_matches:
-            home_team = [match.get('thuis_1'), match.get('thuis_2')]
-            away_team = [match.get('uit_1'), match.get('uit_2')]
-            home_score = int(match.get('thuis_score', 0))
-            away_score = int(match.get('uit_score', 0))
-            
-            # Bereken gemiddelde ELO's
-            home_elos = [player_elos.get(player, 1000) for player in home_team if player]
-            away_elos = [player_elos.get(player, 1000) for player in away_team if player]
-            
-            if len(home_elos) == 2 and len(away_elos) == 2:
-                avg_home_elo = sum(home_elos) / 2
-                avg_away_elo = sum(away_elos) / 2
-                
-                # Update ELO's voor thuisspelers
-                for player in home_team:
-                    if player:
-                        new_elo = elo_calculation(
-                            player_elos.get(player, 1000), avg_away_elo, home_score, away_score
-                        )
-                        player_elos[player] = new_elo
-                        
-                        # Voeg nieuwe ELO toe aan batch
-                        new_elo_ref = elo_ref.document()
-                        batch.set(new_elo_ref, {
-                            'speler_naam': player,
-                            'rating': new_elo,
-                            'timestamp': match.get('timestamp', SERVER_TIMESTAMP)
-                        })
-                        batch_counter += 1
-                
-                # Update ELO's voor uitspelers
-                for player in away_team:
-                    if player:
-                        new_elo = elo_calculation(
-                            player_elos.get(player, 1000), avg_home_elo, away_score, home_score
-                        )
-                        player_elos[player] = new_elo
-                        
-                        # Voeg nieuwe ELO toe aan batch
-                        new_elo_ref = elo_ref.document()
-                        batch.set(new_elo_ref, {
-                            'speler_naam': player,
-                            'rating': new_elo,
-                            'timestamp': match.get('timestamp', SERVER_TIMESTAMP)
-                        })
-                        batch_counter += 1
-                
-                # Commit batch als deze te groot wordt
-                if batch_counter >= 400:
-                    batch.commit()
-                    batch = db.batch()
-                    batch_counter = 0
-        
-        # Commit resterende updates
-        if batch_counter > 0:
-            batch.commit()
+        # Schrijf initiële ELO's, alle nieuwe ELO regels en de spelervelden (de backend commit in blokken)
+        get_backend().add_elo_entries(
+            with_entry_numbers(initial_entries + replay.elo_entries(), _player_numbers()),
+            player_stats=replay.player_stats(),
+            progress=_progress_step(progress, "ELO scores worden opgeslagen...", 0.35, 1.0),
+        )
+        get_backend().add_elo_checkpoints(replay.checkpoints())
         
-        st.cache_data.clear()
+        invalidate('elo', 'spelers')
         return True
         
     except Exception as e:
@@ -657,23 +764,20 @@ def update_match_with_elo_recalculation(match_id, updated_match_data):
     """
     try:
         # Haal de originele wedstrijd op voor de timestamp
-        original_match = matches_ref.document(match_id).get()
-        if not original_match.exists:
-            return False
-        
-        original_data = original_match.to_dict()
+        original_data = get_backend().get_match(match_id)
         if not original_data:
             return False
             
         original_timestamp = original_data.get('timestamp')
         
         # Update de wedstrijd
-        matches_ref.document(match_id).update(updated_match_data)
+        updated_match_data = with_player_numbers(updated_match_data, _player_numbers())
+        get_backend().update_match(match_id, updated_match_data)
         
-        # Herberekenen ELO's vanaf deze wedstrijd
-        success = recalculate_elo_from_match(original_timestamp)
+        # Herberekenen ELO's vanaf deze wedstrijd (of vanaf de nieuwe timestamp als die eerder ligt)
+        success = recalculate_elo_from_match(_earliest(original_timestamp, updated_match_data.get('timestamp')))
         
-        st.cache_data.clear()
+        invalidate('uitslag', 'elo', 'spelers')
         return success
         
     except Exception as e:
@@ -686,37 +790,33 @@ def delete_match_with_elo_recalculation(match_id):
     """
     try:
         # Haal de wedstrijd op voor de timestamp
-        match_doc = matches_ref.document(match_id).get()
-        if not match_doc.exists:
-            return True  # Al verwijderd
-        
-        match_data = match_doc.to_dict()
+        match_data = get_backend().get_match(match_id)
         if not match_data:
-            return True
+            return True  # Al verwijderd
             
         match_timestamp = match_data.get('timestamp')
         
         # Verwijder de wedstrijd
-        matches_ref.document(match_id).delete()
+        get_backend().delete_match(match_id)
         
         # Herberekenen ELO's vanaf dit punt
         success = recalculate_elo_from_match(match_timestamp)
         
-        st.cache_data.clear()
+        invalidate('uitslag', 'elo', 'spelers')
         return success
         
     except Exception as e:
         print(f"Fout bij verwijderen van wedstrijd met ELO herberekening {match_id}: {e}")
         return False
 
-def clear_collection(collection_name):
+def clear_collection(collection_name, progress=None):
     """Verwijdert alle documenten uit een collectie."""
     try:
         if collection_name == "requests":
-            docs = requests_ref.stream()
-            for doc in docs:
-                doc.reference.delete()
-            st.cache_data.clear()
+            get_backend().clear_collection(
+                collection_name, progress=_progress_step(progress, f"{collection_name} wordt geleegd...")
+            )
+            invalidate('requests')
             return True
         # Voeg hier eventueel andere collecties toe die geleegd mogen worden
         return False
@@ -735,7 +835,7 @@ def import_players(players_data):
     duplicate_count = 0
     
     # Haal alle bestaande spelernamen op in één query
-    existing_players = {doc.to_dict()['speler_naam'] for doc in players_ref.stream()}
+    existing_players = {p['speler_naam'] for p in get_backend().list_players(fields=['speler_naam'])}
 
     for player in players_data:
         player_name = player.get('speler_naam')
@@ -755,10 +855,10 @@ def import_players(players_data):
                 # Optioneel: log de fout als add_player faalt
                 print(f"Kon speler {player_name} niet importeren: {result}")
 
-    st.cache_data.clear()
+    invalidate('spelers', 'elo')
     return added_count, duplicate_count
 
-def import_matches(matches_data):
+def import_matches(matches_data, progress=None):
     """
     Importeert wedstrijden uit een lijst van dictionaries.
     Controleert op duplicaten.
@@ -769,17 +869,14 @@ def import_matches(matches_data):
     
     # Haal een subset van bestaande wedstrijden op om te controleren op duplicaten
     # Dit is een vereenvoudiging. Een robuustere aanpak is nodig voor grote datasets.
-    existing_matches_docs = matches_ref.order_by("timestamp", direction=google.cloud.firestore.Query.DESCENDING).limit(5000).stream()
     existing_matches = set()
-    for doc in existing_matches_docs:
-        d = doc.to_dict()
+    for d in get_backend().list_matches(descending=True, limit=5000, fields=MATCH_RESULT_FIELDS):
         # Maak een unieke, sorteerbare tuple om de wedstrijd te identificeren
         players_tuple = tuple(sorted([d.get('thuis_1'), d.get('thuis_2'), d.get('uit_1'), d.get('uit_2')]))
         scores_tuple = (d.get('thuis_score'), d.get('uit_score'))
         existing_matches.add((players_tuple, scores_tuple))
 
-    batch = db.batch()
-    commit_counter = 0
+    new_matches = []
     for match in matches_data:
         # Maak dezelfde unieke tuple voor de te importeren wedstrijd
         players_tuple = tuple(sorted([match.get('thuis_1'), match.get('thuis_2'), match.get('uit_1'), match.get('uit_2')]))
@@ -788,32 +885,28 @@ def import_matches(matches_data):
         if (players_tuple, scores_tuple) in existing_matches:
             duplicate_count += 1
         else:
-            new_match_ref = matches_ref.document()
-            # Converteer aangeleverde timestamp naar python datetime indien aanwezig, anders gebruik server
+            # Converteer aangeleverde timestamp naar python datetime indien aanwezig, anders gebruik server (None)
             if 'timestamp' in match and match['timestamp'] is not None:
                 try:
                     # pd.Timestamp, str of datetime worden naar native datetime geconverteerd
                     match['timestamp'] = pd.to_datetime(match['timestamp']).to_pydatetime()
                 except Exception:
-                    match['timestamp'] = SERVER_TIMESTAMP
+                    match['timestamp'] = None
             else:
-                match['timestamp'] = SERVER_TIMESTAMP
+                match['timestamp'] = None
 
-            batch.set(new_match_ref, match)
+            new_matches.append(match)
             added_count += 1
             existing_matches.add((players_tuple, scores_tuple))
-            commit_counter += 1
-
-            # Commit de batch elke 400 writes om de limiet van 500 te vermijden
-            if commit_counter >= 400:
-                batch.commit()
-                batch = db.batch() # Start een nieuwe batch
-                commit_counter = 0
 
-    if commit_counter > 0:
-        batch.commit() # Commit de resterende writes
+    # De backend schrijft in blokken (Firestore: max 400 writes per batch)
+    if new_matches:
+        numbers = _player_numbers()
+        new_matches = [with_player_numbers(match, numbers) for match in new_matches]
+        get_backend().add_matches(new_matches, progress=_progress_step(progress, "Wedstrijden worden opgeslagen..."))
+        _invalidate_elo_checkpoints(_earliest(*(match['timestamp'] for match in new_matches)))
 
-    st.cache_data.clear()
+    invalidate('uitslag')
     return added_count, duplicate_count
 
 def import_seasons(seasons_data):
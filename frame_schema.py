@@ -0,0 +1,117 @@
+# frame_schema.py
+"""
+Vaste, compacte dtypes voor de wedstrijd- en ELO tabellen.
+
+Elke Streamlit sessie houdt kopieën van deze tabellen vast, dus de loaders in firestore_service
+zetten ze één keer om:
+
+    spelernamen      categorical met één gedeelde categorieënset voor thuis_1..uit_2
+                     (en speler_naam in de ELO log), zodat vergelijkingen integer codes zijn
+    scores/klinkers  int8 (of het kleinste gehele type waar de waarden in passen); leeg telt als 0
+    tijdstippen      datetime64 in UTC; tz-naive waarden tellen als UTC
+    spelernummers    nullable Int32 (`thuis_1_nr` .. `uit_2_nr`, `speler_nr`; zie player_ids.py)
+"""
+import numpy as np
+import pandas as pd
+
+SEAT_COLUMNS = ['thuis_1', 'thuis_2', 'uit_1', 'uit_2']
+COUNT_COLUMNS = [
+    'thuis_score', 'uit_score',
+    'klinkers_thuis_1', 'klinkers_thuis_2', 'klinkers_uit_1', 'klinkers_uit_2',
+]
+TIME_COLUMNS = ['datum', 'timestamp']
+NUMBER_COLUMNS = ['thuis_1_nr', 'thuis_2_nr', 'uit_1_nr', 'uit_2_nr', 'speler_nr']
+
+
+def player_dtype(*columns):
+    """Eén CategoricalDtype met de gesorteerde namen uit alle kolommen (lege namen tellen niet mee)."""
+    names = set()
+    for column in columns:
+        values = column.cat.categories if isinstance(column.dtype, pd.CategoricalDtype) else column.dropna().unique()
+        names.update(str(name) for name in values if name != '')
+    return pd.CategoricalDtype(sorted(names))
+
+
+def player_names(values, dtype):
+    """Namen als categorical van `dtype`; lege strings worden ontbrekend, net als in de ELO replay."""
+    if not isinstance(values.dtype, pd.CategoricalDtype):
+        values = values.astype(object).where(values.notna() & (values != ''), None)
+    return values.astype(dtype)
+
+
+def small_ints(values):
+    """Gehele aantallen in het kleinste passende type (meestal int8); lege of ongeldige waarden worden 0."""
+    numbers = pd.to_numeric(values, errors='coerce').fillna(0).astype(np.int64)
+    return pd.to_numeric(numbers, downcast='integer')
+
+
+def player_numbers(values):
+    """Spelernummers als nullable Int32; ontbreekt het nummer (oude data) dan is de waarde leeg."""
+    return pd.to_numeric(values, errors='coerce').astype('Int32')
+
+
+def utc_datetimes(values):
+    """Tijdstippen als datetime64 in UTC; ongeldige waarden worden NaT."""
+    if isinstance(values.dtype, pd.DatetimeTZDtype):
+        return values.dt.tz_convert('UTC')
+    return pd.to_datetime(values, errors='coerce', utc=True)
+
+
+def compact_matches(df):
+    """Wedstrijdtabel met gedeelde categorical spelernamen, kleine integers en UTC tijdstippen."""
+    if df.empty:
+        return df
+    df = df.copy()
+    seats = [col for col in SEAT_COLUMNS if col in df.columns]
+    dtype = player_dtype(*(df[col] for col in seats))
+    for col in seats:
+        df[col] = player_names(df[col], dtype)
+    for col in COUNT_COLUMNS:
+        if col in df.columns:
+            df[col] = small_ints(df[col])
+    for col in TIME_COLUMNS:
+        if col in df.columns:
+            df[col] = utc_datetimes(df[col])
+    for col in NUMBER_COLUMNS:
+        if col in df.columns:
+            df[col] = player_numbers(df[col])
+    return df
+
+
+def compact_elo_logs(df):
+    """ELO log met categorical spelernamen, float ratings en UTC tijdstippen."""
+    if df.empty:
+        return df
+    df = df.copy()
+    if 'speler_naam' in df.columns:
+        df['speler_naam'] = player_names(df['speler_naam'], player_dtype(df['speler_naam']))
+    if 'rating' in df.columns:
+        df['rating'] = pd.to_numeric(df['rating'], errors='coerce')
+    if 'timestamp' in df.columns:
+        df['timestamp'] = utc_datetimes(df['timestamp'])
+    if 'speler_nr' in df.columns:
+        df['speler_nr'] = player_numbers(df['speler_nr'])
+    return df
+
+
+def memory_usage(df):
+    """Geheugengebruik van een DataFrame in bytes, inclusief de inhoud van strings."""
+    return int(df.memory_usage(deep=True).sum())
+
+
+def memory_report(tables):
+    """
+    Geheugengebruik vóór en na compactie per tabel. `tables` is een dict
+    naam -> (ruw DataFrame, compact DataFrame).
+    """
+    rows = []
+    for name, (before, after) in tables.items():
+        before_bytes, after_bytes = memory_usage(before), memory_usage(after)
+        rows.append({
+            'Tabel': name,
+            'Rijen': len(after),
+            'Voor (KB)': round(before_bytes / 1024, 1),
+            'Na (KB)': round(after_bytes / 1024, 1),
+            'Besparing %': round((1 - after_bytes / before_bytes) * 100, 1) if before_bytes else 0.0,
+        })
+    return pd.DataFrame(rows)
@@ -0,0 +1,130 @@
+# live_cache.py
+"""
+Procesbrede cache van spelers, wedstrijden en ELO die actueel blijft via Firestore
+`on_snapshot` listeners.
+
+Alle Streamlit sessies in het proces delen dezelfde tabellen in het geheugen. Na de
+eerste snapshot kost een wijziging één read per gewijzigd document voor het hele proces,
+in plaats van een volledige collectie-read per sessie na elke `st.cache_data.clear()`.
+
+Aanzetten met `TAFELVOETBAL_LIVE_CACHE=1` of `live_cache = true` in de `[storage]`
+secrets. Alleen beschikbaar met de Firestore backend (of de in-memory fake).
+"""
+import threading
+
+from storage import SEAT_NR_FIELDS, aggregate_records, page_records, project_fields
+
+LIVE_COLLECTIONS = ('spelers', 'uitslag', 'elo')
+READY_TIMEOUT = 15  # seconden wachten op de eerste snapshot van elke collectie
+
+
+def _sort_by_timestamp(records, descending):
+    """Sorteer zoals Firestore `order_by('timestamp')`: documenten zonder timestamp vallen af."""
+    records = [r for r in records if r.get('timestamp') is not None]
+    records.sort(key=lambda r: r['_id'], reverse=descending)
+    records.sort(key=lambda r: r['timestamp'], reverse=descending)
+    return records
+
+
+class LiveCollection:
+    """Houdt één collectie bij als {doc_id: data} op basis van document-wijzigingen."""
+
+    def __init__(self, collection_ref, on_change=None):
+        self.name = collection_ref.id
+        self.docs = {}
+        self.version = 0
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._on_change = on_change
+        self._watch = collection_ref.on_snapshot(self._on_snapshot)
+
+    def _on_snapshot(self, docs, changes, read_time):
+        # Draait in de listener-thread van de Firestore client
+        with self._lock:
+            for change in changes:
+                if change.type.name == 'REMOVED':
+                    self.docs.pop(change.document.id, None)
+                else:
+                    self.docs[change.document.id] = change.document.to_dict()
+            self.version += 1
+        first_snapshot = not self._ready.is_set()
+        self._ready.set()
+        if changes and not first_snapshot and self._on_change is not None:
+            self._on_change(self.name)
+
+    def wait_until_ready(self, timeout):
+        return self._ready.wait(timeout)
+
+    def records(self):
+        """Kopie van alle documenten, met het document-ID onder `_id`."""
+        with self._lock:
+            return [{**data, '_id': doc_id} for doc_id, data in self.docs.items()]
+
+    def close(self):
+        self._watch.unsubscribe()
+
+
+class LiveCache:
+    """Leest spelers, wedstrijden en ELO uit het geheugen, met dezelfde methodes als een backend."""
+
+    def __init__(self, client, on_change=None):
+        self.collections = {
+            name: LiveCollection(client.collection(name), on_change) for name in LIVE_COLLECTIONS
+        }
+
+    def wait_until_ready(self, timeout=READY_TIMEOUT):
+        return all(c.wait_until_ready(timeout) for c in self.collections.values())
+
+    def close(self):
+        for collection in self.collections.values():
+            collection.close()
+
+    # ---------- Lezen (zelfde vorm als StorageBackend) ----------
+    def list_players(self, fields=None):
+        players_list = []
+        for record in self.collections['spelers'].records():
+            player_id = record.pop('_id')
+            players_list.append({**project_fields(record, fields), 'speler_id': player_id})
+        return players_list
+
+    def list_matches(self, descending=True, limit=None, fields=None):
+        matches = _sort_by_timestamp(self.collections['uitslag'].records(), descending)
+        if limit is not None:
+            matches = matches[:limit]
+        matches_list = []
+        for match in matches:
+            match_id = match.pop('_id')
+            matches_list.append({**project_fields(match, fields), 'match_id': match_id})
+        return matches_list
+
+    def list_elo_logs(self, speler_naam=None, descending=True, since=None, fields=None):
+        logs = self.collections['elo'].records()
+        if speler_naam is not None:
+            logs = [log for log in logs if log.get('speler_naam') == speler_naam]
+        if since is not None:
+            logs = [log for log in logs if log.get('timestamp') is not None and log['timestamp'] >= since]
+        logs = _sort_by_timestamp(logs, descending)
+        for log in logs:
+            del log['_id']
+        return [project_fields(log, fields) for log in logs]
+
+    def page_matches(self, speler_nr=None, since=None, before=None, limit=50, start_after=None):
+        matches = self.collections['uitslag'].records()
+        if speler_nr is not None:
+            matches = [m for m in matches if any(m.get(field) == speler_nr for field in SEAT_NR_FIELDS.values())]
+        page, cursor = page_records(matches, limit, start_after, since, before)
+        for match in page:
+            match['match_id'] = match.pop('_id')
+        return page, cursor
+
+    def page_elo_logs(self, speler_nr=None, since=None, before=None, limit=50, start_after=None):
+        logs = self.collections['elo'].records()
+        if speler_nr is not None:
+            logs = [log for log in logs if log.get('speler_nr') == speler_nr]
+        page, cursor = page_records(logs, limit, start_after, since, before)
+        for log in page:
+            del log['_id']
+        return page, cursor
+
+    def aggregate(self, collection_name, sums=(), avgs=(), since=None, before=None):
+        return aggregate_records(self.collections[collection_name].records(), sums, avgs, since, before)
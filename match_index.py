@@ -0,0 +1,122 @@
+# match_index.py
+"""
+Zoekindex op de wedstrijden voor de wedstrijdkeuze in de Beheer tab.
+
+De wedstrijdtabel (nieuwste eerst, zoals get_matches hem geeft) wordt één keer doorlopen; elke
+wedstrijd krijgt zijn rijpositie en per zoeksleutel staat een gesorteerde array met posities:
+
+    datum    dag 'dd-mm-jjjj' (UTC)                  -> posities van die dag
+    speler   naam                                     -> posities waar de speler op een stoel zat
+    score    'thuis-uit', bv. '10-7'                  -> posities met die uitslag
+
+Een zoekopdracht bestaat uit woorden en een wedstrijd moet aan elk woord voldoen. Een woord is
+(een deel van) een datum ('16-09-2025', '09-2025', '2025'), een score of een deel van een
+spelernaam; een woord dat op meerdere manieren past ('10-07' als score of als dag) telt alle
+treffers. Per woord wordt alleen over de verschillende dagen, namen en scores gezocht, en de
+treffers zijn een doorsnede van gesorteerde arrays. Alleen de bovenste `limit` treffers krijgen
+een label, en een gekozen match_id vindt zijn rij via één dict-opzoeking.
+"""
+import re
+
+import numpy as np
+import pandas as pd
+
+from frame_schema import SEAT_COLUMNS
+
+SCORE_PATTERN = re.compile(r'^\d{1,2}-\d{1,2}$')
+
+
+def _postings(keys):
+    """{sleutel: gesorteerde posities} voor een reeks sleutels per positie; lege sleutels tellen niet mee."""
+    keys = pd.Series(keys).reset_index(drop=True)
+    present = np.flatnonzero(keys.notna().to_numpy())
+    values = keys.iloc[present].to_numpy()
+    return {key: present[rows] for key, rows in pd.Series(values).groupby(values, sort=False).indices.items()}
+
+
+class MatchIndex:
+    """Posities per dag, speler en score, plus match_id -> positie, over één wedstrijdtabel."""
+
+    def __init__(self, match_ids, timestamps, seats, scores, by_day, by_player, by_score):
+        self.match_ids = match_ids
+        self.positions = {match_id: position for position, match_id in enumerate(match_ids)}
+        self.timestamps = timestamps  # DatetimeIndex in UTC, NaT zonder tijd
+        self.seats = seats  # vier arrays met namen, in de volgorde van SEAT_COLUMNS
+        self.scores = scores  # (thuis, uit)
+        self.by_day = by_day
+        self.by_player = by_player
+        self.by_score = by_score
+
+    @classmethod
+    def from_matches(cls, matches):
+        """Bouwt de index uit een wedstrijdtabel; de volgorde van de tabel is de volgorde van de treffers."""
+        n = len(matches)
+        column = lambda name: matches[name] if name in matches.columns else pd.Series([None] * n, index=matches.index)
+        match_ids = column('match_id').astype(object).to_numpy()
+        timestamps = pd.DatetimeIndex(pd.to_datetime(column('timestamp'), errors='coerce', utc=True))
+        seats = [column(seat).astype(object).to_numpy() for seat in SEAT_COLUMNS]
+        scores = tuple(
+            pd.to_numeric(column(side), errors='coerce').to_numpy(dtype=np.float64) for side in ('thuis_score', 'uit_score')
+        )
+
+        # Dagen en scores eerst als gehele sleutels groeperen; alleen de verschillende waarden worden tekst
+        days = _postings(timestamps.normalize())
+        by_day = {pd.Timestamp(day).strftime('%d-%m-%Y'): positions for day, positions in days.items()}
+        score_keys = pd.Series(scores[0]) * 100 + pd.Series(scores[1])
+        by_score = {f"{int(key) // 100}-{int(key) % 100}": positions for key, positions in _postings(score_keys).items()}
+        seat_names = pd.Series(np.concatenate(seats) if n else [], dtype=object)
+        seat_positions = np.tile(np.arange(n), len(SEAT_COLUMNS))
+        by_player = {
+            name: np.unique(seat_positions[rows])
+            for name, rows in _postings(seat_names.where(seat_names != '')).items()
+        }
+        return cls(match_ids, timestamps, seats, scores, by_day, by_player, by_score)
+
+    def __len__(self):
+        return len(self.match_ids)
+
+    def __contains__(self, match_id):
+        return match_id in self.positions
+
+    def position(self, match_id):
+        """Rijpositie van een wedstrijd in de tabel waaruit de index gebouwd is."""
+        return self.positions[match_id]
+
+    def _word_positions(self, word):
+        """Gesorteerde posities van alle wedstrijden die bij één zoekwoord passen."""
+        word = word.lower()
+        hits = [positions for name, positions in self.by_player.items() if word in str(name).lower()]
+        if any(char.isdigit() for char in word):
+            hits += [positions for day, positions in self.by_day.items() if word in day]
+            if SCORE_PATTERN.match(word):
+                home, away = (int(part) for part in word.split('-'))
+                hits.append(self.by_score.get(f"{home}-{away}", np.array([], dtype=np.intp)))
+        if not hits:
+            return np.array([], dtype=np.intp)
+        return hits[0] if len(hits) == 1 else np.unique(np.concatenate(hits))
+
+    def search(self, query='', limit=50):
+        """
+        (match_ids, aantal treffers): de bovenste `limit` wedstrijden (nieuwste eerst) die bij
+        alle woorden van `query` passen. Een lege zoekopdracht geeft de nieuwste wedstrijden.
+        """
+        words = query.split()
+        if not words:
+            return list(self.match_ids[:limit]), len(self)
+        # Kleinste lijst eerst, zodat elke doorsnede hooguit zo groot is als die lijst
+        postings = sorted((self._word_positions(word) for word in words), key=len)
+        positions = postings[0]
+        for other in postings[1:]:
+            if not len(positions):
+                break
+            positions = np.intersect1d(positions, other, assume_unique=True)
+        return list(self.match_ids[positions[:limit]]), len(positions)
+
+    def label(self, match_id):
+        """Leesbare omschrijving van één wedstrijd: 'dd-mm-jjjj hh:mm - A/B vs C/D: 10-7'."""
+        position = self.positions[match_id]
+        timestamp = self.timestamps[position]
+        when = 'Geen tijd' if pd.isna(timestamp) else timestamp.strftime('%d-%m-%Y %H:%M')
+        names = [seat[position] if pd.notna(seat[position]) else 'N/A' for seat in self.seats]
+        home, away = (f"{score[position]:g}" if pd.notna(score[position]) else 'N/A' for score in self.scores)
+        return f"{when} - {names[0]}/{names[1]} vs {names[2]}/{names[3]}: {home}-{away}"
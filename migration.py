@@ -1,6 +1,10 @@
 
 import firestore_service as db
 import pandas as pd
+from google.cloud.firestore_v1 import SERVER_TIMESTAMP
+
+from bulk_writer import BulkWriter
+from player_ids import assign_player_numbers
 
 def migrate_matches():
     """
@@ -43,18 +47,84 @@ def migrate_matches():
 
     print(f"\nFound {migrated_count} documents to migrate. Updating now...")
 
-    # Update documents in a batch
-    batch = db.db.batch()
+    # Update documents in chunked, parallel batches (a single batch fails above 500 writes)
+    writer = BulkWriter(db.db, progress=lambda done, total: print(f"  {done}/{total} documents written"))
     for ref, data in docs_to_update:
-        batch.set(ref, data, merge=True) # Use set with merge=True to be safe
+        # updated_at laat de incrementele sync in draaiende apps de wijziging oppikken
+        data['updated_at'] = SERVER_TIMESTAMP
+        writer.set(ref, data, merge=True) # Use set with merge=True to be safe
     
     try:
-        batch.commit()
+        writer.commit()
         print(f"\nSuccessfully migrated {migrated_count} documents!")
         # Clear cache to ensure the app re-fetches the updated data
-        db.st.cache_data.clear()
+        db.reset_match_sync()
+        db.invalidate('uitslag')
     except Exception as e:
         print(f"\nAn error occurred during the batch update: {e}")
 
+def backfill_player_ratings():
+    """
+    Zet de gematerialiseerde velden rating, gespeeld en bijgewerkt op spelerdocumenten
+    die van vóór deze velden zijn. Rating en tijdstip komen uit de ELO log, het aantal
+    gespeelde wedstrijden uit de uitslagen.
+    """
+    print("Starting backfill of player ratings...")
+    players_df = db.get_players()
+    if players_df.empty:
+        print("No players found.")
+        return
+
+    legacy = players_df[players_df['gespeeld'].isna()]
+    if legacy.empty:
+        print("All players already have materialized ratings.")
+        return
+
+    elo_df = db.get_elo_logs()
+    matches_df = db.get_matches()
+    player_stats = {}
+    for name, rating in zip(legacy['speler_naam'], legacy['rating']):
+        played = 0
+        if not matches_df.empty:
+            played = int((matches_df[['thuis_1', 'thuis_2', 'uit_1', 'uit_2']] == name).any(axis=1).sum())
+        last_update = None
+        if not elo_df.empty:
+            player_log = elo_df[elo_df['speler_naam'] == name]
+            if not player_log.empty:
+                last_update = pd.Timestamp(player_log['timestamp'].max()).to_pydatetime()
+        player_stats[name] = {'rating': float(rating), 'gespeeld': played, 'bijgewerkt': last_update}
+
+    db.get_backend().add_elo_entries([], player_stats=player_stats)
+    db.invalidate('spelers')
+    print(f"Backfilled {len(player_stats)} players.")
+
+def migrate_player_ids():
+    """
+    Gives every player a stable integer `speler_nr` and stores those numbers on the seats of
+    every match (thuis_1_nr .. uit_2_nr) and on every ELO entry that does not have them yet.
+    Names stay on the documents; the app reads them through the numbers (see player_ids.py).
+    Safe to run again: existing numbers are kept.
+    """
+    print("Starting migration to integer player ids...")
+    backend = db.get_backend()
+    players = backend.list_players(fields=db.PLAYER_NUMBER_FIELDS)
+    if not players:
+        print("No players found.")
+        return
+
+    numbers = assign_player_numbers(players)
+    new_numbers = sum(1 for p in players if p.get('speler_nr') is None)
+    print(f"{len(numbers)} players, {new_numbers} without a number. Updating documents now...")
+
+    updated = backend.backfill_player_numbers(
+        numbers, progress=lambda done, total: print(f"  {done}/{total} documents written")
+    )
+    # Clear cache to ensure the app re-fetches the updated data
+    db.reset_match_sync()
+    db.invalidate('spelers', 'uitslag', 'elo')
+    print(f"Successfully updated {updated} documents!")
+
 if __name__ == '__main__':
     migrate_matches()
+    backfill_player_ratings()
+    migrate_player_ids()
@@ -288,7 +288,7 @@ st.info("💡 Dit reset alle ELO scores naar 1000 en herberekent ze opnieuw op b
 
 if st.button("🔄 Reset en herbereken alle ELO scores", type="secondary", key="reset_elo_beheer"):
     with st.spinner("Alle ELO scores worden gereset en herberekend... Dit kan even duren."):
-        success = db.reset_all_elos()
+        success = db.reset_all_elos(progress=st.progress(0.0).progress)
         if success:
             st.success("✅ Alle ELO scores succesvol gereset en herberekend!")
             st.balloons()
@@ -392,11 +392,12 @@ with import_tab1:
                 if st.button("Importeer Wedstrijden", key="import_matches_beheer"):
                     with st.spinner("Wedstrijden aan het importeren..."):
                         matches_data = matches_df_upload.to_dict('records')
-                        added, duplicates = db.import_matches(matches_data)
+                        progress_bar = st.progress(0.0)
+                        added, duplicates = db.import_matches(matches_data, progress=progress_bar.progress)
                         
                         if elo_upload_option.startswith("🔄") and added > 0:
                             with st.spinner("ELO scores worden herberekend..."):
-                                db.reset_all_elos()
+                                db.reset_all_elos(progress=progress_bar.progress)
                         
                         st.success(f"Import voltooid! {added} wedstrijden toegevoegd, {duplicates} duplicaten gevonden.")
                         if elo_upload_option.startswith("🔄"):
@@ -0,0 +1,159 @@
+# participations.py
+"""
+Deelnames: de wedstrijden in lange vorm, één rij per (wedstrijd, speler).
+
+Elke statistiek (home tab, seizoenen, analytics) telt per speler; in plaats van dat elke
+functie zelf met iterrows door de brede wedstrijdtabel loopt, wordt die één keer per
+dataversie omgezet (zie firestore_service.get_participations) en daarna alleen gegroepeerd.
+
+Kolommen:
+    match_id, datum, season_id wedstrijd, tijdstip en seizoen (zie season_utils.season_ids)
+    speler, stoel, kant        naam, stoel (thuis_1..uit_2) en 'thuis' of 'uit'
+    teamgenoot                 de andere speler van het eigen team (leeg bij een lege stoel)
+    tegenstander_1/2           de spelers van het andere team
+    voor, tegen, gewonnen      doelpunten van het eigen en andere team, voor > tegen
+    klinkers                   klinkers van deze speler
+    elo_voor, elo_na           rating vóór en na de wedstrijd uit de ELO log (NaN als onbekend)
+
+Spelernamen zijn categorical met één gedeelde categorieënset (zie frame_schema.py).
+Een speler die (foutief) op twee stoelen staat telt één keer, op zijn eerste stoel
+(thuis gaat voor uit); lege stoelen leveren geen rij op.
+"""
+import numpy as np
+import pandas as pd
+
+from frame_schema import SEAT_COLUMNS, player_dtype, player_names
+from season_utils import season_column, season_ids
+
+# Per stoel: teamgenoot en de twee tegenstanders
+SEAT_RELATIONS = {
+    'thuis_1': ('thuis_2', 'uit_1', 'uit_2'),
+    'thuis_2': ('thuis_1', 'uit_1', 'uit_2'),
+    'uit_1': ('uit_2', 'thuis_1', 'thuis_2'),
+    'uit_2': ('uit_1', 'thuis_1', 'thuis_2'),
+}
+PARTICIPATION_COLUMNS = [
+    'match_id', 'datum', 'season_id', 'speler', 'stoel', 'kant', 'teamgenoot',
+    'tegenstander_1', 'tegenstander_2', 'voor', 'tegen', 'gewonnen', 'klinkers',
+    'elo_voor', 'elo_na',
+]
+
+
+def _column(matches, column):
+    """Kolom als object array; ontbrekende kolommen zijn leeg."""
+    if column not in matches.columns:
+        return np.full(len(matches), None, dtype=object)
+    return matches[column].to_numpy(dtype=object)
+
+
+def _name_codes(matches, column, dtype):
+    """Categorical codes van een stoelkolom in `dtype`; -1 voor een lege of ontbrekende stoel."""
+    if column not in matches.columns:
+        return np.full(len(matches), -1, dtype=np.int32)
+    return player_names(matches[column], dtype).cat.codes.to_numpy()
+
+
+def _numeric_column(matches, column):
+    """Kolom als int array; ontbrekende kolommen en lege waarden tellen als 0."""
+    if column not in matches.columns:
+        return np.zeros(len(matches), dtype=np.int64)
+    return pd.to_numeric(matches[column], errors='coerce').fillna(0).astype(np.int64).to_numpy()
+
+
+def empty_participations():
+    """Lege deelnametabel met de vaste kolommen."""
+    return pd.DataFrame({column: pd.Series(dtype=object) for column in PARTICIPATION_COLUMNS})
+
+
+def _elo_ratings(elo_logs):
+    """
+    Rating vóór en na per (match_id, speler) uit de ELO log.
+    'Vóór' is de vorige regel van die speler in tijdsvolgorde (ook een startregel zonder wedstrijd).
+    """
+    if elo_logs is None or elo_logs.empty or 'match_id' not in elo_logs.columns:
+        return None
+    logs = elo_logs[['speler_naam', 'rating', 'timestamp', 'match_id']].copy()
+    logs['timestamp'] = pd.to_datetime(logs['timestamp'], errors='coerce', utc=True)
+    logs = logs.sort_values(['speler_naam', 'timestamp'], kind='stable')
+    logs['elo_voor'] = logs.groupby('speler_naam', sort=False)['rating'].shift(1)
+    logs = logs[logs['match_id'].notna()]
+    # Bij dubbele regels (oude data) telt de laatste
+    logs = logs.drop_duplicates(['match_id', 'speler_naam'], keep='last')
+    return logs.rename(columns={'speler_naam': 'speler', 'rating': 'elo_na'})[
+        ['match_id', 'speler', 'elo_voor', 'elo_na']
+    ]
+
+
+def build_participations(matches, elo_logs=None):
+    """
+    Bouwt de deelnametabel uit een wedstrijdtabel (formaat van get_matches) en optioneel de
+    ELO log (formaat van get_elo_logs). De rijen volgen de volgorde van `matches`, per wedstrijd
+    stoel voor stoel.
+    """
+    seats = [col for col in SEAT_COLUMNS if col in matches.columns]
+    if matches.empty or not seats:
+        return empty_participations()
+
+    n_matches = len(matches)
+    home_score = _numeric_column(matches, 'thuis_score')
+    away_score = _numeric_column(matches, 'uit_score')
+    # Namen als codes van één gedeelde categorical (zie frame_schema.py): vergelijkingen en de
+    # groupby's erna lopen over integers
+    dtype = player_dtype(*(matches[seat] for seat in seats))
+    names = {seat: _name_codes(matches, seat, dtype) for seat in SEAT_COLUMNS}
+    empty = {seat: names[seat] < 0 for seat in SEAT_COLUMNS}
+
+    frames = []
+    for position, seat in enumerate(SEAT_COLUMNS):
+        if seat not in seats:
+            continue
+        # Een speler telt alleen op zijn eerste stoel in de wedstrijd
+        keep = ~empty[seat]
+        for earlier in SEAT_COLUMNS[:position]:
+            keep &= empty[earlier] | (names[earlier] != names[seat])
+        rows = np.flatnonzero(keep)
+
+        home = seat.startswith('thuis')
+        teammate, opponent_1, opponent_2 = SEAT_RELATIONS[seat]
+        goals_for = (home_score if home else away_score)[rows]
+        goals_against = (away_score if home else home_score)[rows]
+        frames.append(pd.DataFrame({
+            '_rij': rows,
+            '_stoel': position,
+            'speler': pd.Categorical.from_codes(names[seat][rows], dtype=dtype),
+            'stoel': seat,
+            'kant': 'thuis' if home else 'uit',
+            'teamgenoot': pd.Categorical.from_codes(names[teammate][rows], dtype=dtype),
+            'tegenstander_1': pd.Categorical.from_codes(names[opponent_1][rows], dtype=dtype),
+            'tegenstander_2': pd.Categorical.from_codes(names[opponent_2][rows], dtype=dtype),
+            'voor': goals_for,
+            'tegen': goals_against,
+            'gewonnen': goals_for > goals_against,
+            'klinkers': _numeric_column(matches, f'klinkers_{seat}')[rows],
+        }))
+
+    long = pd.concat(frames, ignore_index=True)
+    long = long.iloc[np.lexsort((long['_stoel'].to_numpy(), long['_rij'].to_numpy()))]
+
+    # Wedstrijdkolommen één keer per wedstrijd bepalen en dan per rij ophalen
+    row_index = long['_rij'].to_numpy()
+    if 'datum' in matches.columns:
+        dates = pd.to_datetime(matches['datum'], errors='coerce').reset_index(drop=True)
+        seasons = season_column(matches).reset_index(drop=True)
+    else:
+        dates = pd.Series(pd.NaT, index=range(n_matches), dtype='datetime64[ns]')
+        seasons = season_ids(dates)
+    long = long.drop(columns=['_rij', '_stoel']).reset_index(drop=True)
+    long.insert(0, 'match_id', _column(matches, 'match_id')[row_index])
+    long.insert(1, 'datum', dates.take(row_index).reset_index(drop=True))
+    long.insert(2, 'season_id', seasons.take(row_index).reset_index(drop=True))
+
+    ratings = _elo_ratings(elo_logs)
+    if ratings is None:
+        long['elo_voor'] = np.nan
+        long['elo_na'] = np.nan
+    else:
+        ratings['speler'] = ratings['speler'].astype(dtype)
+        long = long.merge(ratings, on=['match_id', 'speler'], how='left', sort=False)
+        long[['elo_voor', 'elo_na']] = long[['elo_voor', 'elo_na']].astype(float)
+    return long[PARTICIPATION_COLUMNS]
@@ -0,0 +1,103 @@
+# player_ids.py
+"""
+Vaste gehele spelernummers (`speler_nr`).
+
+Een speler krijgt bij het aanmaken (of via migration.migrate_player_ids) een nummer dat niet meer
+verandert. Wedstrijden dragen per stoel het nummer van de speler
+(`thuis_1_nr` .. `uit_2_nr`, zie storage.SEAT_NR_FIELDS) en ELO regels `speler_nr`, naast de
+naam. Bij het lezen komen de namen via de nummers uit één opzoektabel, zodat een gewijzigde
+spelernaam overal doorwerkt zonder de wedstrijden te herschrijven; regels zonder nummer (van
+vóór de migratie) houden hun opgeslagen naam. Ook de ELO replay, de spelervelden en het
+verwijderen van een speler gaan op nummer (zie elo_engine.EloReplay).
+
+Het document-ID van een speler heet in de app al `speler_id`; het gehele nummer is daarom
+`speler_nr`.
+"""
+import pandas as pd
+
+from frame_schema import player_dtype, player_names
+from storage import SEAT_NR_FIELDS
+
+
+def player_lookup(players):
+    """Naam per spelernummer als Series (index `speler_nr`, oplopend); spelers zonder nummer tellen niet mee."""
+    numbered = [p for p in players if p.get('speler_nr') is not None and p.get('speler_naam')]
+    lookup = pd.Series(
+        [p['speler_naam'] for p in numbered],
+        index=pd.Index([int(p['speler_nr']) for p in numbered], name='speler_nr'),
+        dtype=object,
+    )
+    return lookup.sort_index()
+
+
+def next_player_nr(players):
+    """Het eerstvolgende vrije nummer: één hoger dan het hoogste nummer van de bestaande spelers."""
+    numbers = [int(p['speler_nr']) for p in players if p.get('speler_nr') is not None]
+    return max(numbers, default=0) + 1
+
+
+def assign_player_numbers(players):
+    """
+    {speler_naam: speler_nr} voor alle spelers: bestaande nummers blijven staan, spelers zonder
+    nummer krijgen op alfabetische volgorde de volgende vrije nummers.
+    """
+    numbers = {p['speler_naam']: int(p['speler_nr']) for p in players if p.get('speler_nr') is not None}
+    next_nr = next_player_nr(players)
+    for name in sorted(p['speler_naam'] for p in players if p.get('speler_nr') is None and p.get('speler_naam')):
+        numbers[name] = next_nr
+        next_nr += 1
+    return numbers
+
+
+def with_player_numbers(match_data, numbers):
+    """
+    Kopie van een wedstrijd met het spelernummer per meegegeven stoel; een naam zonder nummer
+    maakt het veld leeg, zodat een bijgewerkte stoel nooit het nummer van de vorige speler houdt.
+    """
+    match_data = dict(match_data)
+    for seat, field in SEAT_NR_FIELDS.items():
+        if seat in match_data:
+            match_data[field] = numbers.get(match_data[seat])
+    return match_data
+
+
+def with_entry_numbers(entries, numbers):
+    """ELO regels met `speler_nr` erbij voor spelers met een nummer; een regel die al een nummer heeft houdt dat."""
+    return [
+        {**entry, 'speler_nr': numbers[entry['speler_naam']]}
+        if entry.get('speler_nr') is None and entry.get('speler_naam') in numbers else entry
+        for entry in entries
+    ]
+
+
+def _resolved(names, player_numbers, lookup):
+    """Namen via de nummers uit `lookup`; zonder (bekend) nummer blijft de opgeslagen naam staan."""
+    resolved = player_numbers.map(lookup)
+    return resolved.where(resolved.notna(), names.astype(object))
+
+
+def resolve_match_names(matches, lookup):
+    """Wedstrijdtabel met de stoelnamen volgens de spelernummers (gedeelde categorical, zie frame_schema.py)."""
+    fields = {seat: field for seat, field in SEAT_NR_FIELDS.items() if seat in matches.columns and field in matches.columns}
+    if matches.empty or lookup.empty or not fields:
+        return matches
+    matches = matches.copy()
+    names = {
+        seat: _resolved(matches[seat], matches[fields[seat]], lookup) if seat in fields else matches[seat].astype(object)
+        for seat in SEAT_NR_FIELDS if seat in matches.columns
+    }
+    # Categorieën opnieuw uit de gebruikte namen, zodat oude namen niet als lege categorie blijven hangen
+    dtype = player_dtype(*names.values())
+    for seat, values in names.items():
+        matches[seat] = player_names(values, dtype)
+    return matches
+
+
+def resolve_elo_names(elo_logs, lookup):
+    """ELO log met `speler_naam` volgens `speler_nr` waar dat bekend is."""
+    if elo_logs.empty or lookup.empty or 'speler_nr' not in elo_logs.columns:
+        return elo_logs
+    elo_logs = elo_logs.copy()
+    names = _resolved(elo_logs['speler_naam'], elo_logs['speler_nr'], lookup)
+    elo_logs['speler_naam'] = player_names(names, player_dtype(names))
+    return elo_logs
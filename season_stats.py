@@ -0,0 +1,83 @@
+# season_stats.py
+"""
+Seizoensstatistieken per speler voor de Seizoenen tab.
+
+Alles komt uit één groupby over de deelnames van het seizoen (zie participations.py) en één
+rating-opzoektabel op spelernaam, in plaats van per speler alle wedstrijden en alle spelers
+door te lopen.
+"""
+import pandas as pd
+
+from season_utils import season_window
+
+DEFAULT_RATING = 1000
+
+SEASON_STATS_COLUMNS = [
+    'Speler', 'Wedstrijden', 'Gewonnen', 'Verloren', 'Win %', 'Doelpunten Voor',
+    'Doelpunten Tegen', 'Doelsaldo', 'Klinkers', 'Huidige ELO',
+]
+
+
+def rating_lookup(players_df):
+    """Huidige rating per speler als Series met `speler_naam` als index (eerste rij telt bij dubbelen)."""
+    if players_df.empty or 'speler_naam' not in players_df.columns:
+        return pd.Series(dtype=float)
+    ratings = players_df['rating'] if 'rating' in players_df.columns else pd.Series(None, index=players_df.index)
+    lookup = pd.Series(
+        pd.to_numeric(ratings, errors='coerce').fillna(DEFAULT_RATING).to_numpy(),
+        index=players_df['speler_naam'].to_numpy(),
+    )
+    return lookup[~lookup.index.duplicated()]
+
+
+def season_player_stats(season_participations, players_df):
+    """
+    Eén rij per speler die in het seizoen gespeeld heeft, gesorteerd op huidige ELO met de rang
+    (vanaf 1) als index. Gelijkspel telt als verlies, zoals in de oorspronkelijke ranking.
+    """
+    if season_participations.empty:
+        return pd.DataFrame(columns=SEASON_STATS_COLUMNS)
+
+    stats = season_participations.groupby('speler', sort=False).agg(
+        Wedstrijden=('voor', 'size'),
+        Gewonnen=('gewonnen', 'sum'),
+        Voor=('voor', 'sum'),
+        Tegen=('tegen', 'sum'),
+        Klinkers=('klinkers', 'sum'),
+    ).astype(int)
+    ratings = rating_lookup(players_df).reindex(stats.index).fillna(DEFAULT_RATING)
+
+    ranking = pd.DataFrame({
+        'Speler': stats.index,
+        'Wedstrijden': stats['Wedstrijden'].to_numpy(),
+        'Gewonnen': stats['Gewonnen'].to_numpy(),
+        'Verloren': (stats['Wedstrijden'] - stats['Gewonnen']).to_numpy(),
+        'Win %': (stats['Gewonnen'] / stats['Wedstrijden'] * 100).round(1).to_numpy(),
+        'Doelpunten Voor': stats['Voor'].to_numpy(),
+        'Doelpunten Tegen': stats['Tegen'].to_numpy(),
+        'Doelsaldo': (stats['Voor'] - stats['Tegen']).to_numpy(),
+        'Klinkers': stats['Klinkers'].to_numpy(),
+        'Huidige ELO': ratings.astype(int).to_numpy(),
+    })
+    ranking = ranking.sort_values('Huidige ELO', ascending=False, kind='stable').reset_index(drop=True)
+    ranking.index = ranking.index + 1  # Start ranking bij 1
+    return ranking
+
+
+def season_elo_changes(rating_index, players, season_year):
+    """
+    Rating aan het begin en einde van het seizoen per speler uit de as-of index (zie elo_index.py).
+    De start is de laatste rating vóór de seizoensgrens; wie daar nog geen regel had, begint op 1000.
+    Voor het lopende seizoen is het einde de meest recente rating.
+    """
+    players = list(players)
+    start, end = season_window(season_year)
+    one_ns = pd.Timedelta(1, unit='ns')  # Regels precies op de grens horen bij het nieuwe seizoen
+    start_elo = rating_index.ratings_at(players, start - one_ns, default=DEFAULT_RATING)
+    end_elo = rating_index.ratings_at(players, end - one_ns, default=DEFAULT_RATING)
+    return pd.DataFrame({
+        'Speler': players,
+        'Start ELO': start_elo.round().astype(int),
+        'Eind ELO': end_elo.round().astype(int),
+        'ELO Verandering': (end_elo - start_elo).round().astype(int),
+    })
@@ -1,6 +1,7 @@
 """
 Seizoen utilities voor de tafelvoetbal app - Prinsjesdag gebaseerd systeem
 """
+import numpy as np
 import pandas as pd
 import streamlit as st
 from datetime import date, timedelta
@@ -21,197 +22,162 @@ def get_prinsjesdag(year):
     return prinsjesdag
 
 
-def generate_prinsjesdag_seasons(matches_df):
-    """Genereer automatische seizoenen op basis van Prinsjesdag"""
-    prinsjesdag_seasons = []
-    
+def season_boundaries(first_year, last_year):
+    """
+    Einde van de seizoenen `first_year`..`last_year` (Prinsjesdag 24:00) als gesorteerde
+    datetime64 array; seizoen `jaar` loopt tot en met Prinsjesdag van dat jaar.
+    """
+    return np.array(
+        [np.datetime64(get_prinsjesdag(year) + timedelta(days=1), 'ns') for year in range(first_year, last_year + 1)],
+        dtype='datetime64[ns]',
+    )
+
+
+def _naive_dates(dates):
+    """Datums als tz-naive datetime Series (UTC tijden, zoals elders in de app)."""
+    dates = pd.to_datetime(pd.Series(dates), errors='coerce')
+    if dates.dt.tz is not None:
+        dates = dates.dt.tz_convert(None)
+    return dates
+
+
+def season_ids(dates):
+    """
+    Seizoen per datum in één `np.searchsorted` over de seizoensgrenzen: het jaar van de
+    eerstvolgende Prinsjesdag (die dag telt tot 24:00 mee), dus een wedstrijd in
+    "Seizoen 2024/2025" krijgt 2025. Ontbrekende datums geven <NA>.
+    """
+    dates = _naive_dates(dates)
+    valid = dates.notna().to_numpy()
+    ids = pd.Series(pd.NA, index=dates.index, dtype='Int64')
+    if not valid.any():
+        return ids
+    first_year = dates.min().year
+    boundaries = season_boundaries(first_year, dates.max().year)
+    # Aantal seizoensgrenzen vóór of op de datum = aantal jaren na `first_year`
+    positions = np.searchsorted(boundaries, dates.to_numpy()[valid].astype('datetime64[ns]'), side='right')
+    ids[valid] = first_year + positions
+    return ids
+
+
+def season_column(matches_df):
+    """De `season_id` kolom van een wedstrijdtabel; berekend als de tabel hem (nog) niet heeft."""
+    if 'season_id' in matches_df.columns:
+        return matches_df['season_id']
+    return season_ids(matches_df['datum']).set_axis(matches_df.index)
+
+
+def season_window(year):
+    """Begin en einde (exclusief) van seizoen `year` als UTC tijdstippen: Prinsjesdag 24:00 van het vorige en dit jaar."""
+    start, end = season_boundaries(year - 1, year)
+    return pd.Timestamp(start, tz='UTC'), pd.Timestamp(end, tz='UTC')
+
+
+def season_info(year):
+    """Naam en periode van het seizoen dat eindigt op Prinsjesdag van `year`."""
+    return {
+        'seizoen_naam': f"Seizoen {year - 1}/{year}",
+        'start_datum': get_prinsjesdag(year - 1),
+        'eind_datum': get_prinsjesdag(year),
+        'prinsjesdag': get_prinsjesdag(year),
+        'seizoen_jaar': year,
+    }
+
+
+def generate_prinsjesdag_seasons(matches_df, include_current=False):
+    """
+    Genereer automatische seizoenen op basis van Prinsjesdag: één rij per seizoen met
+    wedstrijden, met de statistieken uit één groupby op `season_id`. Met `include_current`
+    staat het lopende seizoen er ook in als er nog niet in gespeeld is.
+    """
+    columns = ['seizoen_naam', 'start_datum', 'eind_datum', 'prinsjesdag', 'seizoen_jaar',
+               'aantal_wedstrijden', 'total_goals', 'gemiddelde_goals', 'unieke_spelers']
+    if matches_df.empty:
+        return pd.DataFrame(columns=columns) if include_current else pd.DataFrame()
+
     try:
-        current_year = date.today().year
-        
-        # Bepaal jaar bereik - alleen seizoenen tot huidig jaar
-        if not matches_df.empty:
-            try:
-                # Converteer datum kolom naar datetime en haal timezone info weg
-                match_dates = pd.to_datetime(matches_df['datum']).dt.tz_localize(None)
-                min_year = max(2020, match_dates.min().year - 1)  # Vanaf 2020 of eerste match jaar
-                max_year = min(current_year + 1, match_dates.max().year + 1)  # Tot huidig jaar
-            except Exception as date_error:
-                # Alleen waarschuwen bij daadwerkelijke data problemen
-                if not matches_df.empty:
-                    st.warning(f"Probleem met datum conversie: {date_error}")
-                # Fallback naar huidige datum bereik
-                min_year = 2020
-                max_year = current_year + 1
-        else:
-            # Geen wedstrijden - geen seizoenen tonen
-            return pd.DataFrame()
-        
-        for year in range(min_year, max_year + 1):
-            try:
-                # Skip jaar 1900 of andere ongeldige jaren, en toekomstige jaren
-                if year < 1900 or year > current_year + 1:
-                    continue
-                    
-                prinsjesdag = get_prinsjesdag(year)
-                prev_prinsjesdag = get_prinsjesdag(year - 1)
-                
-                # Seizoen loopt van vorige Prinsjesdag tot huidige Prinsjesdag 24:00
-                season_start = prev_prinsjesdag
-                season_end = prinsjesdag
-                
-                prinsjesdag_seasons.append({
-                    'seizoen_naam': f"Seizoen {year - 1}/{year}",
-                    'start_datum': season_start,
-                    'eind_datum': season_end,
-                    'prinsjesdag': prinsjesdag,
-                    'seizoen_jaar': year
-                })
-            except Exception as season_error:
-                # Skip dit seizoen bij problemen
-                continue
-        
-        seasons_df = pd.DataFrame(prinsjesdag_seasons)
-        
-        if not seasons_df.empty and not matches_df.empty:
-            # Voeg statistieken toe per seizoen
-            seasons_with_stats = []
-            
-            for _, season in seasons_df.iterrows():
-                try:
-                    # Filter wedstrijden voor dit seizoen
-                    match_dates_tz_naive = pd.to_datetime(matches_df['datum']).dt.tz_localize(None)
-                    season_start_tz_naive = pd.to_datetime(season['start_datum']).tz_localize(None) if pd.api.types.is_datetime64_any_dtype(pd.to_datetime(season['start_datum'])) else pd.to_datetime(season['start_datum'])
-                    season_end_tz_naive = pd.to_datetime(season['eind_datum']).tz_localize(None) if pd.api.types.is_datetime64_any_dtype(pd.to_datetime(season['eind_datum'])) else pd.to_datetime(season['eind_datum'])
-                    
-                    season_matches = matches_df[
-                        (match_dates_tz_naive >= season_start_tz_naive) & 
-                        (match_dates_tz_naive <= season_end_tz_naive)
-                    ]
-                    
-                    # Skip seizoenen zonder wedstrijden of in de toekomst
-                    if len(season_matches) == 0:
-                        continue
-                    
-                    # Skip seizoenen die volledig in de toekomst liggen
-                    if season_start_tz_naive.date() > date.today():
-                        continue
-                    
-                    # Bereken statistieken
-                    total_goals = season_matches['thuis_score'].sum() + season_matches['uit_score'].sum()
-                    avg_goals = total_goals / len(season_matches) if len(season_matches) > 0 else 0
-                    
-                    # Unieke spelers
-                    unique_players = set()
-                    for _, match in season_matches.iterrows():
-                        unique_players.update([
-                            match['thuis_speler_1'], match['thuis_speler_2'],
-                            match['uit_speler_1'], match['uit_speler_2']
-                        ])
-                    
-                    seasons_with_stats.append({
-                        'seizoen_naam': season['seizoen_naam'],
-                        'start_datum': season['start_datum'],
-                        'eind_datum': season['eind_datum'],
-                        'prinsjesdag': season['prinsjesdag'],
-                        'seizoen_jaar': season['seizoen_jaar'],
-                        'aantal_wedstrijden': len(season_matches),
-                        'total_goals': total_goals,
-                        'gemiddelde_goals': round(avg_goals, 1),
-                        'unieke_spelers': len(unique_players)
-                    })
-                    
-                except Exception as stats_error:
-                    # Skip dit seizoen bij stats problemen
-                    continue
-            
-            return pd.DataFrame(seasons_with_stats)
-        
-        return seasons_df
-        
+        ids = season_column(matches_df)
+        goals = (pd.to_numeric(matches_df['thuis_score'], errors='coerce').fillna(0)
+                 + pd.to_numeric(matches_df['uit_score'], errors='coerce').fillna(0))
+        per_season = goals.groupby(ids).agg(['size', 'sum'])
+
+        # Unieke spelers per seizoen: alle stoelen onder elkaar, één keer groeperen
+        seats = [col for col in ['thuis_1', 'thuis_2', 'uit_1', 'uit_2'] if col in matches_df.columns]
+        seat_players = pd.DataFrame({
+            'season_id': np.tile(ids.to_numpy(), len(seats)),
+            'speler': np.concatenate([matches_df[seat].to_numpy(dtype=object) for seat in seats]) if seats else [],
+        })
+        unique_players = seat_players.dropna().groupby('season_id')['speler'].nunique()
+
+        current_year = season_ids([pd.Timestamp.now()]).iloc[0]
+        years = [int(year) for year in per_season.index if year <= current_year]
+        if include_current and current_year not in years:
+            years.append(int(current_year))
+
+        seasons = []
+        for year in sorted(years):
+            matches = int(per_season['size'].get(year, 0))
+            total_goals = int(per_season['sum'].get(year, 0))
+            seasons.append({
+                **season_info(year),
+                'aantal_wedstrijden': matches,
+                'total_goals': total_goals,
+                'gemiddelde_goals': round(total_goals / matches, 1) if matches else 0,
+                'unieke_spelers': int(unique_players.get(year, 0)),
+            })
+        return pd.DataFrame(seasons, columns=columns).set_index('seizoen_jaar', drop=False)
+
     except Exception as e:
         st.error(f"Probleem bij het genereren van Prinsjesdag seizoenen: {e}")
         return pd.DataFrame()
 
 
 def get_season_matches(matches_df, season_info):
-    """Filter wedstrijden voor een specifiek seizoen"""
-    try:
-        # Converteer alle datums naar timezone-naive voor vergelijking
-        match_dates = pd.to_datetime(matches_df['datum']).dt.tz_localize(None)
-        season_start = pd.to_datetime(season_info['start_datum']).tz_localize(None) if pd.api.types.is_datetime64_any_dtype(pd.to_datetime(season_info['start_datum'])) else pd.to_datetime(season_info['start_datum'])
-        season_end = pd.to_datetime(season_info['eind_datum']).tz_localize(None) if pd.api.types.is_datetime64_any_dtype(pd.to_datetime(season_info['eind_datum'])) else pd.to_datetime(season_info['eind_datum'])
-        
-        # Filter wedstrijden binnen seizoen periode
-        season_mask = (match_dates >= season_start) & (match_dates <= season_end)
-        season_matches = matches_df[season_mask].copy()
-        
-        return season_matches
-        
-    except Exception as e:
-        st.error(f"Fout bij filteren seizoen wedstrijden: {e}")
+    """Filter wedstrijden voor een specifiek seizoen via de `season_id` kolom"""
+    if matches_df.empty:
         return pd.DataFrame()
+    return matches_df[season_column(matches_df) == season_info['seizoen_jaar']].copy()
 
 
-def calculate_season_stats(season_matches):
-    """Bereken uitgebreide statistieken voor een seizoen"""
-    if season_matches.empty:
+def calculate_season_stats(season_participations):
+    """Bereken uitgebreide statistieken voor een seizoen uit de deelnametabel (zie participations.py)"""
+    if season_participations.empty:
         return {}
     
     stats = {}
     
     try:
+        # Eén rij per wedstrijd voor de wedstrijdtotalen
+        season_matches = season_participations.drop_duplicates('match_id')
+        home = season_matches['kant'] == 'thuis'
+        thuis_score = season_matches['voor'].where(home, season_matches['tegen'])
+        uit_score = season_matches['tegen'].where(home, season_matches['voor'])
+        match_goals = thuis_score + uit_score
+        
         # Basis statistieken
         stats['total_matches'] = len(season_matches)
-        stats['total_goals'] = season_matches['thuis_score'].sum() + season_matches['uit_score'].sum()
+        stats['total_goals'] = int(match_goals.sum())
         stats['avg_goals_per_match'] = stats['total_goals'] / stats['total_matches'] if stats['total_matches'] > 0 else 0
         
-        # Speler statistieken
-        all_players = set()
-        player_matches = {}
-        player_goals = {}
-        player_wins = {}
-        
-        for _, match in season_matches.iterrows():
-            home_players = [match['thuis_speler_1'], match['thuis_speler_2']]
-            away_players = [match['uit_speler_1'], match['uit_speler_2']]
-            
-            # Track alle spelers
-            all_players.update(home_players + away_players)
-            
-            # Track matches per speler
-            for player in home_players + away_players:
-                player_matches[player] = player_matches.get(player, 0) + 1
-                player_goals[player] = player_goals.get(player, 0)
-            
-            # Track goals per speler
-            for player in home_players:
-                player_goals[player] += match['thuis_score']
-                player_wins[player] = player_wins.get(player, 0)
-                if match['thuis_score'] > match['uit_score']:
-                    player_wins[player] += 1
-            
-            for player in away_players:
-                player_goals[player] += match['uit_score'] 
-                player_wins[player] = player_wins.get(player, 0)
-                if match['uit_score'] > match['thuis_score']:
-                    player_wins[player] += 1
-        
-        stats['unique_players'] = len(all_players)
-        stats['most_active_player'] = max(player_matches.items(), key=lambda x: x[1]) if player_matches else ("N/A", 0)
-        stats['top_scorer'] = max(player_goals.items(), key=lambda x: x[1]) if player_goals else ("N/A", 0)
-        stats['most_wins'] = max(player_wins.items(), key=lambda x: x[1]) if player_wins else ("N/A", 0)
+        # Speler statistieken in één groupby
+        per_player = season_participations.groupby('speler').agg(
+            matches=('voor', 'size'), goals=('voor', 'sum'), wins=('gewonnen', 'sum')
+        )
+        stats['unique_players'] = len(per_player)
+        stats['most_active_player'] = (per_player['matches'].idxmax(), int(per_player['matches'].max()))
+        stats['top_scorer'] = (per_player['goals'].idxmax(), int(per_player['goals'].max()))
+        stats['most_wins'] = (per_player['wins'].idxmax(), int(per_player['wins'].max()))
         
         # Datum statistieken
         stats['first_match'] = season_matches['datum'].min()
         stats['last_match'] = season_matches['datum'].max()
         
         # Hoogste uitslag
-        max_total_goals_idx = (season_matches['thuis_score'] + season_matches['uit_score']).idxmax()
-        highest_scoring_match = season_matches.loc[max_total_goals_idx]
+        highest = match_goals.idxmax()
         stats['highest_scoring_match'] = {
-            'thuis_score': highest_scoring_match['thuis_score'],
-            'uit_score': highest_scoring_match['uit_score'],
-            'total': highest_scoring_match['thuis_score'] + highest_scoring_match['uit_score']
+            'thuis_score': int(thuis_score[highest]),
+            'uit_score': int(uit_score[highest]),
+            'total': int(match_goals[highest])
         }
         
     except Exception as e:
@@ -254,32 +220,21 @@ def get_current_season(seasons_df):
     return None
 
 
-def create_season_options(seasons_df, matches_df):
-    """Maak seizoen opties voor selectbox met match counts"""
+def create_season_options(seasons_df, matches_df=None):
+    """Maak seizoen opties voor selectbox met match counts (uit de seizoenstabel, zonder filteren)"""
     season_options = []
     current_date = date.today()
     current_season_id = None
     
     for idx, season in seasons_df.iterrows():
-        try:
-            start_date = pd.to_datetime(season['start_datum']).date()
-            end_date = pd.to_datetime(season['eind_datum']).date()
-            
-            # Check of er wedstrijden zijn in dit seizoen
-            season_matches = get_season_matches(matches_df, season)
+        match_count = int(season.get('aantal_wedstrijden', 0))
+        # Alleen toevoegen als er wedstrijden zijn
+        if match_count > 0:
+            season_options.append((f"{season['seizoen_naam']} ({match_count} wedstrijden)", idx))
             
-            # Alleen toevoegen als er wedstrijden zijn
-            if len(season_matches) > 0:
-                season_name = season.get('seizoen_naam', f"{start_date.strftime('%Y-%m-%d')} tot {end_date.strftime('%Y-%m-%d')}")
-                match_count = len(season_matches)
-                season_options.append((f"{season_name} ({match_count} wedstrijden)", idx))
-                
-                # Check of dit het huidige seizoen is
-                if start_date <= current_date <= end_date:
-                    current_season_id = len(season_options) - 1
-                    
-        except Exception:
-            continue  # Skip seizoenen met problemen
+            # Check of dit het huidige seizoen is
+            if season['start_datum'] <= current_date <= season['eind_datum']:
+                current_season_id = len(season_options) - 1
     
     # Voeg "Alle seizoenen" optie toe
     if season_options:
@@ -290,38 +245,15 @@ def create_season_options(seasons_df, matches_df):
     return season_options, current_season_id
 
 
-def process_all_seasons_metrics(seasons_df, matches_df):
-    """Verwerk metrics voor alle seizoenen"""
-    season_metrics = []
-    
-    for idx, season in seasons_df.iterrows():
-        try:
-            season_matches = get_season_matches(matches_df, season)
-            
-            if len(season_matches) == 0:
-                continue  # Skip seizoenen zonder wedstrijden
-                
-            # Bereken metrics
-            total_goals = season_matches['thuis_score'].sum() + season_matches['uit_score'].sum()
-            avg_goals = total_goals / len(season_matches) if len(season_matches) > 0 else 0
-            
-            # Unieke spelers
-            unique_players = set()
-            for _, match in season_matches.iterrows():
-                unique_players.update([
-                    match['thuis_speler_1'], match['thuis_speler_2'],
-                    match['uit_speler_1'], match['uit_speler_2']
-                ])
-            
-            season_metrics.append({
-                'Seizoen': season.get('seizoen_naam', f"Seizoen {idx+1}"),
-                'Aantal Wedstrijden': len(season_matches),
-                'Aantal Spelers': len(unique_players),
-                'Totaal Goals': total_goals,
-                'Gem. Goals per Wedstrijd': round(avg_goals, 1)
-            })
-            
-        except Exception:
-            continue  # Skip seizoenen met problemen
-    
-    return pd.DataFrame(season_metrics)
\ No newline at end of file
+def process_all_seasons_metrics(seasons_df, matches_df=None):
+    """Verwerk metrics voor alle seizoenen (de seizoenstabel heeft ze al per seizoen)"""
+    if seasons_df.empty:
+        return pd.DataFrame()
+    played = seasons_df[seasons_df['aantal_wedstrijden'] > 0]
+    return pd.DataFrame({
+        'Seizoen': played['seizoen_naam'],
+        'Aantal Wedstrijden': played['aantal_wedstrijden'],
+        'Aantal Spelers': played['unieke_spelers'],
+        'Totaal Goals': played['total_goals'],
+        'Gem. Goals per Wedstrijd': played['gemiddelde_goals'],
+    }).reset_index(drop=True)
@@ -0,0 +1,579 @@
+# sqlite_backend.py
+"""
+SQLite implementatie van de opslag-interface (zie storage.py).
+
+Bedoeld voor een competitie op één machine en voor lokaal draaien/benchmarken zonder
+cloud credentials. Elke collectie is een tabel met indexen op de velden waarop de app
+sorteert en filtert. Timestamps worden als ISO-tekst in UTC opgeslagen zodat sorteren
+op tekst gelijk is aan sorteren op tijd.
+"""
+import json
+import sqlite3
+import threading
+import uuid
+from datetime import date, datetime, timezone
+
+import pandas as pd
+
+from storage import (
+    COLLECTIONS, ELO_CHECKPOINTS, MATCH_TOMBSTONES, SEAT_NR_FIELDS, StorageBackend, elo_entry_id, seat_numbers,
+    seat_numbers_missing,
+)
+
+MATCH_COLUMNS = [
+    'thuis_1', 'thuis_2', 'uit_1', 'uit_2',
+    'thuis_score', 'uit_score',
+    'klinkers_thuis_1', 'klinkers_thuis_2', 'klinkers_uit_1', 'klinkers_uit_2',
+    'timestamp',
+    'thuis_1_nr', 'thuis_2_nr', 'uit_1_nr', 'uit_2_nr',
+]
+# Kolommen met een timestamp als ISO tekst
+TIMESTAMP_COLUMNS = ('timestamp', 'updated_at', 'bijgewerkt')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS spelers (
+    id TEXT PRIMARY KEY,
+    speler_naam TEXT NOT NULL UNIQUE,
+    rating REAL,
+    gespeeld INTEGER,
+    bijgewerkt TEXT,
+    speler_nr INTEGER
+);
+CREATE TABLE IF NOT EXISTS uitslag (
+    id TEXT PRIMARY KEY,
+    thuis_1 TEXT, thuis_2 TEXT, uit_1 TEXT, uit_2 TEXT,
+    thuis_score INTEGER, uit_score INTEGER,
+    klinkers_thuis_1 INTEGER, klinkers_thuis_2 INTEGER,
+    klinkers_uit_1 INTEGER, klinkers_uit_2 INTEGER,
+    timestamp TEXT NOT NULL,
+    updated_at TEXT,
+    thuis_1_nr INTEGER, thuis_2_nr INTEGER, uit_1_nr INTEGER, uit_2_nr INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_uitslag_timestamp ON uitslag (timestamp, id);
+CREATE TABLE IF NOT EXISTS uitslag_verwijderd (
+    id TEXT PRIMARY KEY,
+    deleted_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_uitslag_verwijderd_deleted_at ON uitslag_verwijderd (deleted_at);
+CREATE TABLE IF NOT EXISTS elo (
+    id TEXT PRIMARY KEY,
+    speler_naam TEXT NOT NULL,
+    rating REAL NOT NULL,
+    timestamp TEXT NOT NULL,
+    match_id TEXT,
+    speler_nr INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_elo_timestamp ON elo (timestamp);
+CREATE INDEX IF NOT EXISTS idx_elo_speler_timestamp ON elo (speler_naam, timestamp);
+CREATE TABLE IF NOT EXISTS elo_checkpoints (
+    id TEXT PRIMARY KEY,
+    cursor TEXT NOT NULL,
+    wedstrijden INTEGER NOT NULL,
+    ratings TEXT NOT NULL,
+    gespeeld TEXT NOT NULL,
+    bijgewerkt TEXT NOT NULL,
+    nummers TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_elo_checkpoints_cursor ON elo_checkpoints (cursor);
+CREATE TABLE IF NOT EXISTS requests (
+    id TEXT PRIMARY KEY,
+    Verzoek TEXT,
+    Timestamp TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_requests_timestamp ON requests (Timestamp);
+"""
+
+
+def _new_id():
+    """Document-ID in dezelfde vorm als Firestore (20 tekens)."""
+    return uuid.uuid4().hex[:20]
+
+
+def to_db_timestamp(value):
+    """Converteer een timestamp naar sorteerbare ISO-tekst in UTC. None = nu."""
+    if value is None:
+        value = datetime.now(timezone.utc)
+    elif isinstance(value, str):
+        value = pd.to_datetime(value).to_pydatetime()
+    elif hasattr(value, 'to_pydatetime'):
+        value = value.to_pydatetime()
+    elif isinstance(value, date) and not isinstance(value, datetime):
+        value = datetime.combine(value, datetime.min.time())
+
+    # Naive datetimes worden, net als door de Firestore client, als UTC geïnterpreteerd
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%f+00:00')
+
+
+def from_db_timestamp(text):
+    return datetime.fromisoformat(text) if text else None
+
+
+def _optional_timestamp(value):
+    """Zoals to_db_timestamp, maar None blijft leeg (een speler zonder wedstrijden)."""
+    return None if value is None else to_db_timestamp(value)
+
+
+class SQLiteBackend(StorageBackend):
+    """Slaat alle collecties op in één SQLite bestand (of ':memory:')."""
+
+    name = "sqlite"
+
+    def __init__(self, path):
+        self.path = path
+        # Streamlit draait sessies in verschillende threads; één connectie met een lock is genoeg
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.RLock()
+        with self._lock:
+            if path != ':memory:':
+                self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.executescript(SCHEMA)
+            self._migrate_schema()
+
+    def _migrate_schema(self):
+        """Voegt kolommen toe die later aan het schema zijn toegevoegd (bestaande .db bestanden)."""
+        columns = {row['name'] for row in self._conn.execute("PRAGMA table_info(uitslag)")}
+        if 'updated_at' not in columns:
+            self._conn.execute("ALTER TABLE uitslag ADD COLUMN updated_at TEXT")
+        player_columns = {row['name'] for row in self._conn.execute("PRAGMA table_info(spelers)")}
+        for column, column_type in (('rating', 'REAL'), ('gespeeld', 'INTEGER'), ('bijgewerkt', 'TEXT')):
+            if column not in player_columns:
+                self._conn.execute(f"ALTER TABLE spelers ADD COLUMN {column} {column_type}")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_uitslag_updated_at ON uitslag (updated_at)")
+        elo_columns = {row['name'] for row in self._conn.execute("PRAGMA table_info(elo)")}
+        if 'match_id' not in elo_columns:
+            self._conn.execute("ALTER TABLE elo ADD COLUMN match_id TEXT")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_elo_match_id ON elo (match_id)")
+        # Vaste spelernummers (zie player_ids.py)
+        if 'speler_nr' not in player_columns:
+            self._conn.execute("ALTER TABLE spelers ADD COLUMN speler_nr INTEGER")
+        for column in SEAT_NR_FIELDS.values():
+            if column not in columns:
+                self._conn.execute(f"ALTER TABLE uitslag ADD COLUMN {column} INTEGER")
+        if 'speler_nr' not in elo_columns:
+            self._conn.execute("ALTER TABLE elo ADD COLUMN speler_nr INTEGER")
+        checkpoint_columns = {row['name'] for row in self._conn.execute(f"PRAGMA table_info({ELO_CHECKPOINTS})")}
+        if 'nummers' not in checkpoint_columns:
+            self._conn.execute(f"ALTER TABLE {ELO_CHECKPOINTS} ADD COLUMN nummers TEXT")
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(sql, params).fetchall()]
+
+    def _columns(self, table, fields):
+        """SQL kolomlijst voor een projectie (zie StorageBackend): `*`, of `id` plus de gevraagde kolommen die bestaan."""
+        if fields is None:
+            return "*"
+        known = {row['name'] for row in self._query(f"PRAGMA table_info({table})")}
+        return ', '.join(['id'] + [field for field in dict.fromkeys(fields) if field in known and field != 'id'])
+
+    @staticmethod
+    def _projected_from_row(row):
+        """Een geprojecteerde rij als dict; lege kolommen vallen weg, zoals ontbrekende velden in Firestore."""
+        return {
+            k: from_db_timestamp(v) if k in TIMESTAMP_COLUMNS else v
+            for k, v in row.items() if k != 'id' and v is not None
+        }
+
+    @staticmethod
+    def _match_row(match_id, match_data):
+        row = {col: match_data.get(col) for col in MATCH_COLUMNS}
+        row['timestamp'] = to_db_timestamp(row['timestamp'])
+        row['updated_at'] = to_db_timestamp(None)
+        row['id'] = match_id
+        return row
+
+    @staticmethod
+    def _match_from_row(row):
+        match_data = {k: v for k, v in row.items() if k != 'id' and v is not None}
+        match_data['timestamp'] = from_db_timestamp(row['timestamp'])
+        if row.get('updated_at'):
+            match_data['updated_at'] = from_db_timestamp(row['updated_at'])
+        return match_data
+
+    @staticmethod
+    def _elo_from_row(row):
+        entry = {
+            'speler_naam': row['speler_naam'],
+            'rating': row['rating'],
+            'timestamp': from_db_timestamp(row['timestamp']),
+        }
+        if row.get('match_id'):
+            entry['match_id'] = row['match_id']
+        if row.get('speler_nr') is not None:
+            entry['speler_nr'] = row['speler_nr']
+        return entry
+
+    def _insert_matches(self, rows):
+        columns = ['id'] + MATCH_COLUMNS + ['updated_at']
+        placeholders = ', '.join(f':{col}' for col in columns)
+        self._conn.executemany(
+            f"INSERT INTO uitslag ({', '.join(columns)}) VALUES ({placeholders})", rows
+        )
+
+    def _insert_elo(self, entries):
+        # Regels van een wedstrijd hebben een vaste sleutel, dus een replay vervangt ze
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO elo (id, speler_naam, rating, timestamp, match_id, speler_nr) VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    elo_entry_id(e['match_id'], e['speler_naam']) if e.get('match_id') else _new_id(),
+                    e['speler_naam'], e['rating'], to_db_timestamp(e.get('timestamp')), e.get('match_id'),
+                    e.get('speler_nr'),
+                )
+                for e in entries
+            ],
+        )
+
+    # ---------- Lezen ----------
+    @staticmethod
+    def _player_from_row(row):
+        player = {'speler_naam': row['speler_naam']}
+        if row['speler_nr'] is not None:
+            player['speler_nr'] = row['speler_nr']
+        if row['rating'] is not None:
+            player['rating'] = row['rating']
+            player['gespeeld'] = row['gespeeld'] or 0
+            player['bijgewerkt'] = from_db_timestamp(row['bijgewerkt'])
+        return player
+
+    def list_players(self, fields=None):
+        from_row = self._player_from_row if fields is None else self._projected_from_row
+        return [
+            {**from_row(row), 'speler_id': row['id']}
+            for row in self._query(f"SELECT {self._columns('spelers', fields)} FROM spelers")
+        ]
+
+    def player_exists(self, name):
+        return bool(self._query("SELECT 1 FROM spelers WHERE speler_naam = ? LIMIT 1", (name,)))
+
+    def list_matches(self, descending=True, limit=None, fields=None):
+        direction = 'DESC' if descending else 'ASC'
+        sql = f"SELECT {self._columns('uitslag', fields)} FROM uitslag ORDER BY timestamp {direction}, id {direction}"
+        params = ()
+        if limit is not None:
+            sql += " LIMIT ?"
+            params = (int(limit),)
+        from_row = self._match_from_row if fields is None else self._projected_from_row
+        matches = []
+        for row in self._query(sql, params):
+            match_data = from_row(row)
+            match_data['match_id'] = row['id']
+            matches.append(match_data)
+        return matches
+
+    def list_match_changes(self, since, fields=None):
+        since_text = to_db_timestamp(since)
+        from_row = self._match_from_row if fields is None else self._projected_from_row
+        matches = []
+        sql = f"SELECT {self._columns('uitslag', fields)} FROM uitslag WHERE updated_at >= ?"
+        for row in self._query(sql, (since_text,)):
+            match_data = from_row(row)
+            match_data['match_id'] = row['id']
+            matches.append(match_data)
+        deleted = [
+            {'match_id': row['id'], 'deleted_at': from_db_timestamp(row['deleted_at'])}
+            for row in self._query(f"SELECT id, deleted_at FROM {MATCH_TOMBSTONES} WHERE deleted_at >= ?", (since_text,))
+        ]
+        return matches, deleted
+
+    def list_matches_after(self, timestamp, fields=None):
+        from_row = self._match_from_row if fields is None else self._projected_from_row
+        matches = []
+        for row in self._query(
+            f"SELECT {self._columns('uitslag', fields)} FROM uitslag WHERE timestamp > ? ORDER BY timestamp, id",
+            (to_db_timestamp(timestamp),),
+        ):
+            match_data = from_row(row)
+            match_data['match_id'] = row['id']
+            matches.append(match_data)
+        return matches
+
+    def get_match(self, match_id):
+        rows = self._query("SELECT * FROM uitslag WHERE id = ?", (match_id,))
+        return self._match_from_row(rows[0]) if rows else None
+
+    def list_elo_logs(self, speler_naam=None, descending=True, since=None, fields=None):
+        direction = 'DESC' if descending else 'ASC'
+        conditions, params = [], []
+        if speler_naam is not None:
+            conditions.append("speler_naam = ?")
+            params.append(speler_naam)
+        if since is not None:
+            conditions.append("timestamp >= ?")
+            params.append(to_db_timestamp(since))
+        where = f"WHERE {' AND '.join(conditions)} " if conditions else ""
+        # Gelijke timestamps op ID, in dezelfde richting: dezelfde volgorde als Firestore (document-ID)
+        rows = self._query(
+            f"SELECT {self._columns('elo', fields)} FROM elo {where}ORDER BY timestamp {direction}, id {direction}", params
+        )
+        from_row = self._elo_from_row if fields is None else self._projected_from_row
+        return [from_row(row) for row in rows]
+
+    def _page(self, table, speler_condition, speler_nr, since, before, limit, start_after):
+        """Rijen van één pagina (timestamp, id; nieuwste eerst) plus de cursor voor de volgende."""
+        conditions, params = [], []
+        if speler_nr is not None:
+            conditions.append(speler_condition)
+            params.append(speler_nr)
+        if since is not None:
+            conditions.append("timestamp >= ?")
+            params.append(to_db_timestamp(since))
+        if before is not None:
+            conditions.append("timestamp < ?")
+            params.append(to_db_timestamp(before))
+        if start_after is not None:
+            timestamp, row_id = start_after
+            conditions.append("(timestamp < ? OR (timestamp = ? AND id < ?))")
+            params += [to_db_timestamp(timestamp), to_db_timestamp(timestamp), row_id]
+        where = f"WHERE {' AND '.join(conditions)} " if conditions else ""
+        # Eén rij extra om te weten of er een volgende pagina is
+        sql = f"SELECT * FROM {table} {where}ORDER BY timestamp DESC, id DESC LIMIT ?"
+        rows = self._query(sql, [*params, limit + 1])
+        last = rows[limit - 1] if len(rows) > limit else None
+        cursor = (from_db_timestamp(last['timestamp']), last['id']) if last else None
+        return rows[:limit], cursor
+
+    def page_matches(self, speler_nr=None, since=None, before=None, limit=50, start_after=None):
+        seats = ', '.join(SEAT_NR_FIELDS.values())
+        rows, cursor = self._page("uitslag", f"? IN ({seats})", speler_nr, since, before, limit, start_after)
+        return [{**self._match_from_row(row), 'match_id': row['id']} for row in rows], cursor
+
+    def page_elo_logs(self, speler_nr=None, since=None, before=None, limit=50, start_after=None):
+        rows, cursor = self._page("elo", "speler_nr = ?", speler_nr, since, before, limit, start_after)
+        return [self._elo_from_row(row) for row in rows], cursor
+
+    def list_requests(self):
+        return [
+            {'Verzoek': row['Verzoek'], 'Timestamp': from_db_timestamp(row['Timestamp'])}
+            for row in self._query("SELECT Verzoek, Timestamp FROM requests ORDER BY Timestamp DESC")
+        ]
+
+    def get_elo_checkpoint_before(self, timestamp):
+        rows = self._query(
+            f"SELECT * FROM {ELO_CHECKPOINTS} WHERE cursor < ? ORDER BY cursor DESC LIMIT 1",
+            (to_db_timestamp(timestamp),),
+        )
+        if not rows:
+            return None
+        row = rows[0]
+        # De spelerkaarten staan als JSON in één rij, net als de map-velden in Firestore
+        return {
+            'cursor': from_db_timestamp(row['cursor']),
+            'wedstrijden': row['wedstrijden'],
+            'ratings': json.loads(row['ratings']),
+            'gespeeld': json.loads(row['gespeeld']),
+            'bijgewerkt': {name: from_db_timestamp(text) for name, text in json.loads(row['bijgewerkt']).items()},
+            'nummers': json.loads(row['nummers'] or '{}'),
+        }
+
+    def aggregate(self, collection_name, sums=(), avgs=(), since=None, before=None):
+        if collection_name not in COLLECTIONS:
+            raise ValueError(f"Onbekende collectie: {collection_name}")
+        columns = {row['name'] for row in self._query(f"PRAGMA table_info({collection_name})")}
+        unknown = (set(sums) | set(avgs)) - columns
+        if unknown:
+            raise ValueError(f"Onbekende velden voor {collection_name}: {', '.join(sorted(unknown))}")
+
+        # Zelfde betekenis als Firestore: lege som is 0, leeg gemiddelde is NULL (None)
+        selects = ["COUNT(*) AS count"]
+        selects += [f"COALESCE(SUM({field}), 0) AS sum_{field}" for field in sums]
+        selects += [f"AVG({field}) AS avg_{field}" for field in avgs]
+        conditions, params = [], []
+        if since is not None:
+            conditions.append("timestamp >= ?")
+            params.append(to_db_timestamp(since))
+        if before is not None:
+            conditions.append("timestamp < ?")
+            params.append(to_db_timestamp(before))
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        return self._query(f"SELECT {', '.join(selects)} FROM {collection_name}{where}", params)[0]
+
+    def sample_collection(self, collection_name, limit):
+        if collection_name == 'spelers':
+            return [self._player_from_row(row) for row in self._query("SELECT * FROM spelers LIMIT ?", (limit,))]
+        if collection_name == 'uitslag':
+            return [self._match_from_row(row) for row in self._query("SELECT * FROM uitslag LIMIT ?", (limit,))]
+        if collection_name == 'elo':
+            return [self._elo_from_row(row) for row in self._query("SELECT * FROM elo LIMIT ?", (limit,))]
+        if collection_name == 'requests':
+            return [
+                {'Verzoek': row['Verzoek'], 'Timestamp': from_db_timestamp(row['Timestamp'])}
+                for row in self._query("SELECT * FROM requests LIMIT ?", (limit,))
+            ]
+        return []
+
+    # ---------- Schrijven ----------
+    def add_player(self, name, start_elo):
+        player_id = _new_id()
+        with self._lock, self._conn:
+            speler_nr = self._conn.execute("SELECT COALESCE(MAX(speler_nr), 0) + 1 FROM spelers").fetchone()[0]
+            self._conn.execute(
+                "INSERT INTO spelers (id, speler_naam, rating, gespeeld, bijgewerkt, speler_nr) VALUES (?, ?, ?, 0, ?, ?)",
+                (player_id, name, start_elo, to_db_timestamp(None), speler_nr),
+            )
+            self._insert_elo([{'speler_naam': name, 'rating': start_elo, 'timestamp': None, 'speler_nr': speler_nr}])
+        return player_id
+
+    def add_request(self, request_text):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO requests (id, Verzoek, Timestamp) VALUES (?, ?, ?)",
+                (_new_id(), request_text, to_db_timestamp(None)),
+            )
+
+    def add_match_with_elo(self, match_data, elo_updates):
+        match_id = _new_id()
+        with self._lock, self._conn:
+            self._insert_matches([self._match_row(match_id, match_data)])
+            numbers = seat_numbers(match_data)
+            self._insert_elo([
+                {'speler_naam': speler_naam, 'rating': new_elo, 'timestamp': None, 'match_id': match_id,
+                 'speler_nr': numbers.get(speler_naam)}
+                for speler_naam, new_elo in elo_updates
+            ])
+            now = to_db_timestamp(None)
+            self._update_players(
+                "rating = ?, gespeeld = COALESCE(gespeeld, 0) + 1, bijgewerkt = ?",
+                [((new_elo, now), speler_naam, numbers.get(speler_naam)) for speler_naam, new_elo in elo_updates],
+            )
+        return match_id
+
+    def add_matches(self, matches, progress=None):
+        with self._lock, self._conn:
+            self._insert_matches([self._match_row(_new_id(), match) for match in matches])
+        # Eén transactie, dus één voortgangsstap
+        if progress is not None:
+            progress(len(matches), len(matches))
+
+    def update_match(self, match_id, updated_match_data):
+        columns = [col for col in MATCH_COLUMNS if col in updated_match_data]
+        values = [
+            to_db_timestamp(updated_match_data[col]) if col == 'timestamp' else updated_match_data[col]
+            for col in columns
+        ]
+        columns.append('updated_at')
+        values.append(to_db_timestamp(None))
+        assignments = ', '.join(f"{col} = ?" for col in columns)
+        with self._lock, self._conn:
+            cursor = self._conn.execute(f"UPDATE uitslag SET {assignments} WHERE id = ?", (*values, match_id))
+            if cursor.rowcount == 0:
+                # Zelfde gedrag als Firestore .update() op een ontbrekend document
+                raise KeyError(f"Wedstrijd {match_id} bestaat niet")
+
+    def delete_match(self, match_id, delete_elo=True):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM uitslag WHERE id = ?", (match_id,))
+            if delete_elo:
+                self._conn.execute("DELETE FROM elo WHERE match_id = ?", (match_id,))
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {MATCH_TOMBSTONES} (id, deleted_at) VALUES (?, ?)",
+                (match_id, to_db_timestamp(None)),
+            )
+
+    def delete_player(self, player_id):
+        with self._lock, self._conn:
+            rows = self._conn.execute("SELECT speler_naam, speler_nr FROM spelers WHERE id = ?", (player_id,)).fetchall()
+            if not rows:
+                return
+            self._conn.execute("DELETE FROM spelers WHERE id = ?", (player_id,))
+            # Op nummer, zodat regels onder een oude naam meegaan; regels zonder nummer op naam
+            self._conn.execute(
+                "DELETE FROM elo WHERE speler_nr = ? OR (speler_nr IS NULL AND speler_naam = ?)",
+                (rows[0]['speler_nr'], rows[0]['speler_naam']),
+            )
+
+    def _update_players(self, assignments, updates):
+        """Werkt spelers bij op `speler_nr`, of op naam als er geen nummer is.
+        `updates` is een lijst (waarden, speler_naam, speler_nr)."""
+        self._conn.executemany(
+            f"UPDATE spelers SET {assignments} WHERE speler_nr = ?",
+            [(*values, speler_nr) for values, _, speler_nr in updates if speler_nr is not None],
+        )
+        self._conn.executemany(
+            f"UPDATE spelers SET {assignments} WHERE speler_naam = ?",
+            [(*values, speler_naam) for values, speler_naam, speler_nr in updates if speler_nr is None],
+        )
+
+    def add_elo_entries(self, entries, player_stats=None, progress=None):
+        with self._lock, self._conn:
+            self._insert_elo(entries)
+            if player_stats:
+                self._update_players("rating = ?, gespeeld = ?, bijgewerkt = ?", [
+                    (
+                        (stats['rating'], stats['gespeeld'], _optional_timestamp(stats.get('bijgewerkt'))),
+                        speler_naam, stats.get('speler_nr'),
+                    )
+                    for speler_naam, stats in player_stats.items()
+                ])
+        if progress is not None:
+            progress(len(entries), len(entries))
+
+    def backfill_player_numbers(self, numbers, progress=None):
+        pairs = [(nr, name) for name, nr in numbers.items()]
+        updated = 0
+        with self._lock, self._conn:
+            updated += self._conn.executemany(
+                "UPDATE spelers SET speler_nr = ? WHERE speler_naam = ? AND speler_nr IS NULL", pairs
+            ).rowcount
+            fields = list(SEAT_NR_FIELDS.values())
+            now = to_db_timestamp(None)
+            match_rows = []
+            for row in self._conn.execute(f"SELECT id, {', '.join(SEAT_NR_FIELDS)}, {', '.join(fields)} FROM uitslag"):
+                missing = seat_numbers_missing(dict(row), numbers)
+                if missing:
+                    match_rows.append([missing.get(field) for field in fields] + [now, row['id']])
+            assignments = ', '.join(f"{field} = COALESCE({field}, ?)" for field in fields)
+            # updated_at laat de incrementele sync in draaiende apps de wijziging oppikken
+            self._conn.executemany(
+                f"UPDATE uitslag SET {assignments}, updated_at = ? WHERE id = ?", match_rows
+            )
+            updated += len(match_rows)
+            updated += self._conn.executemany(
+                "UPDATE elo SET speler_nr = ? WHERE speler_naam = ? AND speler_nr IS NULL", pairs
+            ).rowcount
+        if progress is not None:
+            progress(updated, updated)
+        return updated
+
+    def delete_elo_entries(self, keys):
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "DELETE FROM elo WHERE id = ?", [(elo_entry_id(match_id, speler_naam),) for match_id, speler_naam in keys]
+            )
+
+    def add_elo_checkpoints(self, checkpoints):
+        with self._lock, self._conn:
+            self._conn.executemany(
+                f"INSERT INTO {ELO_CHECKPOINTS} (id, cursor, wedstrijden, ratings, gespeeld, bijgewerkt, nummers) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        _new_id(), to_db_timestamp(c['cursor']), c['wedstrijden'],
+                        json.dumps(c['ratings']), json.dumps(c['gespeeld']),
+                        json.dumps({name: to_db_timestamp(ts) for name, ts in c['bijgewerkt'].items()}),
+                        json.dumps(c.get('nummers', {})),
+                    )
+                    for c in checkpoints
+                ],
+            )
+
+    def delete_elo_checkpoints(self, since=None):
+        with self._lock, self._conn:
+            if since is None:
+                self._conn.execute(f"DELETE FROM {ELO_CHECKPOINTS}")
+            else:
+                self._conn.execute(f"DELETE FROM {ELO_CHECKPOINTS} WHERE cursor >= ?", (to_db_timestamp(since),))
+
+    def delete_all_elo(self, progress=None):
+        self.clear_collection('elo', progress)
+
+    def clear_collection(self, collection_name, progress=None):
+        if collection_name not in COLLECTIONS:
+            raise ValueError(f"Onbekende collectie: {collection_name}")
+        with self._lock, self._conn:
+            deleted = self._conn.execute(f"DELETE FROM {collection_name}").rowcount
+        if progress is not None:
+            progress(deleted, deleted)
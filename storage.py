@@ -0,0 +1,323 @@
+"""
+Opslag-interface voor de tafelvoetbal app.
+
+`firestore_service` is de enige module die de app aanroept; die praat met een
+backend die deze interface implementeert. De backend wordt gekozen via config:
+
+- omgevingsvariabele `TAFELVOETBAL_BACKEND` (`firestore`, `sqlite` of `memory`), of
+- Streamlit secrets sectie `[storage]` met `backend = "sqlite"` en optioneel `sqlite_path`.
+
+Zonder config blijft Firestore de standaard. `memory` draait de Firestore-code tegen de
+in-process fake uit fake_firestore.py (voor tests en benchmarks; data verdwijnt bij herstart).
+
+`live_cache = true` (of `TAFELVOETBAL_LIVE_CACHE=1`) zet de listener-cache uit live_cache.py aan.
+"""
+import os
+import streamlit as st
+
+BACKEND_ENV_VAR = "TAFELVOETBAL_BACKEND"
+SQLITE_PATH_ENV_VAR = "TAFELVOETBAL_SQLITE_PATH"
+LIVE_CACHE_ENV_VAR = "TAFELVOETBAL_LIVE_CACHE"
+DEFAULT_BACKEND = "firestore"
+DEFAULT_SQLITE_PATH = "tafelvoetbal.db"
+
+# Collecties die de app kent (namen zijn gelijk aan de Firestore collecties)
+COLLECTIONS = ('spelers', 'uitslag', 'elo', 'requests')
+
+# Tombstones van verwijderde wedstrijden, zodat incrementele sync deletes ziet
+MATCH_TOMBSTONES = 'uitslag_verwijderd'
+
+# ELO-stand op vaste momenten, zodat een herberekening niet de hele historie hoeft te lezen
+ELO_CHECKPOINTS = 'elo_checkpoints'
+
+
+# Vast geheel spelernummer per stoel in `uitslag` (zie player_ids.py); ELO regels hebben `speler_nr`
+SEAT_NR_FIELDS = {
+    'thuis_1': 'thuis_1_nr', 'thuis_2': 'thuis_2_nr',
+    'uit_1': 'uit_1_nr', 'uit_2': 'uit_2_nr',
+}
+
+
+def seat_numbers(match_data):
+    """{speler_naam: speler_nr} van de stoelen van een wedstrijd die een nummer hebben."""
+    return {
+        match_data[seat]: match_data[field]
+        for seat, field in SEAT_NR_FIELDS.items()
+        if match_data.get(seat) and match_data.get(field) is not None
+    }
+
+
+def seat_numbers_missing(match_data, numbers):
+    """De SEAT_NR_FIELDS die een wedstrijd nog mist, met hun nummer uit {speler_naam: speler_nr}."""
+    return {
+        field: numbers[match_data[seat]]
+        for seat, field in SEAT_NR_FIELDS.items()
+        if match_data.get(field) is None and match_data.get(seat) in numbers
+    }
+
+
+def project_fields(record, fields):
+    """Alleen de velden uit `fields` die in `record` staan, zoals Firestore `select()`; `fields=None` houdt alles."""
+    if fields is None:
+        return record
+    return {field: record[field] for field in fields if field in record}
+
+
+def page_records(records, limit, start_after=None, since=None, before=None):
+    """
+    Dezelfde pagina als StorageBackend.page_matches/page_elo_logs, over documenten (met het
+    document-ID onder `_id`) die al in het geheugen staan en al op speler gefilterd zijn.
+    """
+    records = [
+        r for r in records
+        if r.get('timestamp') is not None
+        and (since is None or r['timestamp'] >= since) and (before is None or r['timestamp'] < before)
+    ]
+    records.sort(key=lambda r: (r['timestamp'], r['_id']), reverse=True)
+    if start_after is not None:
+        records = [r for r in records if (r['timestamp'], r['_id']) < tuple(start_after)]
+    page = records[:limit]
+    cursor = (page[-1]['timestamp'], page[-1]['_id']) if len(records) > limit else None
+    return page, cursor
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def aggregate_records(records, sums=(), avgs=(), since=None, before=None):
+    """Dezelfde uitkomst als StorageBackend.aggregate, over documenten die al in het geheugen staan."""
+    if since is not None or before is not None:
+        records = [
+            r for r in records
+            if r.get('timestamp') is not None
+            and (since is None or r['timestamp'] >= since) and (before is None or r['timestamp'] < before)
+        ]
+    result = {'count': len(records)}
+    for field in sums:
+        result[f'sum_{field}'] = sum(r[field] for r in records if _is_number(r.get(field)))
+    for field in avgs:
+        values = [r[field] for r in records if _is_number(r.get(field))]
+        result[f'avg_{field}'] = sum(values) / len(values) if values else None
+    return result
+
+
+def elo_entry_id(match_id, speler_naam):
+    """
+    Vaste sleutel van de ELO-regel van één speler na één wedstrijd; een replay overschrijft hem.
+    `speler_naam` is de stoelnaam op de wedstrijd, die niet meeverandert met een nieuwe spelernaam.
+
+    Een '/' is in een Firestore document-ID een padscheiding, dus '%' en '/' in de naam worden
+    procent-gecodeerd. Andere namen houden hun sleutel; SQLite regels van oudere namen met '%'
+    of '/' krijgen bij de volgende reset_all_elos de nieuwe sleutel.
+    """
+    return f"{match_id}_{speler_naam.replace('%', '%25').replace('/', '%2F')}"
+
+
+class StorageBackend:
+    """Basisklasse voor opslag-backends.
+
+    Alle leesfuncties geven lijsten van dicts terug (één dict per document, met het
+    document-ID onder `speler_id` of `match_id` waar de app dat verwacht). Timestamps zijn
+    timezone-aware datetimes. Een timestamp `None` bij schrijven betekent "servertijd".
+
+    Lijstfuncties accepteren `fields`: een projectie zoals Firestore `select()`. Dan bevat elk
+    dict alleen die velden (voor zover het document ze heeft) plus `speler_id`/`match_id`; zonder
+    `fields` komt het hele document terug.
+
+    Bulk-schrijvers accepteren `progress`: een callback `progress(gedaan, totaal)` die na elk
+    geschreven blok wordt aangeroepen (in de aanroepende thread).
+    """
+
+    name = "base"
+
+    # ---------- Lezen ----------
+    def list_players(self, fields=None):
+        """Alle spelers, met het document-ID als `speler_id` en (na migratie) het vaste nummer `speler_nr`.
+
+        Spelers hebben ook de gematerialiseerde velden `rating`, `gespeeld` en `bijgewerkt`
+        (huidige ELO, aantal gespeelde wedstrijden, tijdstip van de laatste ELO-wijziging).
+        Oudere spelerdocumenten kunnen die nog missen.
+        """
+        raise NotImplementedError
+
+    def player_exists(self, name):
+        """True als er al een speler met deze naam bestaat."""
+        raise NotImplementedError
+
+    def list_matches(self, descending=True, limit=None, fields=None):
+        """Wedstrijden gesorteerd op timestamp, met het document-ID als `match_id`."""
+        raise NotImplementedError
+
+    def list_match_changes(self, since, fields=None):
+        """Wijzigingen in `uitslag` vanaf `since` (inclusief) voor incrementele sync.
+
+        Geeft (matches, deleted) terug: wedstrijden met `updated_at >= since` in het formaat
+        van list_matches, en tombstones `{'match_id', 'deleted_at'}` met `deleted_at >= since`.
+        """
+        raise NotImplementedError
+
+    def list_matches_after(self, timestamp, fields=None):
+        """Wedstrijden met timestamp strikt na `timestamp`, oudste eerst (zelfde formaat als list_matches)."""
+        raise NotImplementedError
+
+    def get_match(self, match_id):
+        """Eén wedstrijd als dict, of None als hij niet bestaat."""
+        raise NotImplementedError
+
+    def list_elo_logs(self, speler_naam=None, descending=True, since=None, fields=None):
+        """ELO log gesorteerd op timestamp, optioneel voor één speler en/of vanaf `since` (inclusief).
+
+        Regels die bij een wedstrijd horen hebben ook `match_id`.
+        """
+        raise NotImplementedError
+
+    def page_matches(self, speler_nr=None, since=None, before=None, limit=50, start_after=None):
+        """Eén pagina wedstrijden, nieuwste eerst, gefilterd en gepagineerd door de database zelf.
+
+        Optioneel alleen wedstrijden met `speler_nr` op een van de SEAT_NR_FIELDS en/of met
+        timestamp in [since, before). Geeft (wedstrijden, cursor) terug, in het formaat van
+        list_matches. De cursor is (timestamp, document-ID) van de laatste wedstrijd en gaat als
+        `start_after` naar de volgende pagina. Op de laatste pagina is hij None.
+        """
+        raise NotImplementedError
+
+    def page_elo_logs(self, speler_nr=None, since=None, before=None, limit=50, start_after=None):
+        """Eén pagina van de ELO log, nieuwste eerst; filters en cursor zoals page_matches."""
+        raise NotImplementedError
+
+    def list_requests(self):
+        """Alle verzoeken, nieuwste eerst."""
+        raise NotImplementedError
+
+    def get_elo_checkpoint_before(self, timestamp):
+        """De laatste ELO-checkpoint met `cursor` strikt vóór `timestamp`, of None.
+
+        Een checkpoint is {'cursor', 'wedstrijden', 'ratings', 'gespeeld', 'bijgewerkt', 'nummers'}:
+        de stand na alle wedstrijden t/m `cursor` (zie elo_engine.EloReplay.checkpoints).
+        `nummers` ({speler_naam: speler_nr}) ontbreekt bij oudere checkpoints.
+        """
+        raise NotImplementedError
+
+    def aggregate(self, collection_name, sums=(), avgs=(), since=None, before=None):
+        """Telling, sommen en gemiddelden over een collectie, berekend door de database zelf.
+
+        Optioneel alleen documenten met `timestamp` in [since, before). Geeft
+        {'count': n, 'sum_<veld>': ..., 'avg_<veld>': ...} terug; sum en avg tellen alleen
+        numerieke waarden, een som over niets is 0 en een gemiddelde over niets None.
+        """
+        raise NotImplementedError
+
+    def sample_collection(self, collection_name, limit):
+        """Maximaal `limit` ruwe documenten uit een collectie (voor schema-inspectie)."""
+        raise NotImplementedError
+
+    # ---------- Schrijven ----------
+    def add_player(self, name, start_elo):
+        """Voegt speler (met `rating` = start_elo, `gespeeld` = 0 en het volgende vrije `speler_nr`) en
+        initiële ELO atomair toe. Geeft het speler-ID terug."""
+        raise NotImplementedError
+
+    def add_request(self, request_text):
+        raise NotImplementedError
+
+    # Schrijvers van `uitslag` zetten `updated_at` op servertijd en delete_match laat een
+    # tombstone achter; daarop leunt list_match_changes.
+    def add_match_with_elo(self, match_data, elo_updates):
+        """Voegt een wedstrijd en de bijbehorende ELO-regels (met `match_id`) atomair toe en werkt in
+        dezelfde write `rating`, `gespeeld` (+1) en `bijgewerkt` van die spelers bij. ELO-regels krijgen
+        het `speler_nr` uit de SEAT_NR_FIELDS van de wedstrijd. Geeft het match-ID terug."""
+        raise NotImplementedError
+
+    def add_matches(self, matches, progress=None):
+        """Bulk-insert van wedstrijden (import)."""
+        raise NotImplementedError
+
+    def update_match(self, match_id, updated_match_data):
+        raise NotImplementedError
+
+    def delete_match(self, match_id, delete_elo=True):
+        """Verwijdert een wedstrijd en (met `delete_elo`) de ELO-regels met zijn `match_id`."""
+        raise NotImplementedError
+
+    def delete_player(self, player_id):
+        """Verwijdert een speler en al zijn ELO-regels (op `speler_nr`, regels zonder nummer op naam)."""
+        raise NotImplementedError
+
+    def add_elo_entries(self, entries, player_stats=None, progress=None):
+        """Schrijft een lijst ELO-regels ({'speler_naam', 'rating', 'timestamp'}, optioneel 'match_id' en 'speler_nr').
+
+        Een regel met `match_id` wordt onder elo_entry_id(match_id, speler_naam) opgeslagen en
+        overschrijft dus de vorige versie van dezelfde regel in plaats van er een toe te voegen.
+
+        `player_stats` ({speler_naam: {'rating', 'gespeeld', 'bijgewerkt'}}, optioneel 'speler_nr')
+        zet na een herberekening de gematerialiseerde spelervelden, op nummer als dat er is en
+        anders op naam. Reset en herberekening geven iedere
+        speler mee; `bijgewerkt` None (geen wedstrijden meer) wordt leeg opgeslagen.
+        """
+        raise NotImplementedError
+
+    def backfill_player_numbers(self, numbers, progress=None):
+        """Zet vaste spelernummers ({speler_naam: speler_nr}) op spelers, op de SEAT_NR_FIELDS van
+        wedstrijden en op ELO-regels die ze nog missen. Gewijzigde wedstrijden krijgen `updated_at`.
+        Geeft het aantal bijgewerkte documenten terug."""
+        raise NotImplementedError
+
+    def delete_elo_entries(self, keys):
+        """Verwijdert ELO-regels op sleutel: een lijst (match_id, speler_naam)."""
+        raise NotImplementedError
+
+    def add_elo_checkpoints(self, checkpoints):
+        """Slaat ELO-checkpoints op."""
+        raise NotImplementedError
+
+    def delete_elo_checkpoints(self, since=None):
+        """Verwijdert checkpoints met `cursor >= since` (alle checkpoints als since None is)."""
+        raise NotImplementedError
+
+    def delete_all_elo(self, progress=None):
+        """Verwijdert de volledige ELO log."""
+        raise NotImplementedError
+
+    def clear_collection(self, collection_name, progress=None):
+        """Verwijdert alle documenten uit een collectie."""
+        raise NotImplementedError
+
+
+def load_storage_config():
+    """Bepaal de backend-config uit Streamlit secrets en omgevingsvariabelen (env wint)."""
+    config = {'backend': DEFAULT_BACKEND, 'sqlite_path': DEFAULT_SQLITE_PATH, 'live_cache': False}
+    try:
+        if 'storage' in st.secrets:
+            config.update(dict(st.secrets['storage']))
+    except Exception:
+        # Geen secrets.toml aanwezig (lokaal, tests) - val terug op env/defaults
+        pass
+
+    if os.environ.get(BACKEND_ENV_VAR):
+        config['backend'] = os.environ[BACKEND_ENV_VAR]
+    if os.environ.get(SQLITE_PATH_ENV_VAR):
+        config['sqlite_path'] = os.environ[SQLITE_PATH_ENV_VAR]
+    if os.environ.get(LIVE_CACHE_ENV_VAR):
+        config['live_cache'] = os.environ[LIVE_CACHE_ENV_VAR]
+    config['live_cache'] = str(config['live_cache']).strip().lower() in ('1', 'true', 'yes', 'ja')
+    return config
+
+
+def create_backend(config=None):
+    """Maak de geconfigureerde backend aan."""
+    config = config or load_storage_config()
+    backend_name = str(config.get('backend', DEFAULT_BACKEND)).strip().lower()
+
+    if backend_name == 'sqlite':
+        from sqlite_backend import SQLiteBackend
+        return SQLiteBackend(config.get('sqlite_path', DEFAULT_SQLITE_PATH))
+    if backend_name == 'firestore':
+        from firestore_backend import FirestoreBackend, initialize_firestore
+        return FirestoreBackend(initialize_firestore())
+    if backend_name == 'memory':
+        from fake_firestore import FakeFirestoreClient
+        from firestore_backend import FirestoreBackend
+        return FirestoreBackend(FakeFirestoreClient())
+
+    raise ValueError(f"Onbekende storage backend '{backend_name}'. Kies 'firestore', 'sqlite' of 'memory'.")
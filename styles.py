@@ -253,6 +253,37 @@ def _get_custom_css():
         box-shadow: 0 4px 8px rgba(0, 0, 0, 0.15);
     }}
     
+    /* Tab navigatie in app.py: een horizontale radio in dezelfde stijl als de tabs */
+    .st-key-active_tab [role="radiogroup"] {{
+        gap: 0.3rem;
+        border-bottom: 2px solid {COLORS['primary_pink']};
+        padding-bottom: 0.5rem;
+        margin-bottom: 1.5rem;
+        flex-wrap: wrap;
+    }}
+    
+    .st-key-active_tab [role="radiogroup"] label {{
+        background: {COLORS['soft_pink']};
+        border-radius: 12px 12px 0 0;
+        padding: 0.8rem 1.2rem;
+        color: {COLORS['primary_pink']};
+        font-weight: 500;
+        margin: 0;
+        min-height: 48px; /* Touch-friendly */
+        transition: all 0.2s ease;
+    }}
+    
+    .st-key-active_tab [role="radiogroup"] label > div:first-child {{
+        display: none; /* Geen radio-bolletje */
+    }}
+    
+    .st-key-active_tab [role="radiogroup"] label:has(input:checked) {{
+        background-color: {COLORS['primary_pink']};
+        color: {COLORS['white']};
+        font-weight: 600;
+        box-shadow: 0 4px 8px rgba(0, 0, 0, 0.15);
+    }}
+    
     /* Tab content styling */
     .stTabs [data-baseweb="tab-panel"] {{
         padding: 1.5rem 1rem;
@@ -40,10 +40,59 @@ def _ensure_authentication() -> bool:
         st.error("Ongeldig wachtwoord.")
     return False
 
+# ---------------------------------------------------------------------------
+# Helper: Wedstrijd zoeken
+# ---------------------------------------------------------------------------
+MATCH_PICKER_LIMIT = 50  # aantal treffers in de keuzelijst
+
+
+def _match_picker(db, label: str, key: str, multi: bool = False):
+    """Zoekveld plus keuzelijst met de bovenste treffers uit de wedstrijdindex (zie match_index.py).
+    De opties zijn match_ids; alleen de getoonde treffers krijgen een label.
+    Return de gekozen match_id (of lijst match_ids bij `multi`).
+    """
+    index = db.get_match_index()
+    query = st.text_input(
+        f"Zoek ({label.lower()})",
+        placeholder="Datum (16-09-2025, 09-2025), speler en/of score (10-7)",
+        key=f"{key}_zoek",
+    )
+    match_ids, total = index.search(query, limit=MATCH_PICKER_LIMIT)
+    if total > len(match_ids):
+        st.caption(f"Eerste {len(match_ids)} van {total} treffers; verfijn de zoekopdracht voor oudere wedstrijden.")
+    if multi:
+        # Gekozen wedstrijden blijven in de lijst staan als de zoekopdracht verandert
+        selected = [match_id for match_id in st.session_state.get(key, []) if match_id in index]
+        st.session_state[key] = selected
+        options = selected + [match_id for match_id in match_ids if match_id not in set(selected)]
+        return st.multiselect(label, options=options, format_func=index.label, key=key)
+    if not match_ids:
+        st.info("Geen wedstrijden gevonden.")
+        return None
+    return st.selectbox(label, options=match_ids, format_func=index.label, key=key)
+
+def _match_row(db, match_id):
+    """
+    De rij van een wedstrijd uit get_matches, via de positie in de wedstrijdindex. Die index is
+    uit dezelfde tabel gebouwd, maar de twee caches worden apart geladen; klopt de positie niet
+    (meer), dan geeft dit None in plaats van een andere wedstrijd.
+    """
+    index = db.get_match_index()
+    matches = db.get_matches()
+    if match_id not in index or 'match_id' not in matches.columns:
+        return None
+    position = index.position(match_id)
+    if position >= len(matches) or matches['match_id'].iat[position] != match_id:
+        return None
+    return matches.iloc[position]
+
 # ---------------------------------------------------------------------------
 # Wedstrijden verwijderen
 # ---------------------------------------------------------------------------
-def _render_match_delete(db, matches_df: pd.DataFrame):
+@st.fragment
+def _render_match_delete(db):
+    # Fragment: de radio, selectbox en multiselect herdraaien alleen deze sectie; na een
+    # verwijdering draait de hele app opnieuw zodat ook de bewerk-lijst klopt
     st.write("**Wedstrijd(en) verwijderen**")
     elo_delete_option = st.radio(
         "ELO herberekening bij verwijdering:",
@@ -60,23 +109,9 @@ def _render_match_delete(db, matches_df: pd.DataFrame):
             "⚠️ **Let op:** Verwijderen zonder ELO herberekening kan leiden tot inconsistenties in de ratings."
         )
 
-    matches_display_df = matches_df.copy()
-    matches_display_df["display"] = matches_display_df.apply(
-        lambda row: f"{pd.to_datetime(row.get('timestamp')).strftime('%d-%m-%Y %H:%M') if row.get('timestamp') else 'Geen tijd'} - "
-        f"{row.get('thuis_1', 'N/A')}/{row.get('thuis_2', 'N/A')} vs {row.get('uit_1', 'N/A')}/{row.get('uit_2', 'N/A')}: "
-        f"{row.get('thuis_score', 'N/A')}-{row.get('uit_score', 'N/A')}",
-        axis=1,
-    )
-
     st.write("**Enkele wedstrijd verwijderen:**")
-    match_to_delete = st.selectbox(
-        "Selecteer een wedstrijd om te verwijderen",
-        options=matches_display_df["display"].tolist(),
-        key="single_match_delete",
-    )
-    if st.button("Verwijder geselecteerde wedstrijd", key="delete_single"):
-        match_idx = matches_display_df[matches_display_df["display"] == match_to_delete].index[0]
-        match_id = matches_display_df.loc[match_idx, "match_id"]
+    match_id = _match_picker(db, "Selecteer een wedstrijd om te verwijderen", "single_match_delete")
+    if match_id and st.button("Verwijder geselecteerde wedstrijd", key="delete_single"):
         with st.spinner("Wedstrijd wordt verwijderd..."):
             if auto_recalc_delete:
                 success = db.delete_match_with_elo_recalculation(match_id)
@@ -94,26 +129,18 @@ def _render_match_delete(db, matches_df: pd.DataFrame):
                 st.error("Kon de wedstrijd niet verwijderen.")
 
     st.write("**Meerdere wedstrijden verwijderen:**")
-    matches_to_delete = st.multiselect(
-        "Selecteer wedstrijden om te verwijderen",
-        options=matches_display_df["display"].tolist(),
-        key="multi_match_delete",
-    )
+    matches_to_delete = _match_picker(db, "Selecteer wedstrijden om te verwijderen", "multi_match_delete", multi=True)
     if matches_to_delete and st.button(
         "Verwijder geselecteerde wedstrijden", key="delete_multiple"
     ):
         with st.spinner(f"Bezig met verwijderen van {len(matches_to_delete)} wedstrijden..."):
             success_count = 0
-            for match_display in matches_to_delete:
-                match_idx = matches_display_df[
-                    matches_display_df["display"] == match_display
-                ].index[0]
-                match_id = matches_display_df.loc[match_idx, "match_id"]
+            for match_id in matches_to_delete:
                 if db.delete_match_by_id(match_id):
                     success_count += 1
             if auto_recalc_delete and success_count > 0:
                 with st.spinner("ELO scores worden herberekend..."):
-                    db.reset_all_elos()
+                    db.reset_all_elos(progress=st.progress(0.0).progress)
             if success_count == len(matches_to_delete):
                 if auto_recalc_delete:
                     st.success(
@@ -132,7 +159,10 @@ def _render_match_delete(db, matches_df: pd.DataFrame):
 # ---------------------------------------------------------------------------
 # Wedstrijd bewerken
 # ---------------------------------------------------------------------------
-def _render_match_edit(db, matches_df: pd.DataFrame, players_df: pd.DataFrame):
+@st.fragment
+def _render_match_edit(db):
+    # Fragment, net als _render_match_delete: leest zelf de gecachte wedstrijden en spelers
+    players_df = db.get_players()
     st.write("**Wedstrijd bewerken**")
     elo_option = st.radio(
         "ELO herberekening optie:",
@@ -153,22 +183,13 @@ def _render_match_edit(db, matches_df: pd.DataFrame, players_df: pd.DataFrame):
         return
 
     player_names = sorted(players_df["speler_naam"].tolist())
-    matches_display_df = matches_df.copy()
-    matches_display_df["display"] = matches_display_df.apply(
-        lambda row: f"{pd.to_datetime(row.get('timestamp')).strftime('%d-%m-%Y %H:%M') if row.get('timestamp') else 'Geen tijd'} - "
-        f"{row.get('thuis_1', 'N/A')}/{row.get('thuis_2', 'N/A')} vs {row.get('uit_1', 'N/A')}/{row.get('uit_2', 'N/A')}: "
-        f"{row.get('thuis_score', 'N/A')}-{row.get('uit_score', 'N/A')}",
-        axis=1,
-    )
-    match_to_edit = st.selectbox(
-        "Selecteer een wedstrijd om te bewerken",
-        options=matches_display_df["display"].tolist(),
-        key="match_edit_select",
-    )
+    match_to_edit = _match_picker(db, "Selecteer een wedstrijd om te bewerken", "match_edit_select")
     if not match_to_edit:
         return
-    match_idx = matches_display_df[matches_display_df["display"] == match_to_edit].index[0]
-    match_data = matches_display_df.loc[match_idx]
+    match_data = _match_row(db, match_to_edit)
+    if match_data is None:
+        st.warning("Deze wedstrijd is niet (meer) gevonden; kies de wedstrijd opnieuw.")
+        return
 
     st.write("**Huidige wedstrijd gegevens:**")
     col1, col2 = st.columns(2)
@@ -386,11 +407,13 @@ def _render_uploads(db, players_df: pd.DataFrame):
                     with st.spinner(
                         f"Bezig met importeren van {len(matches_upload_df)} wedstrijden..."
                     ):
+                        progress_bar = st.progress(0.0)
                         added, duplicates = db.import_matches(
-                            matches_upload_df.to_dict("records")
+                            matches_upload_df.to_dict("records"),
+                            progress=progress_bar.progress,
                         )
                         if elo_recalc_option.startswith("🔄") and added > 0:
-                            db.reset_all_elos()
+                            db.reset_all_elos(progress=progress_bar.progress)
                         st.success(
                             f"🎉 Import voltooid! {added} toegevoegd, {duplicates} duplicaten genegeerd."
                         )
@@ -533,7 +556,7 @@ def _render_system_management(db, players_df: pd.DataFrame):
         with st.spinner(
             "Alle ELO scores worden gereset en herberekend... Dit kan even duren."
         ):
-            success = db.reset_all_elos()
+            success = db.reset_all_elos(progress=st.progress(0.0).progress)
             if success:
                 st.success("✅ Alle ELO scores succesvol gereset en herberekend!")
                 st.balloons()
@@ -610,7 +633,7 @@ def _render_system_management(db, players_df: pd.DataFrame):
         with st.spinner("Firestore wordt geïnspecteerd..."):
             try:
                 expected = db.expected_schema()
-                actual = db.inspect_collections(max_docs=250)
+                actual = db.inspect_collections(max_docs=50)
 
                 for coll in ["spelers", "uitslag", "elo", "requests"]:
                     st.markdown(f"**Collectie: `{coll}`**")
@@ -636,6 +659,8 @@ def _render_system_management(db, players_df: pd.DataFrame):
                         st.write("Alleen in app (afgeleid):")
                         st.code(", ".join(sorted(list(exp_derived))) or "—")
 
+                    if act.get("total") is not None:
+                        st.caption(f"{act['total']} documenten, velden uit een sample van {act.get('sample_size', 0)}")
                     st.write("Aangetroffen velden (sample):")
                     st.code(", ".join(sorted(list(act_fields))) or "—")
 
@@ -673,9 +698,9 @@ def render_admin_tab(db, players_df: pd.DataFrame, matches_df: pd.DataFrame):
         ["🗑️ Verwijderen", "✏️ Bewerken", "📁 Data Upload", "⚙️ Systeem Beheer"]
     )
     with beheer_tab1:
-        _render_match_delete(db, matches_df)
+        _render_match_delete(db)
     with beheer_tab2:
-        _render_match_edit(db, matches_df, players_df)
+        _render_match_edit(db)
     with beheer_tab3:
         _render_uploads(db, players_df)
     with beheer_tab4:
@@ -3,75 +3,37 @@ TAB 1: Home module voor tafelvoetbal app
 Bevat ELO ranking tabel en speler geschiedenis functies
 """
 import streamlit as st
+import numpy as np
 import pandas as pd
+import plotly.express as px
 import firestore_service as db
 
 
-def calculate_stats(players, matches):
-    """Bereken statistieken voor alle spelers"""
-    stats_list = []
-    for index, player in players.iterrows():
-        player_name = str(player['speler_naam']) if player['speler_naam'] is not None else ""
-        
-        # Veilige filtering om KeyError te voorkomen
-        conditions = []
-        for col in ['thuis_1', 'thuis_2', 'uit_1', 'uit_2']:
-            if col in matches.columns:
-                conditions.append(matches[col] == player_name)
-        
-        if not conditions:
-            player_matches = pd.DataFrame()
-        else:
-            player_matches = matches[pd.concat(conditions, axis=1).any(axis=1)]
+def calculate_stats(players, participations):
+    """Bereken statistieken voor alle spelers met één groupby over de deelnametabel."""
+    if players.empty:
+        return pd.DataFrame()
 
-        if player_matches.empty:
-            stats = {'Gespeeld': 0, 'Voor': 0, 'Tegen': 0, 'Doelsaldo': 0, 'Klinkers': 0, 'Speler': ""}
-        else:
-            goals_for = 0
-            goals_against = 0
-            klinkers = 0
-            for _, match in player_matches.iterrows():
-                thuis_spelers = [match.get('thuis_1'), match.get('thuis_2')]
-                uit_spelers = [match.get('uit_1'), match.get('uit_2')]
-                
-                if player_name in thuis_spelers:
-                    goals_for += int(match.get('thuis_score', 0) or 0)
-                    goals_against += int(match.get('uit_score', 0) or 0)
-                    if player_name == match.get('thuis_1'):
-                        klinkers += int(match.get('klinkers_thuis_1', 0) or 0)
-                    else:
-                        klinkers += int(match.get('klinkers_thuis_2', 0) or 0)
-                elif player_name in uit_spelers:
-                    goals_for += int(match.get('uit_score', 0) or 0)
-                    goals_against += int(match.get('thuis_score', 0) or 0)
-                    if player_name == match.get('uit_1'):
-                        klinkers += int(match.get('klinkers_uit_1', 0) or 0)
-                    else:
-                        klinkers += int(match.get('klinkers_uit_2', 0) or 0)
-            
-            stats = {
-                'Gespeeld': len(player_matches),
-                'Voor': int(goals_for),
-                'Tegen': int(goals_against),
-                'Doelsaldo': int(goals_for - goals_against),
-                'Klinkers': int(klinkers),
-                'Speler': ""  # Placeholder voor string type
-            }
-        
-        stats['Speler'] = player_name
-        # Veilige conversie van rating met fallback naar 1000 als default
-        rating_value = player.get('rating', 1000)
-        if rating_value is None or pd.isna(rating_value):
-            rating_value = 1000
-        stats['ELO'] = int(rating_value)
-        stats_list.append(stats)
-        
-    return pd.DataFrame(stats_list)
+    totals = participations.groupby('speler', sort=False).agg(
+        Gespeeld=('voor', 'size'),
+        Voor=('voor', 'sum'),
+        Tegen=('tegen', 'sum'),
+        Klinkers=('klinkers', 'sum'),
+    )
+
+    names = [str(name) if name is not None else "" for name in players['speler_naam']]
+    stats = totals.reindex(names).fillna(0).astype(np.int64).reset_index(drop=True)
+    stats.insert(3, 'Doelsaldo', stats['Voor'] - stats['Tegen'])
+    stats['Speler'] = names
+    # Veilige conversie van rating met fallback naar 1000 als default
+    ratings = players['rating'] if 'rating' in players.columns else pd.Series(1000, index=players.index)
+    stats['ELO'] = pd.to_numeric(ratings, errors='coerce').fillna(1000).astype(np.int64).to_numpy()
+    return stats
 
 
-def show_elo_rankings(players_df, matches_df):
+def show_elo_rankings(players_df, participations_df):
     """Toon de huidige ELO rankings tabel"""
-    stats_df = calculate_stats(players_df, matches_df)
+    stats_df = calculate_stats(players_df, participations_df)
     
     # Sorteer en selecteer kolommen voor weergave
     display_df = stats_df.sort_values(by='ELO', ascending=False)
@@ -79,22 +41,33 @@ def show_elo_rankings(players_df, matches_df):
 
 
 def show_elo_history_selector(players_df):
-    """Toon speler selectie voor ELO geschiedenis"""
+    """Toon speler selectie voor ELO geschiedenis; meerdere spelers worden over elkaar getoond"""
     player_names = sorted(players_df['speler_naam'].tolist())
-    selected_player = st.selectbox("Selecteer een speler:", player_names)
+    selected_players = st.multiselect("Selecteer spelers:", player_names, default=player_names[:1])
     
-    if selected_player:
-        # Haal de ELO geschiedenis op voor de geselecteerde speler
-        history_df = db.get_elo_history(_ttl=60, speler_naam=selected_player)
+    if selected_players:
+        # Alle trajecten komen uit één gecachte index over de ELO log, niet uit een query per speler
+        rating_index = db.get_rating_index()
+        view = st.radio("Weergave:", ["ELO rating", "Ranking positie"], horizontal=True)
         
-        if not history_df.empty:
-            history_df['match_num'] = range(1, len(history_df) + 1)
-            st.line_chart(history_df, x='match_num', y='rating')
+        if view == "ELO rating":
+            history_df = rating_index.trajectories(selected_players)
+            if not history_df.empty:
+                st.line_chart(history_df, x='match_num', y='rating', color='speler')
+            else:
+                st.info(f"Geen ELO geschiedenis gevonden voor {', '.join(selected_players)}.")
         else:
-            st.info(f"Geen ELO geschiedenis gevonden voor {selected_player}.")
+            ranks = rating_index.rank_history(selected_players).dropna(how='all')
+            if not ranks.empty:
+                rank_df = ranks.reset_index().melt(id_vars='timestamp', var_name='speler', value_name='positie').dropna()
+                fig = px.line(rank_df, x='timestamp', y='positie', color='speler', line_shape='hv')
+                fig.update_yaxes(autorange='reversed', title='Positie')
+                st.plotly_chart(fig, use_container_width=True)
+            else:
+                st.info(f"Geen ELO geschiedenis gevonden voor {', '.join(selected_players)}.")
 
 
-def render_home_tab(players_df, matches_df):
+def render_home_tab(players_df, participations_df):
     """Render de complete Home tab"""
     st.header(":crown: ELO Rating :crown:")
     
@@ -103,7 +76,7 @@ def render_home_tab(players_df, matches_df):
     else:
         # --- Huidige ELO rating tonen ---
         st.subheader("Huidige ELO rating van alle spelers")
-        show_elo_rankings(players_df, matches_df)
+        show_elo_rankings(players_df, participations_df)
         
         # --- ELO ontwikkeling tonen ---
         st.subheader("Ontwikkeling ELO rating per speler")
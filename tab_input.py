@@ -3,13 +3,23 @@ TAB 2: Input module voor tafelvoetbal app
 Bevat wedstrijd invoer formulier, validatie en ELO berekeningen
 """
 import streamlit as st
-import time
 import firestore_service as db
 from utils import elo_calculation
 
 
-def render_match_input_form(player_names, player_elos):
-    """Render het wedstrijd invoer formulier (nu met datum keuze)"""
+@st.fragment
+def render_match_input_form():
+    """
+    Render het wedstrijd invoer formulier (nu met datum keuze).
+    Fragment: interactie herdraait alleen het formulier, dat daarom zelf de (gecachte) spelers leest.
+    """
+    players_df = db.get_players()
+    if players_df.empty:
+        st.warning("Er zijn nog geen spelers. Voeg eerst een speler toe via de 'Spelers' tab.")
+        return False
+    player_names = sorted(players_df['speler_naam'].tolist())
+    player_elos = players_df.set_index('speler_naam')['rating'].to_dict()
+
     klink = st.radio("Zijn er klinkers gescoord?", ("Nee", "Ja"))
 
     selected_names = {
@@ -128,22 +138,15 @@ def process_match_submission(selected_names, home_score, away_score, player_elos
         st.success("Uitslag en nieuwe ELO ratings succesvol opgeslagen!")
         if (home_score == 10 and away_score == 0) or (home_score == 0 and away_score == 10):
             st.balloons()
-        time.sleep(1)
-        st.rerun()
+        # Geen st.rerun(): het versturen draaide al alleen dit fragment, en de service heeft de
+        # spelers, wedstrijden en ELO caches geleegd; de volgende run leest de nieuwe ratings
         return True
     else:
         st.error("Er is een fout opgetreden bij het opslaan van de wedstrijd.")
         return False
 
 
-def render_input_tab(players_df):
+def render_input_tab():
     """Render de complete Input tab"""
     st.header("Tafelvoetbal Competitie ⚽ — Invullen")
-    
-    if players_df.empty:
-        st.warning("Er zijn nog geen spelers. Voeg eerst een speler toe via de 'Spelers' tab.")
-    else:
-        player_names = sorted(players_df['speler_naam'].tolist())
-        player_elos = players_df.set_index('speler_naam')['rating'].to_dict()
-
-        render_match_input_form(player_names, player_elos)
\ No newline at end of file
+    render_match_input_form()
\ No newline at end of file
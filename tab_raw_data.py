@@ -0,0 +1,95 @@
+"""
+TAB 5: Ruwe Data module voor tafelvoetbal app
+Bevat de spelerslijst en een gepagineerde verkenner voor de uitslagen en de ELO geschiedenis:
+filters en paginering gaan als query naar de database, downloads worden pas bij het klikken gemaakt
+"""
+from functools import partial
+
+import streamlit as st
+import exports
+import firestore_service as db
+import season_utils
+from utils import get_download_filename
+
+ALL_PLAYERS = "Alle spelers"
+
+
+def _render_filters(key):
+    """Speler-, seizoen- en periodefilter; geeft de filterargumenten voor de page loaders terug."""
+    player_names = sorted(db.get_player_lookup().tolist())
+    season_years = sorted(db.get_season_years(), reverse=True)
+    cols = st.columns(3)
+    speler = cols[0].selectbox("Speler", [ALL_PLAYERS, *player_names], key=f"{key}_speler")
+    season = cols[1].selectbox(
+        "Seizoen", [None, *season_years], key=f"{key}_seizoen",
+        format_func=lambda year: "Alle seizoenen" if year is None else season_utils.season_info(year)['seizoen_naam'],
+    )
+    period = cols[2].date_input("Periode", value=(), format="DD-MM-YYYY", key=f"{key}_periode")
+
+    since, before = exports.period_filter(season, *(period if len(period) == 2 else ()))
+    return {'speler_naam': None if speler == ALL_PLAYERS else speler, 'since': since, 'before': before}
+
+
+def _paging_state(key, filters):
+    """Cursors van de bezochte pagina's (de eerste is None); een andere filter begint weer bij pagina 1."""
+    state = st.session_state.setdefault(f"{key}_paging", {'filters': None, 'cursors': [None]})
+    if state['filters'] != filters:
+        state['filters'] = filters
+        state['cursors'] = [None]
+    return state
+
+
+@st.fragment
+def _render_explorer(key, load_page, dataset, export_name):
+    """Eén gepagineerde tabel met filters en een download; interactie herdraait alleen dit fragment."""
+    filters = _render_filters(key)
+    state = _paging_state(key, filters)
+    page, next_cursor = load_page(**filters, start_after=state['cursors'][-1])
+
+    if page.empty:
+        st.info("Geen regels gevonden voor deze filter.")
+    else:
+        st.dataframe(page, width='stretch', hide_index=True)
+
+    cols = st.columns([1, 1, 3])
+    cols[0].button(
+        "◀ Vorige", key=f"{key}_vorige", disabled=len(state['cursors']) == 1,
+        on_click=state['cursors'].pop,
+    )
+    cols[1].button(
+        "Volgende ▶", key=f"{key}_volgende", disabled=next_cursor is None,
+        on_click=state['cursors'].append, args=(next_cursor,),
+    )
+    cols[2].caption(f"Pagina {len(state['cursors'])}")
+
+    cols = st.columns([1, 3], vertical_alignment='bottom')
+    fmt = cols[0].selectbox("Formaat", exports.available_formats(), key=f"{key}_formaat")
+    _, extension, mime = exports.FORMATS[fmt]
+    cols[1].download_button(
+        label="💾 Download (alle regels van deze filter)",
+        data=partial(exports.export_file, dataset, fmt, **filters),
+        file_name=get_download_filename(export_name, extension),
+        mime=mime,
+        on_click="ignore",
+        key=f"{key}_download",
+    )
+
+
+def render_raw_data_tab(players_df):
+    """Render de complete Ruwe Data tab"""
+    st.header("Ruwe Data uit Firestore")
+
+    # --- Spelers ---
+    st.subheader("Spelers")
+    if not players_df.empty:
+        st.dataframe(players_df, width='stretch')
+    else:
+        st.info("Geen spelers gevonden in Firestore.")
+
+    # --- Uitslagen (Matches) ---
+    st.subheader("Uitslagen (Wedstrijden)")
+    _render_explorer("ruwe_uitslagen", db.get_matches_page, 'uitslag', 'Tafelvoetbal_Uitslagen')
+
+    # --- ELO Geschiedenis ---
+    st.subheader("ELO Geschiedenis")
+    _render_explorer("ruwe_elo", db.get_elo_page, 'elo', 'Tafelvoetbal_ELO_Geschiedenis')
@@ -0,0 +1,600 @@
+"""
+TAB 4: Seizoenen module voor tafelvoetbal app
+Bevat het Prinsjesdag seizoenen overzicht, cross-seizoen grafieken en de analyse per seizoen
+"""
+import streamlit as st
+import pandas as pd
+from datetime import date
+import plotly.express as px
+import firestore_service as db
+from analytics import player_totals
+import season_utils  # Import hele module om functie parameters correct te kunnen gebruiken
+from season_stats import season_elo_changes, season_player_stats
+
+
+def render_seasons_tab(players_df, matches_df, participations_df):
+    """Render de complete Seizoenen tab"""
+    st.header("📅 Seizoenen Overzicht")
+    
+    # Info sectie over Prinsjesdag seizoenen
+    st.info("""
+    🏛️ **Prinsjesdag Seizoen Systeem**
+    
+    Dit systeem gebruikt **Prinsjesdag** (derde dinsdag van september) als seizoensgrens:
+    - **Seizoen loopt:** van Prinsjesdag 24:00 tot de volgende Prinsjesdag 24:00
+    - **Automatisch berekend:** voor alle jaren met wedstrijddata
+    """)
+    
+    # Prinsjesdag seizoenen met hun statistieken: één searchsorted + groupby per dataversie (gecached)
+    prinsjesdag_seasons_df = db.get_prinsjesdag_seasons()
+    combined_seasons_df = prinsjesdag_seasons_df
+    if combined_seasons_df.empty:
+        if matches_df.empty:
+            st.info("💡 Voeg wedstrijddata toe om Prinsjesdag seizoenen te genereren.")
+        else:
+            st.warning("⚠️ Kon geen Prinsjesdag seizoenen genereren.")
+    
+    # Toon alleen Prinsjesdag data voor seizoenen met wedstrijden
+    played_seasons_df = combined_seasons_df[combined_seasons_df['aantal_wedstrijden'] > 0] if not combined_seasons_df.empty else combined_seasons_df
+    if not matches_df.empty and not combined_seasons_df.empty:
+        st.subheader("🗓️ Prinsjesdag Seizoenen Met Wedstrijddata")
+        
+        if not played_seasons_df.empty:
+            prinsjesdag_df = pd.DataFrame({
+                'Jaar': played_seasons_df['seizoen_jaar'],
+                'Prinsjesdag': [d.strftime('%d-%m-%Y (%A)') for d in played_seasons_df['prinsjesdag']],
+                'Seizoen': played_seasons_df['seizoen_naam'],
+                'Wedstrijden': played_seasons_df['aantal_wedstrijden'],
+                'Status': '🏆 Actief'
+            }).reset_index(drop=True)
+            st.dataframe(prinsjesdag_df, use_container_width=True)
+        else:
+            st.info("Geen seizoenen met wedstrijddata gevonden.")
+    else:
+        st.info("💡 Voeg wedstrijddata toe om Prinsjesdag seizoenen te zien.")
+    
+    # Visualisatie van Prinsjesdag data
+    if not matches_df.empty and not prinsjesdag_seasons_df.empty:
+        st.subheader("📊 Prinsjesdag Seizoenen Visualisatie")
+        
+        timeline_df = pd.DataFrame({
+            'Jaar': prinsjesdag_seasons_df['seizoen_jaar'],
+            'Prinsjesdag': prinsjesdag_seasons_df['prinsjesdag'],
+            'Wedstrijden': prinsjesdag_seasons_df['aantal_wedstrijden'],
+            'Seizoen': prinsjesdag_seasons_df['seizoen_naam']
+        })
+        
+        if not timeline_df.empty:
+            # Wedstrijden per Prinsjesdag seizoen
+            fig_timeline = px.bar(
+                timeline_df,
+                x='Jaar',
+                y='Wedstrijden', 
+                title='⚽ Wedstrijden per Prinsjesdag Seizoen',
+                hover_data=['Seizoen', 'Prinsjesdag'],
+                color='Wedstrijden',
+                color_continuous_scale='Blues'
+            )
+            fig_timeline.update_layout(
+                xaxis_title="Seizoen Jaar",
+                yaxis_title="Aantal Wedstrijden"
+            )
+            st.plotly_chart(fig_timeline, use_container_width=True)
+    
+    # Controleer of er data beschikbaar is voor analyse
+    if combined_seasons_df.empty:
+        st.warning("⚠️ Geen seizoenen kunnen worden gegenereerd.")
+        st.info("💡 Voeg eerst wedstrijden toe om automatische Prinsjesdag seizoenen te genereren.")
+    elif matches_df.empty:
+        st.warning("⚠️ Geen wedstrijden gevonden voor seizoen analyse.")
+        st.info("💡 Upload wedstrijddata om seizoen analyses te kunnen maken.")
+    else:
+        try:
+            # Seizoen selectie
+            st.subheader("🎯 Seizoen Selectie")
+            
+            # Maak seizoen opties - seizoenen met wedstrijden plus het huidige seizoen (ook als 0 wedstrijden)
+            season_options = []
+            current_date = date.today()
+            current_season_id = None
+            
+            for idx, season in combined_seasons_df.iterrows():
+                is_current_season = season['start_datum'] <= current_date <= season['eind_datum']
+                match_count = int(season['aantal_wedstrijden'])
+                if is_current_season or match_count > 0:
+                    season_options.append((f"{season['seizoen_naam']} ({match_count} wedstrijden)", idx))
+                    # Onthoud het 'huidige' seizoen via de DataFrame index (idx), niet via positie in season_options
+                    if is_current_season:
+                        current_season_id = idx
+            
+            if not season_options:
+                st.error("❌ Geen geldige seizoenen gevonden.")
+            else:
+                # Voeg "Alle seizoenen" optie toe voor algemene vergelijking
+                season_options.insert(0, ("📊 Alle Seizoenen", "all"))
+
+                # Bepaal het standaard te selecteren seizoen
+                default_option_index = 0  # Fallback naar "Alle Seizoenen"
+                display_options = [option[0] for option in season_options]
+
+                if current_season_id is not None:
+                    # Zoek de optie die overeenkomt met het huidige seizoen via de DataFrame index (idx)
+                    for i, option in enumerate(season_options):
+                        if option[1] == current_season_id:
+                            original_name = option[0]
+                            display_options[i] = f"⭐ Huidig: {original_name}"
+                            default_option_index = i
+                            break
+                elif len(season_options) > 1: # Als er geen huidig seizoen is, neem de meest recente (meer dan alleen "Alle seizoenen")
+                    # De meest recente is de laatste die is toegevoegd
+                    default_option_index = len(season_options) - 1
+                    original_name = season_options[-1][0]
+                    display_options[-1] = f"🕰️ Meest Recent: {original_name}"
+
+                selected_season_display = st.selectbox(
+                    "Kies een seizoen om te analyseren:",
+                    options=display_options,
+                    index=default_option_index
+                )
+
+                # Vind de originele naam en de geselecteerde seizoen ID
+                selected_season_id = "all" # Default
+                if selected_season_display:
+                    original_selected_name = selected_season_display
+                    if "⭐ Huidig: " in selected_season_display:
+                        original_selected_name = selected_season_display.replace("⭐ Huidig: ", "")
+                    elif "🕰️ Meest Recent: " in selected_season_display:
+                        # Typo fix: selected_seizoen_display -> selected_season_display
+                        original_selected_name = selected_season_display.replace("🕰️ Meest Recent: ", "")
+
+                    # Zoek de ID die bij de originele naam hoort
+                    selected_season_id = next((option[1] for option in season_options if option[0] == original_selected_name), "all")
+                
+                if selected_season_id == "all":
+                    # Alle seizoenen analyse
+                    st.subheader("📈 Overzicht Alle Prinsjesdag Seizoenen")
+                    
+                    # Seizoen metrics komen direct uit de seizoenstabel
+                    season_metrics = [
+                        {
+                            'Seizoen': season['seizoen_naam'],
+                            'Prinsjesdag': season['prinsjesdag'].strftime('%d-%m-%Y'),
+                            'Aantal Wedstrijden': int(season['aantal_wedstrijden']),
+                            'Aantal Spelers': int(season['unieke_spelers']),
+                            'Totaal Doelpunten': int(season['total_goals']),
+                            'Gem. Doelpunten/Wedstrijd': round(season['total_goals'] / season['aantal_wedstrijden'], 2) if season['aantal_wedstrijden'] else 0,
+                            'Seizoen Actief': '✅' if season['start_datum'] <= current_date <= season['eind_datum'] else '❌'
+                        }
+                        for _, season in combined_seasons_df.iterrows()
+                    ]
+                    
+                    if season_metrics:
+                        metrics_df = pd.DataFrame(season_metrics)
+                        st.dataframe(metrics_df, use_container_width=True)
+                        
+                        # Visualisaties voor alle seizoenen
+                        if len(metrics_df) > 0:
+                            col1, col2 = st.columns(2)
+                            
+                            with col1:
+                                # Wedstrijden per seizoen
+                                try:
+                                    fig_matches = px.bar(
+                                        metrics_df, 
+                                        x='Seizoen', 
+                                        y='Aantal Wedstrijden',
+                                        title='📊 Wedstrijden per Seizoen',
+                                        color='Aantal Wedstrijden',
+                                        color_continuous_scale='Blues'
+                                    )
+                                    fig_matches.update_layout(xaxis_tickangle=45)
+                                    st.plotly_chart(fig_matches, use_container_width=True)
+                                except Exception as e:
+                                    st.error(f"Fout bij maken van wedstrijden chart: {e}")
+                            
+                            with col2:
+                                # Spelers per seizoen
+                                try:
+                                    fig_players = px.bar(
+                                        metrics_df, 
+                                        x='Seizoen', 
+                                        y='Aantal Spelers',
+                                        title='👥 Actieve Spelers per Seizoen',
+                                        color='Aantal Spelers',
+                                        color_continuous_scale='Greens'
+                                    )
+                                    fig_players.update_layout(xaxis_tickangle=45)
+                                    st.plotly_chart(fig_players, use_container_width=True)
+                                except Exception as e:
+                                    st.error(f"Fout bij maken van spelers chart: {e}")
+                            
+                            # Goals trend
+                            try:
+                                fig_goals = px.line(
+                                    metrics_df, 
+                                    x='Seizoen', 
+                                    y='Gem. Doelpunten/Wedstrijd',
+                                    title='⚽ Gemiddeld Doelpunten per Wedstrijd Trend',
+                                    markers=True
+                                )
+                                fig_goals.update_layout(xaxis_tickangle=45)
+                                st.plotly_chart(fig_goals, use_container_width=True)
+                            except Exception as e:
+                                st.error(f"Fout bij maken van goals trend: {e}")
+                        
+                        # UITGEBREIDE CROSS-SEIZOEN ANALYSE
+                        st.markdown("---")
+                        st.subheader("📊 Uitgebreide Cross-Seizoen Analyse")
+                        
+                        # Bereken cross-seizoen statistieken in één groupby over alle deelnames
+                        all_season_players = player_totals(participations_df).rename(columns={
+                            'goals': 'total_goals', 'matches': 'total_matches',
+                            'wins': 'total_wins', 'klinkers': 'total_klinkers'
+                        }).to_dict('index')  # player -> {goals, matches, wins, etc}
+                        
+                        # Toon Top performers across alle seizoenen
+                        if all_season_players:
+                            st.markdown("**🏆 All-Time Leaders (Alle Seizoenen)**")
+                            
+                            col1, col2, col3, col4 = st.columns(4)
+                            
+                            with col1:
+                                st.markdown("**🎯 Top 5 All-Time Scorers**")
+                                top_scorers = sorted(all_season_players.items(), key=lambda x: x[1]['total_goals'], reverse=True)[:5]
+                                for i, (player, stats) in enumerate(top_scorers, 1):
+                                    emoji = "🥇🥈🥉🏅🏅"[i-1]
+                                    st.write(f"{emoji} {player}: {stats['total_goals']} goals")
+                            
+                            with col2:
+                                st.markdown("**💪 Top 5 Most Active**")
+                                most_active = sorted(all_season_players.items(), key=lambda x: x[1]['total_matches'], reverse=True)[:5]
+                                for i, (player, stats) in enumerate(most_active, 1):
+                                    emoji = "🥇🥈🥉🏅🏅"[i-1]
+                                    st.write(f"{emoji} {player}: {stats['total_matches']} wedstrijden")
+                            
+                            with col3:
+                                st.markdown("**🏆 Top 5 Most Wins**")
+                                most_wins = sorted(all_season_players.items(), key=lambda x: x[1]['total_wins'], reverse=True)[:5]
+                                for i, (player, stats) in enumerate(most_wins, 1):
+                                    emoji = "🥇🥈🥉🏅🏅"[i-1]
+                                    st.write(f"{emoji} {player}: {stats['total_wins']} overwinningen")
+                            
+                            with col4:
+                                st.markdown("**🎪 Top 5 Klinker Masters**")
+                                most_klinkers = sorted(all_season_players.items(), key=lambda x: x[1]['total_klinkers'], reverse=True)[:5]
+                                for i, (player, stats) in enumerate(most_klinkers, 1):
+                                    if stats['total_klinkers'] > 0:
+                                        emoji = "🥇🥈🥉🏅🏅"[i-1]
+                                        st.write(f"{emoji} {player}: {stats['total_klinkers']} klinkers")
+                        
+                            # CROSS-SEIZOEN VISUALISATIES
+                            st.markdown("**📈 Cross-Seizoen Performance Charts**")
+                            
+                            chart_col1, chart_col2 = st.columns(2)
+                            
+                            with chart_col1:
+                                # All-time goals leaders chart
+                                try:
+                                    goals_data = [{'Speler': player, 'Totaal Goals': stats['total_goals']} 
+                                                for player, stats in sorted(all_season_players.items(), 
+                                                key=lambda x: x[1]['total_goals'], reverse=True)[:10]]
+                                    goals_df = pd.DataFrame(goals_data)
+                                    
+                                    fig_all_goals = px.bar(
+                                        goals_df,
+                                        x='Speler',
+                                        y='Totaal Goals',
+                                        title='🎯 Top 10 All-Time Goal Scorers',
+                                        color='Totaal Goals',
+                                        color_continuous_scale='Reds'
+                                    )
+                                    fig_all_goals.update_layout(xaxis_tickangle=45)
+                                    st.plotly_chart(fig_all_goals, use_container_width=True)
+                                except Exception as e:
+                                    st.error(f"Error bij all-time goals chart: {e}")
+                            
+                            with chart_col2:
+                                # Win rate vs activity scatter
+                                try:
+                                    scatter_data = []
+                                    for player, stats in all_season_players.items():
+                                        if stats['total_matches'] >= 3:  # Min 3 matches
+                                            win_rate = (stats['total_wins'] / stats['total_matches']) * 100
+                                            scatter_data.append({
+                                                'Speler': player,
+                                                'Wedstrijden': stats['total_matches'],
+                                                'Win Rate %': win_rate,
+                                                'Totaal Goals': stats['total_goals']
+                                            })
+                                    
+                                    if scatter_data:
+                                        scatter_df = pd.DataFrame(scatter_data)
+                                        # Zorg dat alle kolommen numeriek zijn voor de scatter
+                                        for col in ['Wedstrijden', 'Win Rate %', 'Totaal Goals']:
+                                            scatter_df[col] = pd.to_numeric(scatter_df[col], errors='coerce')
+                                        scatter_df['Size'] = scatter_df['Totaal Goals'].fillna(0).clip(lower=0)
+
+                                        fig_scatter = px.scatter(
+                                            scatter_df,
+                                            x='Wedstrijden',
+                                            y='Win Rate %',
+                                            size='Size',
+                                            hover_name='Speler',
+                                            title='🏆 Activiteit vs Win Rate (grootte = goals)',
+                                            color='Win Rate %',
+                                            color_continuous_scale='RdYlBu_r'
+                                        )
+                                        st.plotly_chart(fig_scatter, use_container_width=True)
+                                except Exception as e:
+                                    st.error(f"Error bij scatter plot: {e}")
+                            
+                            # Seizoen vergelijking pie chart
+                            try:
+                                # Unieke spelers per seizoen; het seizoensjaar wordt de seizoensnaam
+                                season_names = dict(zip(combined_seasons_df['seizoen_jaar'], combined_seasons_df['seizoen_naam']))
+                                players_per_season = participations_df.groupby('season_id')['speler'].nunique()
+                                seizoen_counts = {
+                                    season_names.get(year, f"Seizoen {year - 1}/{year}"): int(count)
+                                    for year, count in players_per_season.items()
+                                }
+                                
+                                if seizoen_counts:
+                                    pie_data = [{'Seizoen': k, 'Unieke Spelers': v} for k, v in seizoen_counts.items()]
+                                    pie_df = pd.DataFrame(pie_data)
+                                    
+                                    fig_pie = px.pie(
+                                        pie_df, 
+                                        values='Unieke Spelers', 
+                                        names='Seizoen',
+                                        title='👥 Speler Distributie per Seizoen'
+                                    )
+                                    st.plotly_chart(fig_pie, use_container_width=True)
+                            except Exception as e:
+                                st.error(f"Error bij pie chart: {e}")
+                        else:
+                            st.info("Geen cross-seizoen data beschikbaar.")
+                    else:
+                        st.info("Geen seizoen data beschikbaar voor analyse.")
+                
+                else:
+                    # Specifiek seizoen analyse
+                    try:
+                        # Gebruik .loc met de index uit de tuple, niet .iloc
+                        season = combined_seasons_df.loc[selected_season_id]
+                        start_dt = season['start_datum']
+                        end_dt = season['eind_datum']
+                        today_date = date.today()
+                        is_current = (start_dt <= today_date <= end_dt)
+                        
+                        # Seizoen header met Prinsjesdag info
+                        seizoen_naam = season['seizoen_naam']
+                        st.subheader(f"📈 {seizoen_naam}")
+                        # Toon gebruikte periode voor deze analyse
+                        if is_current:
+                            st.caption(f"🔍 Analyse periode: {start_dt.strftime('%d-%m-%Y')} t/m {today_date.strftime('%d-%m-%Y')} (tot vandaag)")
+                        else:
+                            st.caption(f"🔍 Analyse periode: {start_dt.strftime('%d-%m-%Y')} t/m {end_dt.strftime('%d-%m-%Y')}")
+                        
+                        # Prinsjesdag info
+                        st.info(f"🏛️ **Prinsjesdag {season['seizoen_jaar']}:** {season['prinsjesdag'].strftime('%d %B %Y (%A)')} - Seizoen eindigt om 24:00")
+                        
+                        # Wedstrijden en deelnames van dit seizoen via de season_id kolom
+                        season_matches = season_utils.get_season_matches(matches_df, season)
+                        season_participations = participations_df[participations_df['season_id'] == season['seizoen_jaar']]
+                        
+                        if not season_matches.empty:
+                            # Basis statistieken: tellingen en sommen via een aggregatie-query op de seizoensperiode
+                            totals = db.get_match_totals(*season_utils.season_window(season['seizoen_jaar']))
+                            col1, col2, col3, col4 = st.columns(4)
+                            
+                            with col1:
+                                st.metric("📊 Totaal Wedstrijden", totals['wedstrijden'])
+                            
+                            with col2:
+                                unique_players = list(season_participations['speler'].unique())
+                                st.metric("👥 Actieve Spelers", len(unique_players))
+                            
+                            with col3:
+                                st.metric("⚽ Totaal Doelpunten", int(totals['doelpunten']))
+                            
+                            with col4:
+                                st.metric("📈 Gem. Doelpunten/Wedstrijd", f"{totals['gemiddelde']:.2f}")
+                            
+                            # Uitgebreide seizoen statistieken
+                            st.markdown("---")
+                            st.subheader("📈 Uitgebreide Seizoen Statistieken")
+                            
+                            # Alle speler statistieken van dit seizoen in één DataFrame (zie season_stats.py)
+                            ranking_df = season_player_stats(season_participations, players_df)
+                            goal_stats = dict(zip(ranking_df['Speler'], ranking_df['Doelpunten Voor']))
+                            klinker_stats = dict(zip(ranking_df['Speler'], ranking_df['Klinkers']))
+                            
+                            # ELO verandering: rating aan het begin van het seizoen uit de as-of index
+                            season_elo = season_elo_changes(db.get_rating_index(), ranking_df['Speler'], season['seizoen_jaar'])
+                            elo_changes = dict(zip(season_elo['Speler'], season_elo['ELO Verandering']))
+                            
+                            # Toon Top 3 statistieken
+                            col1, col2, col3, col4 = st.columns(4)
+                            
+                            with col1:
+                                st.markdown("**🏆 Top 3 ELO Rating**")
+                                top_elo_players = list(zip(ranking_df['Speler'], ranking_df['Huidige ELO']))[:3]
+                                for i, (player, elo) in enumerate(top_elo_players, 1):
+                                    emoji = "🥇" if i == 1 else "🥈" if i == 2 else "🥉"
+                                    st.write(f"{emoji} {player}: {elo:.0f} ELO")
+                            
+                            with col2:
+                                st.markdown("**🎯 Top 3 Doelpunten Makers**")
+                                top_scorers = sorted(goal_stats.items(), key=lambda x: x[1], reverse=True)[:3]
+                                for i, (player, goals) in enumerate(top_scorers, 1):
+                                    if goals > 0:
+                                        emoji = "🥇" if i == 1 else "🥈" if i == 2 else "🥉"
+                                        st.write(f"{emoji} {player}: {goals} doelpunten")
+                                    else:
+                                        st.write(f"{i}. Geen doelpunten data")
+                            
+                            with col3:
+                                st.markdown("**🎪 Top 3 Klinker Scorers**")
+                                top_klinkers = sorted(klinker_stats.items(), key=lambda x: x[1], reverse=True)[:3]
+                                for i, (player, klinkers) in enumerate(top_klinkers, 1):
+                                    if klinkers > 0:
+                                        emoji = "🥇" if i == 1 else "🥈" if i == 2 else "🥉"
+                                        st.write(f"{emoji} {player}: {klinkers} klinkers")
+                                    else:
+                                        st.write(f"{i}. Geen klinker data")
+                            
+                            with col4:
+                                st.markdown("**📈 Top 3 ELO Stijging**")
+                                top_elo_gains = sorted(elo_changes.items(), key=lambda x: x[1], reverse=True)[:3]
+                                for i, (player, change) in enumerate(top_elo_gains, 1):
+                                    emoji = "🥇" if i == 1 else "🥈" if i == 2 else "🥉"
+                                    sign = "+" if change >= 0 else ""
+                                    st.write(f"{emoji} {player}: {sign}{change:.0f} ELO")
+                                    
+                                if len(top_elo_gains) == 0 or all(change == 0 for _, change in top_elo_gains):
+                                    st.caption("*Vereist ELO geschiedenis data*")
+                            
+                            st.markdown("---")
+                            
+                            # Seizoen ranking berekenen
+                            st.subheader("🏆 Seizoen Ranking")
+                            
+                            if not ranking_df.empty:
+                                st.dataframe(
+                                    ranking_df.join(season_elo.set_index('Speler')[['Start ELO', 'ELO Verandering']], on='Speler'),
+                                    use_container_width=True,
+                                )
+                                
+                                # VISUALISATIES SECTIE
+                                st.markdown("---")
+                                st.subheader("📊 Seizoen Visualisaties")
+                                
+                                # Maak data voor charts
+                                chart_col1, chart_col2 = st.columns(2)
+                                
+                                with chart_col1:
+                                    # ELO Ranking Chart
+                                    try:
+                                        top_10_elo = ranking_df.head(10)
+                                        fig_elo = px.bar(
+                                            top_10_elo,
+                                            x='Speler',
+                                            y='Huidige ELO',
+                                            title='🏆 Top 10 Spelers (ELO Rating)',
+                                            color='Huidige ELO',
+                                            color_continuous_scale='Blues'
+                                        )
+                                        fig_elo.update_layout(xaxis_tickangle=45)
+                                        st.plotly_chart(fig_elo, use_container_width=True)
+                                    except Exception as e:
+                                        st.error(f"Fout bij ELO chart: {e}")
+                                
+                                with chart_col2:
+                                    # Win Percentage Chart
+                                    try:
+                                        active_players = ranking_df[ranking_df['Wedstrijden'] >= 3]  # Min 3 wedstrijden
+                                        if not active_players.empty:
+                                            fig_winrate = px.bar(
+                                                active_players.head(10),
+                                                x='Speler',
+                                                y='Win %',
+                                                title='📈 Win Percentage (min. 3 wedstrijden)',
+                                                color='Win %',
+                                                color_continuous_scale='Greens'
+                                            )
+                                            fig_winrate.update_layout(xaxis_tickangle=45)
+                                            st.plotly_chart(fig_winrate, use_container_width=True)
+                                        else:
+                                            st.info("Onvoldoende data voor win percentage chart")
+                                    except Exception as e:
+                                        st.error(f"Fout bij win rate chart: {e}")
+                                
+                                # Doelpunten statistieken
+                                chart_col3, chart_col4 = st.columns(2)
+                                
+                                with chart_col3:
+                                    # Goals per speler
+                                    try:
+                                        goals_data = []
+                                        for player, goals in goal_stats.items():
+                                            if goals > 0:  # Alleen spelers met doelpunten
+                                                goals_data.append({'Speler': player, 'Doelpunten': goals})
+                                        
+                                        if goals_data:
+                                            goals_df = pd.DataFrame(goals_data).sort_values('Doelpunten', ascending=False).head(10)
+                                            fig_goals = px.bar(
+                                                goals_df,
+                                                x='Speler',
+                                                y='Doelpunten',
+                                                title='⚽ Top 10 Doelpunten Makers',
+                                                color='Doelpunten',
+                                                color_continuous_scale='Reds'
+                                            )
+                                            fig_goals.update_layout(xaxis_tickangle=45)
+                                            st.plotly_chart(fig_goals, use_container_width=True)
+                                        else:
+                                            st.info("Geen doelpunten data beschikbaar")
+                                    except Exception as e:
+                                        st.error(f"Fout bij goals chart: {e}")
+                                
+                                with chart_col4:
+                                    # Klinker goals
+                                    try:
+                                        klinker_data = []
+                                        for player, klinkers in klinker_stats.items():
+                                            if klinkers > 0:  # Alleen spelers met klinkers
+                                                klinker_data.append({'Speler': player, 'Klinkers': klinkers})
+                                        
+                                        if klinker_data:
+                                            klinker_df = pd.DataFrame(klinker_data).sort_values('Klinkers', ascending=False).head(10)
+                                            fig_klinkers = px.bar(
+                                                klinker_df,
+                                                x='Speler',
+                                                y='Klinkers',
+                                                title='🎪 Top 10 Klinker Scorers',
+                                                color='Klinkers',
+                                                color_continuous_scale='Oranges'
+                                            )
+                                            fig_klinkers.update_layout(xaxis_tickangle=45)
+                                            st.plotly_chart(fig_klinkers, use_container_width=True)
+                                        else:
+                                            st.info("Geen klinker data beschikbaar")
+                                    except Exception as e:
+                                        st.error(f"Fout bij klinker chart: {e}")
+                                
+                                # Activiteit en Performance Chart
+                                try:
+                                    st.markdown("**📈 Speler Activiteit vs Performance**")
+                                    # Zorg voor numerieke en niet-negatieve grootte voor markers
+                                    ranking_df = ranking_df.copy()
+                                    ranking_df['DoelsaldoAbs'] = pd.to_numeric(ranking_df['Doelsaldo'], errors='coerce').abs().fillna(0)
+                                    ranking_df['Wedstrijden'] = pd.to_numeric(ranking_df['Wedstrijden'], errors='coerce').fillna(0)
+                                    ranking_df['Huidige ELO'] = pd.to_numeric(ranking_df['Huidige ELO'], errors='coerce').fillna(0)
+                                    ranking_df['Win %'] = pd.to_numeric(ranking_df['Win %'], errors='coerce').fillna(0)
+
+                                    fig_scatter = px.scatter(
+                                        ranking_df,
+                                        x='Wedstrijden',
+                                        y='Huidige ELO',
+                                        size='DoelsaldoAbs',
+                                        color='Win %',
+                                        hover_name='Speler',
+                                        hover_data={'Doelsaldo': True},
+                                        title='Wedstrijden vs ELO Rating (grootte = |doelsaldo|, kleur = win %)',
+                                        color_continuous_scale='RdYlBu_r'
+                                    )
+                                    st.plotly_chart(fig_scatter, use_container_width=True)
+                                except Exception as e:
+                                    st.error(f"Fout bij scatter plot: {e}")
+                                    
+                            else:
+                                st.info("Geen speler statistieken beschikbaar voor ranking.")
+                        else:
+                            st.info(f"Geen wedstrijden gevonden voor het geselecteerde seizoen.")
+                    
+                    except Exception as e:
+                        st.error(f"Fout bij seizoen analyse: {e}")
+        
+        except Exception as e:
+            st.error(f"❌ Algemene fout bij seizoen verwerking: {e}")
+            st.info("Probeer de pagina te vernieuwen of neem contact op met de beheerder.")
@@ -0,0 +1,58 @@
+# test_app.py
+"""De navigatie in app.py draait alleen de gekozen tab; andere tabs laden hun data niet.
+Het invoerformulier (een fragment) slaat op zonder de app opnieuw te draaien."""
+import pytest
+from streamlit.testing.v1 import AppTest
+
+import firestore_service as db
+from fake_firestore import FakeFirestoreClient
+from firestore_backend import FirestoreBackend
+
+
+@pytest.fixture
+def loads(monkeypatch):
+    """Lijst met de namen van de zware loaders die tijdens een run zijn aangeroepen."""
+    db.use_backend(FirestoreBackend(FakeFirestoreClient()))
+    for name in ("Alpha", "Bravo", "Charlie", "Delta"):
+        db.add_player(name, 1000)
+    calls = []
+    for loader in ('get_matches', 'get_participations', 'get_elo_logs', 'get_prinsjesdag_seasons'):
+        original = getattr(db, loader)
+        monkeypatch.setattr(db, loader, lambda *args, _original=original, _name=loader, **kwargs: (
+            calls.append(_name) or _original(*args, **kwargs)
+        ))
+    yield calls
+    db.use_backend(None)
+
+
+def test_only_active_tab_loads_its_data(loads):
+    at = AppTest.from_file("app.py", default_timeout=60).run()
+    assert not at.exception
+    assert 'get_participations' in loads and 'get_prinsjesdag_seasons' not in loads
+
+    loads.clear()
+    at.radio(key="active_tab").set_value("📝 Invullen").run()
+    assert not at.exception
+    assert loads == []
+
+    at.radio(key="active_tab").set_value("📅 Seizoenen").run()
+    assert not at.exception
+    assert 'get_prinsjesdag_seasons' in loads and 'get_elo_logs' not in loads
+
+
+def test_match_input_fragment_saves_without_app_rerun(loads):
+    at = AppTest.from_file("app.py", default_timeout=60).run()
+    at.radio(key="active_tab").set_value("📝 Invullen").run()
+    klinkers = next(r for r in at.radio if r.label == "Zijn er klinkers gescoord?")
+    klinkers.set_value("Ja").run()
+    assert [n.label for n in at.number_input][:4] == [
+        f"Klinkers {seat}" for seat in ("Thuis 1", "Thuis 2", "Uit 1", "Uit 2")
+    ]
+
+    next(n for n in at.number_input if n.label == "Score Thuis:").set_value(10)
+    at.button[0].click().run()
+    assert not at.exception
+    assert len(at.success) == 1
+    assert len(db.get_matches()) == 1
+    # De volgende invoer rekent met de nieuwe ratings
+    assert sorted(db.get_players()['rating'].round().tolist()) != [1000] * 4
@@ -0,0 +1,99 @@
+# test_bulk_writer.py
+"""Tests voor de parallelle bulk-writes tegen de in-memory Firestore fake."""
+from datetime import datetime, timedelta
+
+import pytest
+from google.api_core import exceptions as google_exceptions
+
+import firestore_service as db
+from bulk_writer import BulkWriter
+from fake_firestore import FakeFirestoreClient
+from firestore_backend import FirestoreBackend
+
+
+class FlakyClient:
+    """Laat de eerste `failures` commits mislukken met de opgegeven fout."""
+
+    def __init__(self, client, failures, error=google_exceptions.ServiceUnavailable):
+        self._client = client
+        self.failures = failures
+        self.error = error
+
+    def batch(self):
+        batch = self._client.batch()
+        commit = batch.commit
+
+        def flaky_commit():
+            if self.failures > 0:
+                self.failures -= 1
+                raise self.error("tijdelijk niet beschikbaar")
+            commit()
+
+        batch.commit = flaky_commit
+        return batch
+
+
+def test_commits_in_chunks_with_progress():
+    client = FakeFirestoreClient()
+    progress = []
+    writer = BulkWriter(client, progress=lambda done, total: progress.append((done, total)))
+    for i in range(1234):
+        writer.set(client.collection('elo').document(f"doc{i}"), {'rating': i})
+    assert writer.commit() == 1234
+
+    assert len(client.collection('elo').get()) == 1234
+    assert client.stats['commits'] == 4
+    assert progress[-1] == (1234, 1234)
+    assert [done for done, _ in progress] == sorted(done for done, _ in progress)
+
+
+def test_later_write_to_same_document_wins():
+    client = FakeFirestoreClient()
+    ref = client.collection('elo').document("Alpha")
+    writer = BulkWriter(client, chunk_size=1)
+    writer.set(ref, {'rating': 1000, 'speler_naam': "Alpha"}, merge=True)
+    writer.set(ref, {'rating': 1016}, merge=True)
+    writer.commit()
+    assert ref.get().to_dict() == {'rating': 1016, 'speler_naam': "Alpha"}
+
+
+def test_retries_transient_errors_with_backoff():
+    client = FakeFirestoreClient()
+    delays = []
+    writer = BulkWriter(FlakyClient(client, failures=2), sleep=delays.append)
+    for i in range(10):
+        writer.set(client.collection('elo').document(), {'rating': i})
+    writer.commit()
+
+    assert len(client.collection('elo').get()) == 10
+    assert len(delays) == 2 and delays[1] > 0
+
+
+def test_other_errors_are_not_retried():
+    client = FakeFirestoreClient()
+    writer = BulkWriter(FlakyClient(client, failures=1, error=google_exceptions.PermissionDenied), sleep=pytest.fail)
+    writer.set(client.collection('elo').document(), {'rating': 1000})
+    with pytest.raises(google_exceptions.PermissionDenied):
+        writer.commit()
+
+
+def test_reset_with_more_than_500_elo_documents():
+    backend = FirestoreBackend(FakeFirestoreClient())
+    db.use_backend(backend)
+    try:
+        for name in ["Alpha", "Bravo", "Charlie", "Delta"]:
+            db.add_player(name, 1000)
+        start = datetime(2025, 1, 1, 12, 0)
+        backend.add_matches([
+            {'thuis_1': "Alpha", 'thuis_2': "Bravo", 'uit_1': "Charlie", 'uit_2': "Delta",
+             'thuis_score': 10, 'uit_score': i % 10, 'timestamp': start + timedelta(hours=i)}
+            for i in range(200)
+        ])
+        # Tweede reset moet 800+ ELO documenten verwijderen, meer dan één batch aankan
+        progress = []
+        assert db.reset_all_elos()
+        assert db.reset_all_elos(progress=lambda fraction, text: progress.append(fraction))
+        assert len(backend.list_elo_logs()) == 4 + 800
+        assert progress[-1] == 1.0
+    finally:
+        db.use_backend(None)
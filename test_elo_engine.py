@@ -0,0 +1,82 @@
+# test_elo_engine.py
+"""De replay engine moet exact dezelfde ratings opleveren als de oude per-wedstrijd loop (benchmark.legacy_replay)."""
+import pandas as pd
+
+from benchmark import legacy_replay
+from elo_engine import EloReplay
+
+PLAYERS = [f"Speler{i}" for i in range(12)]
+
+
+def _entry_tuples(entries):
+    return [(e['speler_naam'], e['rating'], e['timestamp']) for e in entries]
+
+
+def test_replay_gives_same_ratings_and_entries_as_legacy_loop(random_matches):
+    matches = random_matches(3000, PLAYERS)
+    # Randgevallen: ontbrekende speler, lege naam, dezelfde speler twee keer in een team en gelijkspel
+    matches[10]['thuis_2'] = None
+    matches[20]['uit_1'] = ''
+    matches[30]['uit_2'] = matches[30]['uit_1']
+    matches[40]['thuis_score'] = matches[40]['uit_score'] = 5
+
+    expected_ratings, expected_entries = legacy_replay(matches, PLAYERS)
+    replay = EloReplay(matches, players=PLAYERS)
+
+    assert replay.final_ratings() == expected_ratings
+    assert _entry_tuples(replay.elo_entries()) == _entry_tuples(expected_entries)
+
+
+def test_elo_entries_from_start_index_and_dataframe_input(random_matches):
+    matches = random_matches(200, PLAYERS)
+    replay = EloReplay(pd.DataFrame(matches), players=PLAYERS)
+    assert replay.elo_entries(start=150) == replay.elo_entries()[150 * 4:]
+
+
+def test_player_stats_count_games_and_last_match(random_matches):
+    matches = random_matches(50, PLAYERS)
+    stats = EloReplay(matches, players=PLAYERS + ["Bank"]).player_stats()
+
+    # Een bekende speler zonder wedstrijden krijgt de startwaarden, zodat een reset hem terugzet
+    assert stats["Bank"] == {'rating': 1000, 'gespeeld': 0, 'bijgewerkt': None}
+    assert set(stats) == set(PLAYERS + ["Bank"])
+    alpha_matches = [m for m in matches if PLAYERS[0] in (m['thuis_1'], m['thuis_2'], m['uit_1'], m['uit_2'])]
+    assert stats[PLAYERS[0]]['gespeeld'] == len(alpha_matches)
+    assert stats[PLAYERS[0]]['bijgewerkt'] == alpha_matches[-1]['timestamp']
+
+
+def test_player_stats_from_checkpoint_keep_players_without_new_matches(random_matches):
+    matches = random_matches(20, PLAYERS[:4])
+    checkpoint = {'ratings': {"Bank": 1012.0}, 'gespeeld': {"Bank": 3},
+                  'bijgewerkt': {"Bank": matches[0]['timestamp']}, 'wedstrijden': 3}
+    stats = EloReplay(matches, players=PLAYERS[:4] + ["Bank", "Nieuw"], checkpoint=checkpoint).player_stats()
+
+    assert stats["Bank"] == {'rating': 1012.0, 'gespeeld': 3, 'bijgewerkt': matches[0]['timestamp']}
+    assert stats["Nieuw"] == {'rating': 1000, 'gespeeld': 0, 'bijgewerkt': None}
+
+
+def test_numbers_join_renamed_player_and_keep_seat_names(random_matches):
+    matches = random_matches(40, PLAYERS[:4])
+    for match in matches:
+        for seat in ('thuis_1', 'thuis_2', 'uit_1', 'uit_2'):
+            match[f"{seat}_nr"] = PLAYERS.index(match[seat]) + 1
+    # Speler0 heet sinds wedstrijd 20 "Nul"; de wedstrijden houden hun stoelnaam
+    for match in matches[20:]:
+        for seat in ('thuis_1', 'thuis_2', 'uit_1', 'uit_2'):
+            if match[seat] == PLAYERS[0]:
+                match[seat] = "Nul"
+    names = {1: "Nul", 2: PLAYERS[1], 3: PLAYERS[2], 4: PLAYERS[3]}
+
+    full = EloReplay(matches, players=list(names.values()), names=names)
+    assert set(full.final_ratings()) == set(names.values())
+    assert full.player_stats()["Nul"]['speler_nr'] == 1
+    entries = full.elo_entries()
+    assert {e['speler_naam'] for e in entries if e['speler_nr'] == 1} == {PLAYERS[0], "Nul"}
+
+    # Een checkpoint met de oude naam gaat via `nummers` verder onder de nieuwe naam
+    old_names = {**names, 1: PLAYERS[0]}
+    checkpoint = EloReplay(matches[:10], names=old_names).checkpoints(min_matches=1)[-1]
+    assert checkpoint['nummers'][PLAYERS[0]] == 1
+    resumed = EloReplay(matches[10:], checkpoint=checkpoint, names=names)
+    assert resumed.final_ratings() == full.final_ratings()
+    assert resumed.player_stats()["Nul"]['gespeeld'] == full.player_stats()["Nul"]['gespeeld']
@@ -0,0 +1,100 @@
+# test_elo_index.py
+"""De as-of rating index moet dezelfde rating geven als naïef zoeken in de ELO log."""
+import numpy as np
+import pandas as pd
+
+from elo_engine import EloReplay
+from elo_index import RatingIndex
+from season_stats import season_elo_changes
+from season_utils import season_window
+
+PLAYERS = [f"Speler{i}" for i in range(6)]
+
+
+def _random_log(n, seed=5):
+    rng = np.random.default_rng(seed)
+    start = pd.Timestamp('2023-01-01', tz='UTC')
+    return pd.DataFrame({
+        'speler_naam': rng.choice(PLAYERS[:-1], size=n),
+        # Weinig verschillende tijdstippen zodat gelijke tijdstippen vaak voorkomen
+        'timestamp': start + pd.to_timedelta(rng.integers(0, 400, size=n), unit='D'),
+        'rating': rng.normal(1000, 40, size=n).round(1),
+    })
+
+
+def _naive(log, player, when, default):
+    """Laatste regel (in logvolgorde) op of vóór `when`."""
+    rows = log[(log['speler_naam'] == player) & (log['timestamp'] <= when)]
+    if rows.empty:
+        return default
+    return rows[rows['timestamp'] == rows['timestamp'].max()]['rating'].iloc[-1]
+
+
+def test_lookups_match_naive_scan():
+    log = _random_log(600)
+    index = RatingIndex.from_entries(log)
+    moments = pd.Timestamp('2022-12-01', tz='UTC') + pd.to_timedelta(np.arange(0, 480, 7), unit='D')
+
+    for when in moments:
+        expected = [_naive(log, player, when, 1000) for player in PLAYERS]
+        assert index.ratings_at(PLAYERS, when).tolist() == expected
+        assert [index.rating_at(player, when, 1000) for player in PLAYERS] == expected
+
+    # Eén tijdstip per speler; tz-naive telt als UTC
+    per_player = [moment.tz_localize(None) for moment in moments[:len(PLAYERS)]]
+    expected = [_naive(log, player, when, 1000) for player, when in zip(PLAYERS, moments)]
+    assert index.ratings_at(PLAYERS, per_player).tolist() == expected
+
+
+def test_history_and_empty_index():
+    log = _random_log(50)
+    history = RatingIndex.from_entries(log).history('Speler0')
+    assert history['timestamp'].is_monotonic_increasing
+    assert len(history) == (log['speler_naam'] == 'Speler0').sum()
+
+    empty = RatingIndex.from_entries([])
+    assert len(empty) == 0 and 'Speler0' not in empty
+    assert empty.rating_at('Speler0', '2024-01-01') is None
+    assert empty.ratings_at(['Speler0'], '2024-01-01').tolist() == [1000]
+
+
+def test_season_changes_from_replay():
+    # Twee wedstrijden in seizoen 2024, één in 2025; de eerste regel precies op de grens hoort bij 2025
+    boundary = season_window(2025)[0]
+    matches = [
+        {'match_id': 'a', 'timestamp': boundary - pd.Timedelta(days=30), 'thuis_1': 'A', 'thuis_2': 'B', 'uit_1': 'C', 'uit_2': 'D', 'thuis_score': 10, 'uit_score': 3},
+        {'match_id': 'b', 'timestamp': boundary - pd.Timedelta(days=1), 'thuis_1': 'A', 'thuis_2': 'C', 'uit_1': 'B', 'uit_2': 'D', 'thuis_score': 10, 'uit_score': 8},
+        {'match_id': 'c', 'timestamp': boundary, 'thuis_1': 'A', 'thuis_2': 'D', 'uit_1': 'B', 'uit_2': 'C', 'thuis_score': 2, 'uit_score': 10},
+    ]
+    replay = EloReplay(matches, list('ABCD'))
+    entries = replay.elo_entries()
+    index = RatingIndex.from_entries(entries)
+    after = {entry['match_id']: {} for entry in entries}
+    for entry in entries:
+        after[entry['match_id']][entry['speler_naam']] = entry['rating']
+
+    changes = season_elo_changes(index, list('ABCDE'), 2025).set_index('Speler')
+    for name in 'ABCD':
+        assert changes.loc[name, 'Start ELO'] == round(after['b'][name])
+        assert changes.loc[name, 'Eind ELO'] == round(after['c'][name])
+    assert changes.loc['E'].tolist() == [1000, 1000, 0]
+
+
+def test_trajectories_and_rank_history():
+    log = _random_log(300)
+    index = RatingIndex.from_entries(log)
+
+    overlay = index.trajectories(["Speler1", "Speler5", "Speler3"])
+    for player in ["Speler1", "Speler3"]:
+        rows = overlay[overlay['speler'] == player]
+        assert rows['rating'].tolist() == index.history(player)['rating'].tolist()
+        assert rows['match_num'].tolist() == list(range(1, len(rows) + 1))
+    assert "Speler5" not in set(overlay['speler'])
+
+    ranks = index.rank_history()
+    for when in ranks.index[::25]:
+        ratings = {player: index.rating_at(player, when) for player in PLAYERS[:-1]}
+        known = {player: rating for player, rating in ratings.items() if rating is not None}
+        expected = {player: 1 + sum(other > rating for other in known.values()) for player, rating in known.items()}
+        assert ranks.loc[when].dropna().to_dict() == expected
+    assert list(index.rank_history(["Speler5", "Speler0"]).columns) == ["Speler5", "Speler0"]
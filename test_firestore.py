@@ -3,6 +3,7 @@
 import firestore_service as db
 import pandas as pd
 import time
+from fake_firestore import FakeFirestoreClient
 
 # TEST CONFIGURATIE
 TEST_PLAYERS = {
@@ -13,6 +14,12 @@ TEST_PLAYERS = {
 }
 player_ids_to_cleanup = []
 
+def wait_for_consistency(seconds):
+    """Live Firestore heeft even tijd nodig; de in-memory fake en SQLite zijn direct consistent."""
+    backend = db.get_backend()
+    if backend.name == "firestore" and not isinstance(getattr(backend, "client", None), FakeFirestoreClient):
+        time.sleep(seconds)
+
 def cleanup_test_players():
     """Ruimt eventuele overgebleven testspelers en hun ELO-geschiedenis van eerdere runs op."""
     print("\n Vooraf opruimen...")
@@ -43,7 +50,7 @@ def run_test():
     """Voert een reeks tests uit op de Firestore service volgens de nieuwe databasestructuur."""
     
     cleanup_test_players()
-    time.sleep(3) # Geef Firestore de tijd om de verwijderingen te verwerken
+    wait_for_consistency(3) # Geef Firestore de tijd om de verwijderingen te verwerken
 
     print("\nSTART TEST")
     
@@ -54,7 +61,7 @@ def run_test():
             result = db.add_player(name, elo)
             assert result == "Success", f"Kon speler {name} niet toevoegen. Resultaat: {result}"
         print(" -> SUCCES: Alle testspelers en hun initiële ELO succesvol toegevoegd.")
-        time.sleep(2)
+        wait_for_consistency(2)
 
         # === TEST 2: Spelers ophalen en verifiëren ===
         print("\n Spelers ophalen en verifiëren...")
@@ -95,7 +102,7 @@ def run_test():
         success = db.add_match_and_update_elo(match_data, elo_updates)
         assert success, "Toevoegen van wedstrijd en loggen van ELO is mislukt."
         print(" -> SUCCES: Wedstrijd en nieuwe ELO-ratings succesvol gelogd.")
-        time.sleep(2)
+        wait_for_consistency(2)
 
         # Verifieer de nieuwe ELO-scores door get_players opnieuw aan te roepen
         df_players_after = db.get_players()
@@ -0,0 +1,59 @@
+# test_frame_schema.py
+"""De compacte dtypes mogen niets aan de inhoud van de wedstrijd- en ELO tabellen veranderen."""
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+
+from frame_schema import SEAT_COLUMNS, compact_elo_logs, compact_matches, memory_report
+
+
+def _raw_matches():
+    start = datetime(2025, 1, 1, 12, 0, tzinfo=timezone.utc)
+    return pd.DataFrame([
+        {'thuis_1': "Alpha", 'thuis_2': "Bravo", 'uit_1': "Charlie", 'uit_2': "Delta",
+         'thuis_score': 10, 'uit_score': "7", 'klinkers_thuis_1': 1, 'klinkers_uit_2': None,
+         'timestamp': start, 'match_id': "m0"},
+        {'thuis_1': "Echo", 'thuis_2': "", 'uit_1': "Alpha", 'uit_2': None,
+         'thuis_score': 3, 'uit_score': 10, 'klinkers_thuis_1': 0, 'klinkers_uit_2': 2,
+         'timestamp': (start + timedelta(hours=1)).replace(tzinfo=None), 'match_id': "m1"},
+    ])
+
+
+def test_compact_matches():
+    compact = compact_matches(_raw_matches())
+
+    categories = compact['thuis_1'].cat.categories
+    assert list(categories) == ["Alpha", "Bravo", "Charlie", "Delta", "Echo"]
+    assert all(compact[seat].cat.categories.equals(categories) for seat in SEAT_COLUMNS)
+    # Lege stoelen worden ontbrekend
+    assert compact.loc[1, ['thuis_2', 'uit_2']].isna().all()
+
+    assert str(compact['thuis_score'].dtype) == 'int8'
+    assert compact['uit_score'].tolist() == [7, 10]
+    assert compact['klinkers_uit_2'].tolist() == [0, 2]
+    # tz-naive telt als UTC
+    assert str(compact['timestamp'].dt.tz) == 'UTC'
+    assert compact['timestamp'].diff().iloc[1] == pd.Timedelta(hours=1)
+
+    # Opnieuw compacteren na concat levert weer één gedeelde categorieënset op
+    extra = compact_matches(pd.DataFrame([{'thuis_1': "Foxtrot", 'thuis_2': "Alpha", 'uit_1': "Bravo", 'uit_2': "Echo"}]))
+    combined = compact_matches(pd.concat([compact, extra], ignore_index=True))
+    assert "Foxtrot" in combined['uit_1'].cat.categories
+    assert combined['thuis_1'].tolist() == ["Alpha", "Echo", "Foxtrot"]
+
+
+def test_compact_elo_logs_and_report():
+    raw = pd.DataFrame({
+        'speler_naam': ["Alpha", "Bravo", "Alpha"] * 50,
+        'rating': [1000, 1016.5, "984"] * 50,
+        'timestamp': ["2025-01-01 12:00:00"] * 150,
+    })
+    compact = compact_elo_logs(raw)
+    assert isinstance(compact['speler_naam'].dtype, pd.CategoricalDtype)
+    assert compact['rating'].tolist()[:3] == [1000.0, 1016.5, 984.0]
+    assert str(compact['timestamp'].dt.tz) == 'UTC'
+
+    report = memory_report({'elo': (raw, compact)}).set_index('Tabel')
+    assert report.loc['elo', 'Rijen'] == 150
+    assert report.loc['elo', 'Na (KB)'] < report.loc['elo', 'Voor (KB)']
+    assert compact_matches(pd.DataFrame()).empty
@@ -0,0 +1,89 @@
+# test_match_index.py
+"""De wedstrijdindex moet dezelfde treffers geven als naïef zoeken in de labels van alle wedstrijden."""
+import numpy as np
+import pandas as pd
+
+from frame_schema import compact_matches
+from match_index import MatchIndex
+
+PLAYERS = ["Alpha", "Bravo", "Charlie", "Delta", "Echo", "Foxtrot"]
+
+
+def _random_matches(n, seed=3):
+    rng = np.random.default_rng(seed)
+    seats = np.array([rng.choice(PLAYERS, size=4, replace=False) for _ in range(n)])
+    home_wins = rng.random(n) < 0.5
+    losing = rng.integers(0, 10, size=n)
+    start = pd.Timestamp('2025-01-01', tz='UTC')
+    matches = pd.DataFrame({
+        'match_id': [f"m{i:04d}" for i in range(n)],
+        'thuis_1': seats[:, 0], 'thuis_2': seats[:, 1], 'uit_1': seats[:, 2], 'uit_2': seats[:, 3],
+        'thuis_score': np.where(home_wins, 10, losing), 'uit_score': np.where(home_wins, losing, 10),
+        # Weinig verschillende dagen zodat datumzoeken meerdere wedstrijden per dag treft
+        'timestamp': start + pd.to_timedelta(rng.integers(0, 60 * 24 * 40, size=n), unit='min'),
+    })
+    return compact_matches(matches.sort_values('timestamp', ascending=False, ignore_index=True))
+
+
+def _naive(matches, query):
+    """Wedstrijden (in tabelvolgorde) waarvan elk woord in een spelernaam, de dag of de score staat."""
+    def fits(row, word):
+        names = [str(row[seat]).lower() for seat in ('thuis_1', 'thuis_2', 'uit_1', 'uit_2')]
+        return (
+            any(word.lower() in name for name in names)
+            or (any(c.isdigit() for c in word) and word in row['timestamp'].strftime('%d-%m-%Y'))
+            or word == f"{row['thuis_score']}-{row['uit_score']}"
+        )
+    return [row['match_id'] for _, row in matches.iterrows() if all(fits(row, word) for word in query.split())]
+
+
+def test_search_matches_naive_scan():
+    matches = _random_matches(400)
+    index = MatchIndex.from_matches(matches)
+    day = matches['timestamp'].iloc[17].strftime('%d-%m-%Y')
+    queries = ["", "alpha", "ECHO bravo", "10-3", "3-10", day, day[:5], "02-2025", f"charlie {day}",
+               "delta 10-7", "zulu", "al ha"]
+
+    for query in queries:
+        expected = _naive(matches, query)
+        found, total = index.search(query, limit=25)
+        assert total == len(expected)
+        assert found == expected[:25]
+
+
+def test_labels_and_positions():
+    matches = _random_matches(50)
+    index = MatchIndex.from_matches(matches)
+    row = matches.iloc[7]
+
+    assert index.position(row['match_id']) == 7
+    assert row['match_id'] in index and 'onbekend' not in index
+    assert index.label(row['match_id']) == (
+        f"{row['timestamp'].strftime('%d-%m-%Y %H:%M')} - {row['thuis_1']}/{row['thuis_2']} "
+        f"vs {row['uit_1']}/{row['uit_2']}: {row['thuis_score']}-{row['uit_score']}"
+    )
+
+
+def test_empty_table():
+    index = MatchIndex.from_matches(pd.DataFrame())
+    assert len(index) == 0
+    assert index.search("") == ([], 0)
+    assert index.search("alpha") == ([], 0)
+
+
+def test_admin_row_lookup_rejects_stale_index():
+    from types import SimpleNamespace
+    from tab_admin import _match_row
+
+    matches = _random_matches(20)
+    index = MatchIndex.from_matches(matches)
+    row = matches.iloc[5]
+
+    db = SimpleNamespace(get_match_index=lambda: index, get_matches=lambda: matches)
+    assert _match_row(db, row['match_id']).equals(row)
+    assert _match_row(db, 'onbekend') is None
+    # De tabel is opnieuw geladen (wedstrijd verwijderd), de index nog niet: geen verkeerde rij
+    newer = matches.drop(index=3).reset_index(drop=True)
+    db = SimpleNamespace(get_match_index=lambda: index, get_matches=lambda: newer)
+    assert _match_row(db, row['match_id']) is None
+    assert _match_row(db, matches['match_id'].iloc[19]) is None
@@ -0,0 +1,62 @@
+# test_participations.py
+"""De deelnametabel moet per (wedstrijd, speler) dezelfde rij opleveren als een loop over de wedstrijden."""
+import pandas as pd
+
+from participations import build_participations
+from season_utils import season_ids
+
+PLAYERS = [f"Speler{i}" for i in range(8)]
+
+
+def _reference(matches):
+    """Per wedstrijd per stoel; een speler telt alleen op zijn eerste stoel."""
+    rows = []
+    seats = ['thuis_1', 'thuis_2', 'uit_1', 'uit_2']
+    for _, match in matches.iterrows():
+        seen = set()
+        for seat in seats:
+            name = match[seat]
+            if pd.isna(name) or name in seen:
+                continue
+            seen.add(name)
+            home = seat.startswith('thuis')
+            team = ['thuis_1', 'thuis_2'] if home else ['uit_1', 'uit_2']
+            other = ['uit_1', 'uit_2'] if home else ['thuis_1', 'thuis_2']
+            voor = match['thuis_score' if home else 'uit_score']
+            tegen = match['uit_score' if home else 'thuis_score']
+            rows.append({
+                'match_id': match['match_id'], 'speler': name, 'stoel': seat,
+                'kant': 'thuis' if home else 'uit',
+                'teamgenoot': match[[s for s in team if s != seat][0]],
+                'tegenstander_1': match[other[0]], 'tegenstander_2': match[other[1]],
+                'voor': voor, 'tegen': tegen, 'gewonnen': voor > tegen,
+                'klinkers': match[f'klinkers_{seat}'],
+            })
+    return pd.DataFrame(rows)
+
+
+def test_one_row_per_player_per_match_with_team_and_opponents(random_matches):
+    matches = pd.DataFrame(random_matches(200, PLAYERS, seed=5))
+    matches.loc[5, 'thuis_2'] = None
+    matches.loc[9, 'uit_2'] = matches.loc[9, 'thuis_1']
+
+    participations = build_participations(matches)
+    expected = _reference(matches)
+    columns = list(expected.columns)
+    pd.testing.assert_frame_equal(
+        participations[columns].astype(object).fillna('-'),
+        expected.astype(object).fillna('-'),
+    )
+    assert len(participations) == 4 * len(matches) - 2
+    assert participations['elo_na'].isna().all()
+
+
+def test_season_key_follows_prinsjesdag():
+    # Prinsjesdag 2025 is dinsdag 16 september; die dag hoort nog bij het oude seizoen
+    dates = pd.Series(pd.to_datetime(['2025-09-16 23:30', '2025-09-17 00:10', '2025-01-05 12:00', None], utc=True))
+    assert season_ids(dates).tolist() == [2025, 2026, 2025, pd.NA]
+
+
+def test_empty_matches():
+    participations = build_participations(pd.DataFrame())
+    assert participations.empty and 'elo_voor' in participations.columns
@@ -0,0 +1,88 @@
+# test_season_stats.py
+"""De seizoensranking: totalen per speler uit de deelnames van één seizoen, gesorteerd op huidige ELO."""
+import pandas as pd
+
+from elo_index import RatingIndex
+from participations import build_participations
+from season_stats import SEASON_STATS_COLUMNS, rating_lookup, season_elo_changes, season_player_stats
+
+PLAYERS = [f"Speler{i}" for i in range(10)]
+
+
+def _season(participations, year):
+    """Zoals de Seizoenen tab: de deelnames met dit seizoen_id."""
+    return participations[participations['season_id'] == year]
+
+
+def test_ranking_totals_are_consistent_and_sorted_by_elo(random_matches):
+    matches = pd.DataFrame(random_matches(250, PLAYERS[:-1], seed=11))
+    # Speler8 staat niet in de spelerstabel en valt terug op 1000
+    players_df = pd.DataFrame({'speler_naam': PLAYERS[:8], 'rating': [990 + 6.5 * i for i in range(8)]})
+
+    ranking = season_player_stats(build_participations(matches), players_df)
+    assert list(ranking.index) == list(range(1, 10))
+    assert sorted(ranking['Speler']) == sorted(PLAYERS[:-1])
+    assert ranking['Huidige ELO'].is_monotonic_decreasing
+    assert ranking.set_index('Speler').loc["Speler8", 'Huidige ELO'] == 1000
+    # Elke wedstrijd heeft vier deelnemers en (zonder gelijkspel) twee winnaars
+    assert ranking['Wedstrijden'].sum() == 4 * len(matches)
+    assert ranking['Gewonnen'].sum() == 2 * len(matches)
+    assert (ranking['Gewonnen'] + ranking['Verloren'] == ranking['Wedstrijden']).all()
+    assert ranking['Doelpunten Voor'].sum() == 2 * (matches['thuis_score'] + matches['uit_score']).sum()
+    assert ranking['Doelsaldo'].sum() == 0
+
+
+def _two_seasons():
+    """Seizoen 2024/2025 met Echo, seizoen 2025/2026 zonder; Prinsjesdag 2025 is 16 september."""
+    def match(day, home, away, home_score, away_score):
+        return {'thuis_1': home[0], 'thuis_2': home[1], 'uit_1': away[0], 'uit_2': away[1],
+                'thuis_score': home_score, 'uit_score': away_score,
+                'klinkers_thuis_1': 1, 'klinkers_thuis_2': 0, 'klinkers_uit_1': 0, 'klinkers_uit_2': 0,
+                'datum': pd.Timestamp(day, tz='UTC'), 'match_id': day}
+    return pd.DataFrame([
+        match('2025-03-01', ("Alpha", "Echo"), ("Bravo", "Charlie"), 10, 6),
+        match('2025-10-01', ("Alpha", "Bravo"), ("Charlie", "Delta"), 10, 8),
+        match('2025-10-02', ("Charlie", "Delta"), ("Alpha", "Bravo"), 10, 10),
+    ])
+
+
+def test_player_from_an_earlier_season_and_draws():
+    participations = build_participations(_two_seasons())
+    players_df = pd.DataFrame({'speler_naam': ["Alpha", "Bravo", "Charlie", "Delta", "Echo"],
+                               'rating': [1020, 1005, 995, 990, 1010]})
+
+    earlier = season_player_stats(_season(participations, 2025), players_df).set_index('Speler')
+    assert earlier.loc["Echo", ['Wedstrijden', 'Gewonnen', 'Doelsaldo', 'Klinkers']].tolist() == [1, 1, 4, 0]
+
+    later = season_player_stats(_season(participations, 2026), players_df)
+    assert "Echo" not in set(later['Speler'])
+    assert later['Speler'].tolist() == ["Alpha", "Bravo", "Charlie", "Delta"]
+    alpha = later.set_index('Speler').loc["Alpha"]
+    # 10-10 telt als verlies voor beide teams
+    assert alpha[['Wedstrijden', 'Gewonnen', 'Verloren', 'Win %', 'Doelsaldo']].tolist() == [2, 1, 1, 50.0, 2]
+
+    # Wie het hele seizoen niet speelde, begint en eindigt op zijn laatste rating
+    index = RatingIndex.from_entries(pd.DataFrame({
+        'speler_naam': ["Echo", "Alpha", "Alpha"],
+        'timestamp': pd.to_datetime(['2025-03-01', '2025-03-01', '2025-10-01'], utc=True),
+        'rating': [1010, 1010, 1020],
+    }))
+    changes = season_elo_changes(index, ["Alpha", "Echo"], 2026).set_index('Speler')
+    assert changes.loc["Echo"].tolist() == [1010, 1010, 0]
+    assert changes.loc["Alpha"].tolist() == [1010, 1020, 10]
+
+
+def test_season_without_matches_gives_empty_ranking():
+    participations = build_participations(_two_seasons())
+    players_df = pd.DataFrame({'speler_naam': ["Alpha"], 'rating': [1020]})
+
+    ranking = season_player_stats(_season(participations, 2027), players_df)
+    assert ranking.empty and list(ranking.columns) == SEASON_STATS_COLUMNS
+    assert season_player_stats(build_participations(pd.DataFrame()), players_df).empty
+
+
+def test_rating_lookup_defaults():
+    players_df = pd.DataFrame({'speler_naam': ["Alpha", "Bravo", "Alpha"], 'rating': [1016.4, None, 900]})
+    lookup = rating_lookup(players_df)
+    assert lookup.to_dict() == {"Alpha": 1016.4, "Bravo": 1000}
+    assert rating_lookup(pd.DataFrame()).empty
@@ -0,0 +1,54 @@
+# test_season_utils.py
+"""Seizoenstoewijzing via de Prinsjesdag grenzen en de seizoenstabel per `season_id`."""
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from season_utils import generate_prinsjesdag_seasons, get_prinsjesdag, get_season_matches, season_ids
+
+
+def _reference_season(moment):
+    """Het eerste jaar waarvan Prinsjesdag 24:00 na het moment valt."""
+    year = moment.year
+    while datetime.combine(get_prinsjesdag(year) + timedelta(days=1), datetime.min.time()) <= moment:
+        year += 1
+    return year
+
+
+def test_season_ids_match_reference():
+    rng = np.random.default_rng(4)
+    start = pd.Timestamp('2019-01-01', tz='UTC')
+    dates = start + pd.to_timedelta(rng.integers(0, 7 * 365 * 24 * 60, size=2000), unit='min')
+    # Randgevallen rond Prinsjesdag 2023 (19 september)
+    dates = dates.append(pd.DatetimeIndex(['2023-09-19 00:00', '2023-09-19 23:59', '2023-09-20 00:00'], tz='UTC'))
+
+    expected = [_reference_season(moment.tz_localize(None).to_pydatetime()) for moment in dates]
+    assert season_ids(dates).tolist() == expected
+    assert season_ids(dates[-3:]).tolist() == [2023, 2023, 2024]
+
+
+def _matches(dates):
+    players = ["Alpha", "Bravo", "Charlie", "Delta", "Echo"]
+    return pd.DataFrame([
+        {'thuis_1': players[i % 5], 'thuis_2': players[(i + 1) % 5], 'uit_1': players[(i + 2) % 5],
+         'uit_2': players[(i + 3) % 5], 'thuis_score': 10, 'uit_score': i % 10, 'datum': pd.Timestamp(day, tz='UTC')}
+        for i, day in enumerate(dates)
+    ])
+
+
+def test_season_table_and_filter():
+    matches = _matches(['2024-01-10', '2024-09-17 20:00', '2024-09-18 09:00', '2025-03-01', '2025-05-05'])
+    seasons = generate_prinsjesdag_seasons(matches)
+
+    assert seasons['seizoen_naam'].tolist() == ["Seizoen 2023/2024", "Seizoen 2024/2025"]
+    assert seasons['aantal_wedstrijden'].tolist() == [2, 3]
+    assert seasons['total_goals'].tolist() == [10 + 10 + 1, 30 + 2 + 3 + 4]
+    assert seasons.loc[2024, 'unieke_spelers'] == 5
+
+    season_matches = get_season_matches(matches, seasons.loc[2025])
+    assert season_matches['datum'].dt.strftime('%Y-%m-%d').tolist() == ['2024-09-18', '2025-03-01', '2025-05-05']
+
+    # Een aanwezige season_id kolom wordt gebruikt in plaats van opnieuw de datums te parsen
+    matches['season_id'] = season_ids(matches['datum'])
+    assert len(get_season_matches(matches.drop(columns='datum'), seasons.loc[2024])) == 2
@@ -0,0 +1,742 @@
+# test_storage.py
+"""Tests voor de service-laag tegen SQLite en de in-memory Firestore fake (geen cloud credentials nodig)."""
+import io
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+import pytest
+
+import exports
+import firestore_service as db
+from fake_firestore import FakeFirestoreClient
+from firestore_backend import FirestoreBackend
+from sqlite_backend import SQLiteBackend
+
+PLAYERS = ["Alpha", "Bravo", "Charlie", "Delta"]
+
+
+@pytest.fixture(params=["sqlite", "memory"])
+def backend(request):
+    """Verse in-memory database per test, voor beide backends."""
+    if request.param == "sqlite":
+        backend = SQLiteBackend(':memory:')
+    else:
+        backend = FirestoreBackend(FakeFirestoreClient())
+    db.use_backend(backend)
+    yield backend
+    db.use_backend(None)
+
+
+def _add_players():
+    for name in PLAYERS:
+        assert db.add_player(name, 1000) == "Success"
+
+
+def _match(home_score=10, away_score=5, timestamp=None):
+    return {
+        'thuis_1': "Alpha", 'thuis_2': "Charlie",
+        'uit_1': "Bravo", 'uit_2': "Delta",
+        'thuis_score': home_score, 'uit_score': away_score,
+        'klinkers_thuis_1': 1, 'klinkers_thuis_2': 0,
+        'klinkers_uit_1': 0, 'klinkers_uit_2': 2,
+        'timestamp': timestamp,
+    }
+
+
+def test_add_player_and_duplicate(backend):
+    _add_players()
+    assert db.add_player("Alpha", 1000).startswith("Error")
+
+    players = db.get_players()
+    assert sorted(players['speler_naam']) == PLAYERS
+    assert (players['rating'] == 1000).all()
+
+
+def test_add_match_updates_elo(backend):
+    _add_players()
+    elo_updates = [("Alpha", 1016), ("Charlie", 1016), ("Bravo", 984), ("Delta", 984)]
+    assert db.add_match_and_update_elo(_match(), elo_updates)
+
+    ratings = db.get_players().set_index('speler_naam')['rating']
+    assert ratings["Alpha"] == 1016
+    assert ratings["Delta"] == 984
+
+    matches = db.get_matches()
+    assert len(matches) == 1
+    assert matches.iloc[0]['thuis_score'] == 10
+    assert len(db.get_elo_history(_ttl=60, speler_naam="Alpha")) == 2
+
+
+def test_players_carry_materialized_rating(backend):
+    _add_players()
+    elo_updates = [("Alpha", 1016), ("Charlie", 1016), ("Bravo", 984), ("Delta", 984)]
+    assert db.add_match_and_update_elo(_match(), elo_updates)
+    assert db.add_match_and_update_elo(_match(), [(name, rating + 1) for name, rating in elo_updates])
+
+    players = {p['speler_naam']: p for p in backend.list_players()}
+    assert players["Alpha"]['rating'] == 1017
+    assert players["Delta"]['gespeeld'] == 2
+    assert players["Delta"]['bijgewerkt'] is not None
+
+    # Na een volledige herberekening zijn rating en aantal gelijk aan de replay
+    assert db.reset_all_elos()
+    players = db.get_players().set_index('speler_naam')
+    assert players.loc["Alpha", 'rating'] > 1000 > players.loc["Bravo", 'rating']
+    assert players.loc["Alpha", 'gespeeld'] == 2
+
+
+def test_legacy_player_without_rating_uses_elo_log(fake_backend):
+    client = fake_backend.client
+    client.collection('spelers').document().set({'speler_naam': "Oud"})
+    client.collection('elo').document().set({'speler_naam': "Oud", 'rating': 1042, 'timestamp': datetime(2024, 1, 1)})
+    assert db.add_player("Nieuw", 1000) == "Success"
+
+    ratings = db.get_players().set_index('speler_naam')['rating']
+    assert ratings["Oud"] == 1042
+    assert ratings["Nieuw"] == 1000
+
+
+def test_matches_sorted_newest_first(backend):
+    _add_players()
+    start = datetime(2025, 1, 1, 12, 0)
+    backend.add_matches([_match(timestamp=start + timedelta(days=i)) for i in range(3)])
+
+    matches = db.get_matches()
+    assert matches['timestamp'].is_monotonic_decreasing
+
+
+def test_reset_all_elos_replays_matches(backend):
+    _add_players()
+    start = datetime(2025, 1, 1, 12, 0)
+    backend.add_matches([_match(timestamp=start + timedelta(days=i)) for i in range(3)])
+
+    assert db.reset_all_elos()
+    ratings = db.get_players().set_index('speler_naam')['rating']
+    assert ratings["Alpha"] > 1000 > ratings["Bravo"]
+    assert ratings["Alpha"] == ratings["Charlie"]
+
+
+def test_delete_match_with_recalculation(backend):
+    _add_players()
+    start = datetime(2025, 1, 1, 12, 0)
+    backend.add_matches([_match(timestamp=start), _match(0, 10, timestamp=start + timedelta(days=1))])
+    assert db.reset_all_elos()
+
+    last_match_id = db.get_matches().iloc[0]['match_id']
+    assert db.delete_match_with_elo_recalculation(last_match_id)
+    assert len(db.get_matches()) == 1
+
+
+def test_recalculation_and_reset_restore_players_without_matches(backend):
+    _add_players()
+    assert db.add_player("Echo", 1000) == "Success"
+    start = datetime(2025, 1, 1, 12, 0)
+    backend.add_matches([{**_match(timestamp=start), 'thuis_2': "Charlie", 'uit_2': "Bravo", 'uit_1': "Delta"}])
+    match = {**_match(timestamp=start + timedelta(days=1)), 'thuis_2': "Echo"}
+    assert db.add_match_and_update_elo(match, [("Alpha", 1016), ("Echo", 1016), ("Bravo", 984), ("Delta", 984)])
+    match_id = db.get_matches().iloc[0]['match_id']
+
+    # Echo verliest zijn enige wedstrijd: de herberekening zet hem terug naar de start
+    assert db.delete_match_with_elo_recalculation(match_id)
+    players = {p['speler_naam']: p for p in backend.list_players()}
+    assert (players["Echo"]['rating'], players["Echo"]['gespeeld'], players["Echo"]['bijgewerkt']) == (1000, 0, None)
+    assert players["Alpha"]['gespeeld'] == 1
+
+    # Zonder wedstrijden zet ook een volledige reset iedereen terug
+    first_id = db.get_matches().iloc[0]['match_id']
+    assert db.delete_match_with_elo_recalculation(first_id)
+    assert db.reset_all_elos()
+    players = db.get_players().set_index('speler_naam')
+    assert (players['rating'] == 1000).all() and (players['gespeeld'] == 0).all()
+    assert players['bijgewerkt'].isna().all()
+
+
+def test_delete_without_recalculation_keeps_elo_and_caches_consistent(backend):
+    _add_players()
+    start = datetime(2025, 1, 1, 12, 0)
+    for i in range(2):
+        assert db.add_match_and_update_elo(_match(timestamp=start + timedelta(days=i)), [])
+    ratings = db.get_players().set_index('speler_naam')['rating']
+    logs = len(db.get_elo_logs())
+    db.get_rating_index()
+
+    assert db.delete_match_by_id(db.get_matches().iloc[0]['match_id'])
+    assert len(db.get_matches()) == 1
+    # De ELO regels blijven staan (geen herberekening), en de caches tonen wat de backend heeft
+    assert len(db.get_elo_logs()) == logs == len(backend.list_elo_logs())
+    assert len(db.get_rating_index()) == logs
+    assert db.get_players().set_index('speler_naam')['rating'].equals(ratings)
+
+
+def _season_of_matches(days, per_day=3):
+    """`per_day` wedstrijden per dag met wisselende teams en scores, oudste eerst."""
+    start = datetime(2025, 1, 1, 12, 0)
+    matches = []
+    for day in range(days):
+        for i in range(per_day):
+            match = _match(10, (day + i) % 10, timestamp=start + timedelta(days=day, hours=i))
+            if (day + i) % 2:
+                match.update({'thuis_2': "Bravo", 'uit_1': "Charlie"})
+            matches.append(match)
+    return matches
+
+
+def test_recalculation_from_checkpoint_matches_full_replay(backend, monkeypatch):
+    from elo_engine import EloReplay
+    monkeypatch.setattr('elo_engine.CHECKPOINT_MIN_MATCHES', 4)
+    _add_players()
+    backend.add_matches(_season_of_matches(days=10))
+    assert db.reset_all_elos()
+    assert backend.get_elo_checkpoint_before(datetime(2026, 1, 1, tzinfo=timezone.utc)) is not None
+
+    # Bewerk een wedstrijd op dag 8; de herberekening start vanaf een checkpoint
+    match = backend.list_matches(descending=False)[22]
+    assert db.update_match_with_elo_recalculation(match['match_id'], {'thuis_score': 0, 'uit_score': 10})
+
+    expected = EloReplay(backend.list_matches(descending=False), players=PLAYERS).player_stats()
+    players = db.get_players().set_index('speler_naam')
+    for name in PLAYERS:
+        assert players.loc[name, 'rating'] == expected[name]['rating']
+        assert players.loc[name, 'gespeeld'] == expected[name]['gespeeld']
+
+
+def test_recalculation_reads_only_matches_after_checkpoint(fake_backend, monkeypatch):
+    monkeypatch.setattr('elo_engine.CHECKPOINT_MIN_MATCHES', 10)
+    _add_players()
+    fake_backend.add_matches(_season_of_matches(days=40))
+    assert db.reset_all_elos()
+
+    # Een historische wedstrijd van gisteren (dag 39) toevoegen
+    yesterday = datetime(2025, 2, 9, 18, 0)
+    with fake_backend.client.track() as usage:
+        assert db.add_match_and_update_elo(_match(timestamp=yesterday), [])
+    assert usage['reads'] < 40
+
+
+def test_recalculation_overwrites_match_keyed_elo_log(backend):
+    _add_players()
+    assert db.add_player("Echo", 1000) == "Success"
+    backend.add_matches(_season_of_matches(days=4))
+    assert db.reset_all_elos()
+    log_size = len(backend.list_elo_logs())
+
+    matches = backend.list_matches(descending=False)
+    assert db.update_match_with_elo_recalculation(matches[3]['match_id'], {'thuis_score': 2})
+    assert db.update_match_with_elo_recalculation(matches[5]['match_id'], {'thuis_1': "Echo"})
+    # Regels worden overschreven; de regel van Alpha bij de gewijzigde wedstrijd is vervangen door Echo
+    assert len(backend.list_elo_logs()) == log_size
+    changed = [log for log in backend.list_elo_logs() if log.get('match_id') == matches[5]['match_id']]
+    assert sorted(log['speler_naam'] for log in changed) == ["Bravo", "Charlie", "Delta", "Echo"]
+
+    players = db.get_players().set_index('speler_naam')
+    for name in PLAYERS + ["Echo"]:
+        assert db.get_elo_history(_ttl=60, speler_naam=name).iloc[-1]['rating'] == players.loc[name, 'rating']
+
+    assert db.delete_match_with_elo_recalculation(matches[0]['match_id'])
+    assert len(backend.list_elo_logs()) == log_size - 4
+
+
+def test_recalculation_writes_only_changed_elo_entries(fake_backend):
+    _add_players()
+    fake_backend.add_matches(_season_of_matches(days=10))
+    assert db.reset_all_elos()
+
+    matches = fake_backend.list_matches(descending=False)
+    with fake_backend.client.track() as usage:
+        assert db.update_match_with_elo_recalculation(matches[-2]['match_id'], {'thuis_score': 3})
+    # Twee wedstrijden met vier regels plus de vier spelers, niet de hele herspeelde reeks
+    assert usage['writes'] <= 8 + len(PLAYERS) + 1
+
+
+def test_player_name_with_slash_gets_a_valid_elo_key(backend):
+    from storage import elo_entry_id
+
+    assert elo_entry_id("m1", "Alpha") == "m1_Alpha"
+    assert elo_entry_id("m1", "Jan/Piet 100%") == "m1_Jan%2FPiet 100%25"
+
+    _add_players()
+    assert db.add_player("Jan/Piet", 1000) == "Success"
+    start = datetime(2025, 1, 1, 12, 0)
+    match = {**_match(timestamp=start), 'thuis_2': "Jan/Piet"}
+    assert db.add_match_and_update_elo(match, [("Alpha", 1016), ("Jan/Piet", 1016), ("Bravo", 984), ("Delta", 984)])
+    assert db.add_match_and_update_elo({**match, 'timestamp': start + timedelta(days=1)}, [])
+    assert db.reset_all_elos()
+    assert db.recalculate_elo_from_match(start)
+
+    logs = [e for e in backend.list_elo_logs() if e['speler_naam'] == "Jan/Piet"]
+    assert len(logs) == 3  # startrating plus twee wedstrijden, geen dubbele regels
+    assert db.get_players().set_index('speler_naam').loc["Jan/Piet", 'gespeeld'] == 2
+    assert db.delete_match_with_elo_recalculation(db.get_matches().iloc[0]['match_id'])
+    assert len([e for e in backend.list_elo_logs() if e['speler_naam'] == "Jan/Piet"]) == 2
+
+
+def test_elo_logs_with_equal_timestamps_have_a_fixed_order(backend):
+    timestamp = datetime(2025, 1, 1, 12, 0, tzinfo=timezone.utc)
+    keys = [("m2", "Bravo"), ("m1", "Delta"), ("m2", "Alpha"), ("m1", "Charlie")]
+    backend.add_elo_entries([
+        {'speler_naam': name, 'rating': 1000 + i, 'timestamp': timestamp, 'match_id': match_id}
+        for i, (match_id, name) in enumerate(keys)
+    ])
+
+    ascending = [(e['match_id'], e['speler_naam']) for e in backend.list_elo_logs(descending=False)]
+    assert ascending == sorted(keys)
+    descending = [(e['match_id'], e['speler_naam']) for e in backend.list_elo_logs()]
+    assert descending == sorted(keys, reverse=True)
+
+
+def test_participations_carry_elo_before_and_after(backend):
+    _add_players()
+    backend.add_matches(_season_of_matches(days=3))
+    assert db.reset_all_elos()
+
+    participations = db.get_participations()
+    assert len(participations) == 4 * 9
+    # Per speler sluit elke wedstrijd aan op de vorige; de eerste start op 1000
+    for name, rows in participations.sort_values('datum').groupby('speler'):
+        assert rows['elo_voor'].iloc[0] == 1000
+        assert rows['elo_voor'].iloc[1:].tolist() == rows['elo_na'].iloc[:-1].tolist()
+    players = db.get_players().set_index('speler_naam')
+    latest = participations.sort_values('datum').groupby('speler')['elo_na'].last()
+    assert latest.to_dict() == players.loc[latest.index, 'rating'].to_dict()
+
+    # Een nieuwe wedstrijd leegt de gecachte tabel
+    assert db.add_match_and_update_elo(_match(timestamp=datetime.now()), [])
+    assert len(db.get_participations()) == 4 * 10
+
+
+def test_delete_player_removes_elo(backend):
+    _add_players()
+    player_id = db.get_players().set_index('speler_naam').loc["Alpha", 'speler_id']
+    assert db.delete_player_by_id(player_id)
+
+    assert "Alpha" not in db.get_players()['speler_naam'].tolist()
+    assert db.get_elo_history(_ttl=60, speler_naam="Alpha").empty
+
+
+def test_player_numbers_on_matches_and_elo(backend):
+    _add_players()
+    numbers = db.get_players().set_index('speler_naam')['speler_nr'].to_dict()
+    assert sorted(numbers.values()) == [1, 2, 3, 4]
+
+    elo_updates = [("Alpha", 1016), ("Charlie", 1016), ("Bravo", 984), ("Delta", 984)]
+    assert db.add_match_and_update_elo(_match(), elo_updates)
+    assert db.reset_all_elos()
+
+    match = db.get_matches().iloc[0]
+    assert [match[f"{seat}_nr"] for seat in ('thuis_1', 'thuis_2', 'uit_1', 'uit_2')] == [
+        numbers["Alpha"], numbers["Charlie"], numbers["Bravo"], numbers["Delta"]]
+    logs = db.get_elo_logs()
+    assert (logs['speler_nr'] == logs['speler_naam'].astype(str).map(numbers)).all()
+
+
+def _strip_player_numbers(backend):
+    """Maakt de data weer zoals van vóór de spelernummers."""
+    if isinstance(backend, SQLiteBackend):
+        with backend._conn:
+            backend._conn.execute("UPDATE spelers SET speler_nr = NULL")
+            backend._conn.execute("UPDATE uitslag SET thuis_1_nr = NULL, thuis_2_nr = NULL, uit_1_nr = NULL, uit_2_nr = NULL")
+            backend._conn.execute("UPDATE elo SET speler_nr = NULL")
+        return
+    for name in ('spelers', 'uitslag', 'elo'):
+        for doc in backend.client.collection(name).stream():
+            data = {k: v for k, v in doc.to_dict().items() if not k.endswith('_nr')}
+            doc.reference.set(data)
+
+
+def _rename_player(backend, old, new):
+    if isinstance(backend, SQLiteBackend):
+        with backend._conn:
+            backend._conn.execute("UPDATE spelers SET speler_naam = ? WHERE speler_naam = ?", (new, old))
+        return
+    for doc in backend.client.collection('spelers').where('speler_naam', '==', old).stream():
+        doc.reference.update({'speler_naam': new})
+
+
+def test_migrate_player_ids_backfills_and_names_follow_numbers(backend):
+    import migration
+
+    _add_players()
+    elo_updates = [("Alpha", 1016), ("Charlie", 1016), ("Bravo", 984), ("Delta", 984)]
+    assert db.add_match_and_update_elo(_match(), elo_updates)
+    _strip_player_numbers(backend)
+    db.reset_match_sync()
+    db.invalidate('spelers', 'uitslag', 'elo')
+    assert db.get_player_lookup().empty
+
+    migration.migrate_player_ids()
+    lookup = db.get_player_lookup()
+    assert lookup.tolist() == PLAYERS  # alfabetisch genummerd
+    assert db.get_matches().iloc[0]['thuis_1_nr'] == 1
+    assert db.get_elo_logs()['speler_nr'].notna().all()
+    # Nog een keer draaien verandert niets
+    migration.migrate_player_ids()
+    assert db.get_player_lookup().equals(lookup)
+
+    # Een nieuwe naam op het spelerdocument werkt door in wedstrijden, ELO log en de daarvan
+    # afgeleide loaders (ook als die al gecachet waren)
+    assert "Alpha" in db.get_rating_index()
+    assert "Alpha" in set(db.get_participations()['speler'])
+    _rename_player(backend, "Alpha", "Aap")
+    db.invalidate('spelers')
+    assert db.get_matches().iloc[0]['thuis_1'] == "Aap"
+    assert "Aap" in set(db.get_elo_logs()['speler_naam'])
+    assert "Aap" in db.get_rating_index() and "Alpha" not in db.get_rating_index()
+    assert not db.get_elo_history(_ttl=60, speler_naam="Aap").empty
+    assert set(db.get_participations()['speler']) == {"Aap", "Bravo", "Charlie", "Delta"}
+    assert db.add_player("Echo", 1000) == "Success"
+    assert db.get_player_lookup().loc[5] == "Echo"
+
+
+def test_recalculation_and_player_writes_follow_numbers_after_rename(backend, monkeypatch):
+    import elo_engine
+    from elo_engine import EloReplay
+
+    monkeypatch.setattr(elo_engine, 'CHECKPOINT_MIN_MATCHES', 1)
+    _add_players()
+    start = datetime(2025, 1, 1, 12, 0, tzinfo=timezone.utc)
+    for i in range(3):
+        assert db.add_match_and_update_elo(_match(10, i, timestamp=start + timedelta(days=i)), [])
+    # Checkpoints per dag, met Alpha nog onder zijn oude naam
+    assert db.reset_all_elos()
+
+    _rename_player(backend, "Alpha", "Aap")
+    db.invalidate('spelers')
+    # Een wissel met de nieuwe naam "Alpha" mag de oude historie niet overnemen
+    assert db.add_player("Alpha", 1000) == "Success"
+    last = {**_match(3, 10, timestamp=start + timedelta(days=3)), 'thuis_1': "Aap"}
+    assert db.add_match_and_update_elo(last, [])
+    assert db.recalculate_elo_from_match(last['timestamp'])
+
+    # Dezelfde stand als een replay waarin Alpha altijd Aap heette
+    renamed = [{**m, 'thuis_1': "Aap"} for m in backend.list_matches(descending=False)]
+    expected = EloReplay(renamed, players=["Aap"]).final_ratings()
+    players = db.get_players().set_index('speler_naam')
+    assert players.loc["Aap", ['rating', 'gespeeld']].tolist() == [expected["Aap"], 4]
+    assert players.loc["Alpha", ['rating', 'gespeeld']].tolist() == [1000, 0]
+    # Regels van oude wedstrijden houden hun sleutel: geen dubbele regels na de herberekening
+    stored = backend.list_elo_logs()
+    assert len(stored) == 5 + 4 * 4
+    assert [e['rating'] for e in stored if e.get('match_id') and e['speler_nr'] == 1][0] == expected["Aap"]
+    assert db.reset_all_elos()
+    assert db.get_players().set_index('speler_naam').loc["Aap", 'rating'] == expected["Aap"]
+    assert len(backend.list_elo_logs()) == 5 + 4 * 4
+
+    # Verwijderen gaat op nummer: ook de regels onder de oude naam verdwijnen, die van de nieuwe Alpha niet
+    aap_id = players.loc["Aap", 'speler_id']
+    assert db.delete_player_by_id(aap_id)
+    stored = backend.list_elo_logs()
+    assert not [e for e in stored if e.get('speler_nr') == 1]
+    assert [e['speler_naam'] for e in stored if e.get('speler_nr') == 5] == ["Alpha"]
+
+
+def test_aggregations_match_loaded_matches(backend):
+    _add_players()
+    start = datetime(2025, 1, 1, 12, 0, tzinfo=timezone.utc)
+    backend.add_matches([_match(10, i % 9, timestamp=start + timedelta(days=i)) for i in range(12)])
+
+    matches = db.get_matches()
+    goals = int(matches['thuis_score'].sum() + matches['uit_score'].sum())
+    assert db.get_match_totals() == {'wedstrijden': 12, 'doelpunten': goals, 'gemiddelde': goals / 12}
+
+    window = db.get_match_totals(start + timedelta(days=3), start + timedelta(days=5))
+    assert window['wedstrijden'] == 2 and window['doelpunten'] == 20 + 3 + 4
+
+    totals = backend.aggregate('uitslag', sums=('uit_score',), avgs=('uit_score', 'klinkers_uit_2'))
+    assert totals['sum_uit_score'] == int(matches['uit_score'].sum())
+    assert totals['avg_uit_score'] == pytest.approx(matches['uit_score'].mean())
+    assert totals['avg_klinkers_uit_2'] == 2
+    empty = backend.aggregate('uitslag', sums=('thuis_score',), avgs=('thuis_score',), since=start + timedelta(days=100))
+    assert empty == {'count': 0, 'sum_thuis_score': 0, 'avg_thuis_score': None}
+
+    assert db.get_collection_counts() == {'spelers': 4, 'uitslag': 12, 'elo': 4, 'requests': 0}
+    assert db.inspect_collections(max_docs=2)['uitslag']['total'] == 12
+
+
+def test_aggregation_reads_per_thousand_documents(fake_backend):
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    fake_backend.add_matches([_match(timestamp=start + timedelta(minutes=i)) for i in range(1500)])
+    with fake_backend.client.track() as usage:
+        assert db.get_match_totals()['wedstrijden'] == 1500
+    assert usage['reads'] == 2
+
+
+def test_raw_data_page_reads_only_one_page(fake_backend):
+    _add_players()
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    fake_backend.add_matches([_match(timestamp=start + timedelta(minutes=i)) for i in range(500)])
+    db.get_player_lookup()
+    with fake_backend.client.track() as usage:
+        page, cursor = db.get_matches_page(limit=20)
+        db.get_matches_page(start_after=cursor, limit=20)
+    assert len(page) == 20
+    assert usage['reads'] == 2 * 21
+
+
+def test_import_matches_skips_duplicates(backend):
+    _add_players()
+    rows = [_match(timestamp="2025-01-01 12:00:00"), _match(timestamp="2025-01-02 12:00:00")]
+    added, duplicates = db.import_matches(rows)
+    assert (added, duplicates) == (1, 1)
+
+
+def test_reads_return_only_projected_fields(backend):
+    _add_players()
+    start = datetime(2025, 1, 1, 12, 0, tzinfo=timezone.utc)
+    backend.add_matches([_match(timestamp=start + timedelta(days=i)) for i in range(3)])
+
+    fields = db.MATCH_RESULT_FIELDS + ['timestamp']
+    matches = backend.list_matches(descending=False, fields=fields)
+    assert all(set(m) == {*fields, 'match_id'} for m in matches)
+    assert [m['timestamp'] for m in matches] == [start + timedelta(days=i) for i in range(3)]
+    after = backend.list_matches_after(start, fields=['uit_score'])
+    assert [set(m) for m in after] == [{'uit_score', 'match_id'}] * 2
+
+    players = backend.list_players(fields=['speler_naam'])
+    assert sorted(p['speler_naam'] for p in players) == PLAYERS
+    assert all(set(p) == {'speler_naam', 'speler_id'} for p in players)
+    # Een veld dat het document niet heeft komt niet mee, net als bij Firestore
+    logs = backend.list_elo_logs(fields=['speler_naam', 'rating', 'onbekend'])
+    assert len(logs) == 4 and all(set(e) == {'speler_naam', 'rating'} for e in logs)
+
+    # De loaders lezen geprojecteerd en geven hetzelfde als voorheen
+    assert db.get_matches()['thuis_1'].tolist() == ["Alpha"] * 3
+    assert db.import_matches([_match(timestamp=start)]) == (0, 1)
+
+
+def test_raw_data_pages_filter_and_page_in_the_backend(backend):
+    _add_players()
+    db.add_player("Echo", 1000)
+    start = datetime(2025, 1, 1, 12, 0, tzinfo=timezone.utc)
+    matches = [_match(timestamp=start + timedelta(hours=i)) for i in range(7)]
+    # Twee wedstrijden op hetzelfde tijdstip: de cursor moet ze allebei één keer opleveren
+    matches.append(_match(timestamp=start + timedelta(hours=3)))
+    matches.append(dict(_match(timestamp=start + timedelta(hours=8)), uit_2="Echo"))
+    for match in matches:
+        assert db.add_match_and_update_elo(match, [])
+    assert db.reset_all_elos()
+
+    pages, cursor = [], None
+    while True:
+        page, cursor = db.get_matches_page(start_after=cursor, limit=3)
+        pages.append(page)
+        if cursor is None:
+            break
+    assert [len(page) for page in pages] == [3, 3, 3]
+    combined = pd.concat(pages)
+    assert combined['match_id'].is_unique
+    assert combined['timestamp'].is_monotonic_decreasing
+
+    echo, _ = db.get_matches_page(speler_naam="Echo")
+    assert echo['uit_2'].tolist() == ["Echo"]
+    window, _ = db.get_matches_page(since=start + timedelta(hours=2), before=start + timedelta(hours=4))
+    assert len(window) == 3
+    assert db.get_matches_page(speler_naam="Onbekend")[0].empty
+
+    elo_pages = list(db.iter_elo_pages(speler_naam="Delta", page_size=2))
+    assert sum(len(page) for page in elo_pages) == 9  # startregel plus acht wedstrijden
+    assert db.get_season_years() == [2025]
+
+
+@pytest.mark.parametrize("fmt", ["csv", "jsonl.gz", "parquet"])
+def test_exports_stream_pages_with_fixed_columns(backend, fmt):
+    if fmt not in exports.available_formats():
+        pytest.skip("pyarrow niet geïnstalleerd")
+    _add_players()
+    start = datetime(2025, 1, 1, 12, 0, tzinfo=timezone.utc)
+    for i in range(5):
+        assert db.add_match_and_update_elo(_match(timestamp=start + timedelta(days=i)), [])
+    # Eén wedstrijd zonder spelernummers: de pagina's moeten toch dezelfde kolommen houden
+    backend.add_matches([_match(timestamp=start + timedelta(days=10))])
+
+    def read(dataset, **filters):
+        out = io.BytesIO()
+        rows = exports.export(dataset, fmt, out, page_size=2, **filters)
+        out.seek(0)
+        if fmt == "csv":
+            df = pd.read_csv(out)
+        elif fmt == "jsonl.gz":
+            df = pd.read_json(out, lines=True, compression="gzip")
+        else:
+            df = pd.read_parquet(out)
+        assert len(df) == rows
+        return df
+
+    matches = read("uitslag")
+    assert list(matches.columns) == db.MATCH_COLUMNS + ['season_id']
+    assert len(matches) == 6 and matches['match_id'].is_unique
+    assert matches['thuis_1_nr'].isna().sum() == 1
+
+    since, before = exports.period_filter(end=start.date() + timedelta(days=1))
+    assert len(read("uitslag", since=since, before=before)) == 2
+    # De download in de app krijgt een teruggespoeld tijdelijk bestand met dezelfde inhoud
+    with exports.export_file("uitslag", fmt, since=since, before=before) as download:
+        expected = io.BytesIO()
+        exports.export("uitslag", fmt, expected, since=since, before=before)
+        assert download.read() == expected.getvalue()
+    elo = read("elo", speler_naam="Alpha")
+    assert list(elo.columns) == db.ELO_LOG_FIELDS
+    assert set(elo['speler_naam']) == {"Alpha"}
+
+
+def test_incremental_sync_sees_adds_edits_and_deletes(backend):
+    _add_players()
+    start = datetime(2025, 1, 1, 12, 0)
+    backend.add_matches([_match(timestamp=start + timedelta(days=i)) for i in range(3)])
+    assert len(db.get_matches()) == 3
+
+    oldest_id = db.get_matches().iloc[-1]['match_id']
+    newest_id = db.get_matches().iloc[0]['match_id']
+    assert db.update_match(oldest_id, {'thuis_score': 7})
+    assert db.delete_match_by_id(newest_id)
+    assert db.add_match_and_update_elo(_match(timestamp=start + timedelta(days=10)), [])
+
+    matches = db.get_matches()
+    assert len(matches) == 3
+    assert newest_id not in matches['match_id'].tolist()
+    assert matches.set_index('match_id').loc[oldest_id, 'thuis_score'] == 7
+    assert matches['timestamp'].is_monotonic_decreasing
+
+    # Zelfde resultaat als een volledige herlaadactie
+    db.reset_match_sync()
+    db.get_matches.clear()
+    assert db.get_matches().equals(matches)
+
+
+def test_incremental_sync_reads_only_changes(fake_backend):
+    client = fake_backend.client
+    start = datetime(2025, 1, 1, 12, 0)
+    # Bestaande wedstrijden zijn een uur geleden geschreven, ruim buiten de sync-marge
+    client.clock = lambda: datetime.now(timezone.utc) - timedelta(hours=1)
+    fake_backend.add_matches([_match(timestamp=start + timedelta(hours=i)) for i in range(200)])
+    client.clock = lambda: datetime.now(timezone.utc)
+    db.get_matches()
+
+    assert db.add_match_and_update_elo(_match(timestamp=start + timedelta(days=30)), [])
+    with client.track() as usage:
+        assert len(db.get_matches()) == 201
+    # Alleen wedstrijden binnen de sync-marge, niet de volledige collectie
+    assert usage['reads'] < 200
+
+
+def test_writes_only_invalidate_affected_loaders(fake_backend):
+    _add_players()
+    fake_backend.add_matches([_match(timestamp=datetime(2025, 1, 1, 12, 0))])
+    db.get_players()
+    db.get_matches()
+    db.get_elo_history(_ttl=60, speler_naam="Alpha")
+
+    with fake_backend.client.track() as usage:
+        assert db.add_request("Meer grafieken") == "Success"
+        db.get_players()
+        db.get_matches()
+        db.get_elo_history(_ttl=60, speler_naam="Alpha")
+    # Alleen de write zelf; spelers, wedstrijden en ELO komen nog uit de cache
+    assert usage['reads'] == 0
+
+    assert len(db.get_requests()) == 1
+    assert db.add_player("Echo", 1000) == "Success"
+    assert "Echo" in db.get_players()['speler_naam'].tolist()
+
+
+@pytest.fixture
+def live_backend(monkeypatch):
+    monkeypatch.setenv("TAFELVOETBAL_LIVE_CACHE", "1")
+    backend = FirestoreBackend(FakeFirestoreClient())
+    db.use_backend(backend)
+    yield backend
+    db.use_backend(None)
+
+
+def test_live_cache_serves_reads_from_memory(live_backend):
+    _add_players()
+    assert db.get_live_cache() is not None
+    elo_updates = [("Alpha", 1016), ("Charlie", 1016), ("Bravo", 984), ("Delta", 984)]
+    assert db.add_match_and_update_elo(_match(), elo_updates)
+
+    with live_backend.client.track() as usage:
+        ratings = db.get_players().set_index('speler_naam')['rating']
+        matches = db.get_matches()
+        history = db.get_elo_history(_ttl=60, speler_naam="Alpha")
+        totals = db.get_match_totals()
+        page, _ = db.get_matches_page(speler_naam="Alpha")
+    assert usage['reads'] == 0
+    assert page['thuis_1'].tolist() == ["Alpha"]
+    assert totals['doelpunten'] == 15
+    assert ratings["Alpha"] == 1016
+    assert len(matches) == 1
+    assert history['rating'].tolist() == [1000, 1016]
+
+    live = db.get_live_cache()
+    assert [set(p) for p in live.list_players(fields=['speler_nr'])] == [{'speler_nr', 'speler_id'}] * 4
+    assert set(live.list_matches(fields=['thuis_score'])[0]) == {'thuis_score', 'match_id'}
+    assert set(live.list_elo_logs(speler_naam="Alpha", fields=['rating'])[0]) == {'rating'}
+
+
+def test_live_cache_picks_up_external_writes(live_backend):
+    _add_players()
+    assert len(db.get_players()) == 4
+
+    # Schrijven buiten de service om (bv. een andere app-instantie) leegt de caches ook
+    live_backend.client.collection('spelers').document().set({'speler_naam': "Echo"})
+    assert "Echo" in db.get_players()['speler_naam'].tolist()
+
+    player_id = db.get_players().set_index('speler_naam').loc["Alpha", 'speler_id']
+    live_backend.client.collection('spelers').document(player_id).delete()
+    assert "Alpha" not in db.get_players()['speler_naam'].tolist()
+
+
+def test_live_cache_is_off_without_config_or_firestore(backend, monkeypatch):
+    assert db.get_live_cache() is None
+    if isinstance(backend, SQLiteBackend):
+        monkeypatch.setenv("TAFELVOETBAL_LIVE_CACHE", "1")
+        db.close_live_cache()
+        assert db.get_live_cache() is None
+
+
+def test_clear_requests(backend):
+    assert db.add_request("Meer grafieken") == "Success"
+    assert len(db.get_requests()) == 1
+    assert db.clear_collection("requests")
+    assert db.get_requests().empty
+
+
+@pytest.fixture
+def fake_backend():
+    backend = FirestoreBackend(FakeFirestoreClient())
+    db.use_backend(backend)
+    yield backend
+    db.use_backend(None)
+
+
+def test_fake_counts_reads_and_writes(fake_backend):
+    _add_players()
+    client = fake_backend.client
+    with client.track() as usage:
+        db.get_players.clear()
+        db.get_players()
+    # Alleen de 4 spelerdocumenten; de rating staat erop, de ELO log wordt niet gelezen
+    assert usage['reads'] == 4
+    assert usage['writes'] == 0
+
+    with client.track() as usage:
+        fake_backend.add_matches([_match(timestamp=datetime(2025, 1, 1, 12, 0))] * 450)
+    assert usage == {'reads': 0, 'writes': 450, 'deletes': 0, 'commits': 2}
+
+
+def test_fake_batch_limit_and_filters(fake_backend):
+    client = fake_backend.client
+    batch = client.batch()
+    for _ in range(501):
+        batch.set(client.collection('elo').document(), {'speler_naam': "Alpha", 'rating': 1000})
+    with pytest.raises(ValueError):
+        batch.commit()
+    # Een mislukte batch schrijft niets
+    assert client.collection('elo').get() == []
+
+    fake_backend.add_elo_entries([
+        {'speler_naam': name, 'rating': 1000 + i, 'timestamp': datetime(2025, 1, 1 + i)}
+        for i, name in enumerate(PLAYERS)
+    ])
+    logs = fake_backend.list_elo_logs(speler_naam="Bravo")
+    assert [log['rating'] for log in logs] == [1001]
+    assert logs[0]['timestamp'].tzinfo is not None
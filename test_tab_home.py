@@ -0,0 +1,70 @@
+# test_tab_home.py
+"""De ranglijst op de Home tab: totalen per speler uit de deelnametabel, gesorteerd op ELO."""
+import pandas as pd
+from streamlit.testing.v1 import AppTest
+
+import firestore_service as db
+from fake_firestore import FakeFirestoreClient
+from firestore_backend import FirestoreBackend
+from participations import build_participations
+from tab_home import calculate_stats
+
+PLAYERS = pd.DataFrame({
+    'speler_naam': ["Alpha", "Bravo", "Charlie", "Delta", "Echo"],
+    'rating': [1030.0, 990.0, 1010.0, None, 995.0],
+})
+
+# Twee wedstrijden: Alpha/Bravo - Charlie/Delta 10-4 en Alpha/Delta - Charlie/Bravo 7-10; Echo speelde niet
+PARTICIPATIONS = pd.DataFrame([
+    ('m1', "Alpha", 10, 4, 1), ('m1', "Bravo", 10, 4, 0), ('m1', "Charlie", 4, 10, 2), ('m1', "Delta", 4, 10, 0),
+    ('m2', "Alpha", 7, 10, 0), ('m2', "Delta", 7, 10, 1), ('m2', "Charlie", 10, 7, 1), ('m2', "Bravo", 10, 7, 0),
+], columns=['match_id', 'speler', 'voor', 'tegen', 'klinkers'])
+
+LEADERBOARD = pd.DataFrame({
+    'Speler': ["Alpha", "Charlie", "Delta", "Echo", "Bravo"],
+    'ELO': [1030, 1010, 1000, 995, 990],
+    'Gespeeld': [2, 2, 2, 0, 2],
+    'Voor': [17, 14, 11, 0, 20],
+    'Tegen': [14, 17, 20, 0, 11],
+    'Doelsaldo': [3, -3, -9, 0, 9],
+    'Klinkers': [1, 3, 1, 0, 0],
+})
+
+
+def test_stats_total_goals_klinkers_and_default_rating():
+    stats = calculate_stats(PLAYERS, PARTICIPATIONS).set_index('Speler')
+    assert stats.loc["Alpha", ['Gespeeld', 'Voor', 'Tegen', 'Doelsaldo', 'Klinkers', 'ELO']].tolist() == [2, 17, 14, 3, 1, 1030]
+    assert stats.loc["Bravo", 'Doelsaldo'] == 9
+    # Zonder rating telt 1000, zonder wedstrijden alles 0
+    assert stats.loc["Delta", 'ELO'] == 1000
+    assert stats.loc["Echo", ['Gespeeld', 'Voor', 'Tegen', 'Klinkers']].tolist() == [0, 0, 0, 0]
+
+
+def _home(players_df, participations_df):
+    from tab_home import render_home_tab
+    render_home_tab(players_df, participations_df)
+
+
+def test_home_tab_shows_leaderboard_sorted_by_elo():
+    db.use_backend(FirestoreBackend(FakeFirestoreClient()))
+    try:
+        at = AppTest.from_function(_home, args=(PLAYERS, PARTICIPATIONS), default_timeout=30).run()
+    finally:
+        db.use_backend(None)
+    assert not at.exception
+    shown = at.dataframe[0].value.reset_index(drop=True)
+    pd.testing.assert_frame_equal(shown, LEADERBOARD, check_dtype=False)
+
+
+def test_missing_columns_and_no_matches():
+    players = pd.DataFrame({'speler_naam': ["Alpha", "Bravo"], 'rating': [1016, None]})
+    matches = pd.DataFrame([{'thuis_1': "Alpha", 'thuis_2': "Charlie", 'uit_1': "Bravo", 'uit_2': "Delta",
+                             'thuis_score': 10, 'uit_score': 4}])
+
+    stats = calculate_stats(players, build_participations(matches)).set_index('Speler')
+    assert stats.loc["Alpha", ['Gespeeld', 'Voor', 'Tegen', 'Klinkers', 'ELO']].tolist() == [1, 10, 4, 0, 1016]
+    assert stats.loc["Bravo", 'Doelsaldo'] == -6
+    assert stats.loc["Bravo", 'ELO'] == 1000
+
+    empty = calculate_stats(players, build_participations(pd.DataFrame()))
+    assert empty['Gespeeld'].tolist() == [0, 0]